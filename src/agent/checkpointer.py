@@ -0,0 +1,389 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from loguru import logger
+
+from src.database.db_manager import PROJECT_ROOT
+
+# Conversations live next to the catalog database, but in their own file
+CHECKPOINT_DB_PATH = os.path.join(PROJECT_ROOT, "checkpoints.db")
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        type TEXT,
+        checkpoint BLOB,
+        metadata_type TEXT,
+        metadata BLOB,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS writes (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        task_id TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        type TEXT,
+        value BLOB,
+        task_path TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+    ) WITHOUT ROWID""",
+]
+
+# (task_id, idx, channel, (type, bytes), task_path)
+_Write = Tuple[str, int, str, Tuple[str, bytes], str]
+
+
+class _Latest(NamedTuple):
+    """The newest checkpoint of one thread namespace, still serialized."""
+    checkpoint_id: str
+    parent_checkpoint_id: Optional[str]
+    checkpoint: Tuple[str, bytes]
+    metadata: Tuple[str, bytes]
+    writes: List[_Write]
+
+    @property
+    def size(self) -> int:
+        return len(self.checkpoint[1]) + len(self.metadata[1]) + sum(len(write[3][1]) for write in self.writes)
+
+
+class _ActiveThread:
+    __slots__ = ("latest", "last_used")
+
+    def __init__(self):
+        # checkpoint namespace -> newest checkpoint
+        self.latest: Dict[str, _Latest] = {}
+        self.last_used = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return sum(latest.size for latest in self.latest.values())
+
+
+class BoundedSqliteSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer that persists conversations to SQLite and keeps only the
+    active ones in memory.
+
+    - Every checkpoint is written through to `checkpoints.db`, so conversations
+      survive a restart.
+    - Only the newest `max_checkpoints_per_thread` checkpoints of a thread are kept
+      on disk (older ones only matter for time travel, which the app doesn't use).
+    - The newest checkpoint of each recently used thread is kept in memory, still
+      serialized, so a turn doesn't re-read it. Threads idle for `idle_ttl`, or
+      beyond `max_active_threads`, are evicted from memory (not from disk).
+
+    A plain sqlite3 connection behind a lock: it works from any event loop or thread,
+    and the async methods run the queries off the event loop.
+    """
+    def __init__(
+        self,
+        path: str = CHECKPOINT_DB_PATH,
+        max_checkpoints_per_thread: int = 20,
+        idle_ttl: timedelta = timedelta(minutes=30),
+        max_active_threads: int = 1000,
+        serde=None
+    ):
+        super().__init__(serde=serde)
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.idle_ttl = idle_ttl
+        self.max_active_threads = max_active_threads
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        # thread_id -> its newest checkpoints, least recently used first
+        self._active: "OrderedDict[str, _ActiveThread]" = OrderedDict()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self.conn.execute(statement)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _touch(self, thread_id: str) -> _ActiveThread:
+        active = self._active.get(thread_id)
+        if active is None:
+            active = self._active[thread_id] = _ActiveThread()
+        active.last_used = time.monotonic()
+        self._active.move_to_end(thread_id)
+        return active
+
+    def _evict_idle(self):
+        idle_before = time.monotonic() - self.idle_ttl.total_seconds()
+        while self._active:
+            thread_id, active = next(iter(self._active.items()))
+            if len(self._active) <= self.max_active_threads and active.last_used > idle_before:
+                break
+            self._evict(thread_id)
+
+    def _evict(self, thread_id: str):
+        active = self._active.pop(thread_id, None)
+        if active is not None:
+            self.evictions += 1
+            logger.info(f"[CheckpointSaver] Evicted thread {thread_id} from memory ({active.size / 1024:.1f} KB), {len(self._active)} active.")
+
+    def evict(self, thread_id: str):
+        """Drops a thread from memory (e.g. when its chat session ends); it stays on disk."""
+        with self._lock:
+            self._evict(thread_id)
+
+    def memory_report(self) -> Dict[str, int]:
+        """Bytes held in memory per active thread, largest first."""
+        with self._lock:
+            self._evict_idle()
+            sizes = {thread_id: active.size for thread_id, active in self._active.items()}
+        return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+    @staticmethod
+    def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, latest: _Latest) -> CheckpointTuple:
+        writes = sorted(latest.writes, key=lambda write: writes_sort_key(write[4], write[0], write[1]))
+        return CheckpointTuple(
+            config=self._config(thread_id, checkpoint_ns, latest.checkpoint_id),
+            checkpoint=self.serde.loads_typed(latest.checkpoint),
+            metadata=self.serde.loads_typed(latest.metadata),
+            parent_config=(
+                self._config(thread_id, checkpoint_ns, latest.parent_checkpoint_id)
+                if latest.parent_checkpoint_id else None
+            ),
+            pending_writes=[(task_id, channel, self.serde.loads_typed(value)) for task_id, _, channel, value, _ in writes],
+        )
+
+    def _load(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[_Latest]:
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: Tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        row = self.conn.execute(query + " ORDER BY checkpoint_id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        writes = [
+            (task_id, idx, channel, (type_, value), task_path)
+            for task_id, idx, channel, type_, value, task_path in self.conn.execute(
+                "SELECT task_id, idx, channel, type, value, task_path FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, row[0])
+            )
+        ]
+        return _Latest(row[0], row[1], (row[2], row[3]), (row[4], row[5]), writes)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            # 1. The newest checkpoint of an active thread is served from memory
+            active = self._active.get(thread_id)
+            latest = active.latest.get(checkpoint_ns) if active else None
+            if latest is not None and checkpoint_id in (None, latest.checkpoint_id):
+                self._touch(thread_id)
+                return self._to_tuple(thread_id, checkpoint_ns, latest)
+
+            # 2. Anything else comes from disk; a newest checkpoint makes the thread active again
+            loaded = self._load(thread_id, checkpoint_ns, checkpoint_id)
+            if loaded is None:
+                return None
+            if checkpoint_id is None:
+                self._touch(thread_id).latest[checkpoint_ns] = loaded
+                self._evict_idle()
+        return self._to_tuple(thread_id, checkpoint_ns, loaded)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = "SELECT thread_id, checkpoint_ns, checkpoint_id FROM checkpoints WHERE 1 = 1"
+        params: Tuple = ()
+        if config:
+            query += " AND thread_id = ?"
+            params += (str(config["configurable"]["thread_id"]),)
+            if config["configurable"].get("checkpoint_ns") is not None:
+                query += " AND checkpoint_ns = ?"
+                params += (config["configurable"]["checkpoint_ns"],)
+            if get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params += (get_checkpoint_id(config),)
+        if before and get_checkpoint_id(before):
+            query += " AND checkpoint_id < ?"
+            params += (get_checkpoint_id(before),)
+        with self._lock:
+            keys = self.conn.execute(query + " ORDER BY checkpoint_id DESC", params).fetchall()
+
+        for thread_id, checkpoint_ns, checkpoint_id in keys:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                loaded = self._load(thread_id, checkpoint_ns, checkpoint_id)
+            if loaded is None:
+                continue
+            checkpoint_tuple = self._to_tuple(thread_id, checkpoint_ns, loaded)
+            if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        latest = _Latest(
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+            checkpoint=self.serde.dumps_typed(checkpoint),
+            metadata=self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+            writes=[],
+        )
+        with self._lock:
+            # 1. Write through to disk, and cap the thread's history in the same transaction
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, latest.checkpoint_id, latest.parent_checkpoint_id,
+                     *latest.checkpoint, *latest.metadata)
+                )
+                self._prune(thread_id, checkpoint_ns)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+            # 2. It is now the thread's newest checkpoint
+            self._touch(thread_id).latest[checkpoint_ns] = latest
+            self._evict_idle()
+        return self._config(thread_id, checkpoint_ns, latest.checkpoint_id)
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        oldest_kept = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints_per_thread - 1)
+        ).fetchone()
+        if oldest_kept is None:
+            return
+        for table in ("checkpoints", "writes"):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, oldest_kept[0])
+            )
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows: List[_Write] = [
+            (task_id, WRITES_IDX_MAP.get(channel, idx), channel, self.serde.dumps_typed(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Special writes (errors, interrupts...) replace the previous ones; regular writes are never rewritten
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        with self._lock:
+            self.conn.executemany(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, *value, path)
+                 for task_id, idx, channel, value, path in rows]
+            )
+
+            # Keep the in-memory copy of the newest checkpoint in step
+            active = self._active.get(thread_id)
+            latest = active.latest.get(checkpoint_ns) if active else None
+            if latest is not None and latest.checkpoint_id == checkpoint_id:
+                positions = {(write[0], write[1]): pos for pos, write in enumerate(latest.writes)}
+                for row in rows:
+                    pos = positions.get((row[0], row[1]))
+                    if pos is None:
+                        latest.writes.append(row)
+                    elif replace:
+                        latest.writes[pos] = row
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (str(thread_id),))
+            self._active.pop(str(thread_id), None)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,80 @@
+from typing import List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately, get_buffer_string
+
+# What chat_node may send to the LLM per turn (system prompt + summary + recent turns).
+# Counted with an approximation (~4 characters per token), which is all a budget needs.
+CONTEXT_TOKEN_BUDGET = 6000
+
+# When the history overflows, older turns are folded into the summary until the recent
+# turns fit in this share of the budget, so the summary isn't rewritten on every turn
+SUMMARIZE_DOWN_TO = 0.5
+
+# Tool reports are long; the summarizer only needs their gist
+MAX_CHARS_PER_SUMMARIZED_MESSAGE = 1500
+
+# The summarizer's LLM call streams like the reply does; the UI skips events with this tag
+SUMMARY_TAG = "context_summary"
+
+SUMMARY_PROMPT = """You maintain the running summary of a shopping conversation between a user and an assistant for the Egyptian market.
+Update the summary with the new messages below. Keep: what the user wants to buy, their budget in EGP, usage, preferred brands/specs, the products (with prices and URLs) that were already shown, and any decision they made.
+Be concise (at most 200 words). Reply with the updated summary only.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}"""
+
+
+def count_tokens(messages: Sequence[BaseMessage]) -> int:
+    return count_tokens_approximately(messages)
+
+
+def fit_recent_turns(messages: Sequence[BaseMessage], start: int, budget: int) -> int:
+    """
+    Returns the index of the oldest message to keep so that the most recent whole turns
+    fit in `budget` tokens. A turn starts at a user message, so an AI tool call is never
+    separated from its tool results. The latest turn is always kept, whatever its size.
+
+    Args:
+        messages (Sequence[BaseMessage]): The full conversation.
+        start (int): Messages before this index are already summarized.
+        budget (int): Tokens available for the recent turns.
+    """
+    turn_starts = [idx for idx in range(start, len(messages)) if isinstance(messages[idx], HumanMessage)]
+    if not turn_starts:
+        return start
+
+    keep_from = turn_starts[-1]
+    used = count_tokens(messages[keep_from:])
+    for turn_start in reversed(turn_starts[:-1]):
+        turn_tokens = count_tokens(messages[turn_start:keep_from])
+        if used + turn_tokens > budget:
+            break
+        keep_from, used = turn_start, used + turn_tokens
+
+    # Messages before the first user message (nothing to pair them with) only stay if everything fits
+    if keep_from == turn_starts[0] and used + count_tokens(messages[start:keep_from]) <= budget:
+        keep_from = start
+    return keep_from
+
+
+async def summarize(llm, summary: Optional[str], messages: Sequence[BaseMessage]) -> str:
+    """Folds `messages` into the running summary with one LLM call."""
+    clipped: List[BaseMessage] = [
+        message.model_copy(update={"content": message.content[:MAX_CHARS_PER_SUMMARIZED_MESSAGE]})
+        if isinstance(message.content, str) else message
+        for message in messages
+    ]
+    prompt = SUMMARY_PROMPT.format(summary=summary or "(none yet)", messages=get_buffer_string(clipped))
+    response = await llm.with_config(tags=[SUMMARY_TAG]).ainvoke([HumanMessage(content=prompt)])
+    return response.content.strip()
+
+
+def build_prompt(system_prompt: str, summary: Optional[str], recent: Sequence[BaseMessage]) -> List[BaseMessage]:
+    prompt: List[BaseMessage] = [SystemMessage(content=system_prompt)]
+    if summary:
+        prompt.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+    return prompt + list(recent)
@@ -1,15 +1,25 @@
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from typing import TypedDict
 from langchain_groq import ChatGroq
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import SystemMessage, ToolMessage
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import ToolNode, tools_condition
 from loguru import logger
 
+from src.agent.checkpointer import BoundedSqliteSaver
+from src.agent.context import (
+    CONTEXT_TOKEN_BUDGET,
+    SUMMARIZE_DOWN_TO,
+    build_prompt,
+    count_tokens,
+    fit_recent_turns,
+    summarize,
+)
 from src.agent.state import AgentState
-from src.agent.tools import search_ecommerce_sites
+from src.agent.tools import get_price_history, refine_results, search_ecommerce_sites, search_local_catalog
 
 # Load environment variables (for GROQ_API_KEY)
 load_dotenv()
@@ -22,9 +32,12 @@ llm = ChatGroq(
 
 # 1. BIND TOOLS TO THE LLM
 # This tells the LLM: "Hey, you have these tools available if you need them."
-tools = [search_ecommerce_sites]
+tools = [search_local_catalog, search_ecommerce_sites, get_price_history, refine_results]
 llm_with_tools = llm.bind_tools(tools)
 
+# Tools whose artifact holds search results (see search_artifact in src/agent/tools.py)
+SEARCH_TOOLS = {search_local_catalog.name, search_ecommerce_sites.name}
+
 # Updated Persona: Now we explicitly tell it to USE the tool when ready.
 # Updated Persona: Now with strict rules for the search query format!
 # Updated Persona: Now with strict rules for showing URLs!
@@ -37,12 +50,15 @@ Follow these rules strictly:
 2. Ask clarifying questions one by one to understand their needs (budget in EGP, main usage, preferred specs/brand).
 3. Do NOT make up product prices or specifications.
 4. Keep the conversation engaging but concise. Speak in general Egyptian Arabic while keeping the scientific terminology as it is.
-5. CRITICAL: Once you have gathered enough information, YOU MUST call the `search_ecommerce_sites` tool.
+5. CRITICAL: Once you have gathered enough information, YOU MUST first call the `search_local_catalog` tool. Only if it tells you live results are needed, call the `search_ecommerce_sites` tool.
 6. TOOL CALLING RULES (CRITICAL):
    - The `query` argument MUST BE EXTREMELY SHORT, containing ONLY the brand and product type (e.g., "Dell laptop" or "HP Envy"). DO NOT include usage context like "for students" or "for gaming" in the tool query, as e-commerce sites will fail to find it. You will filter the results based on the user's usage needs later.
    - The `max_price` argument MUST be a valid numeric value.
+   - Both search tools take the same `query` and `max_price` arguments.
 7. CRITICAL MANDATORY: When presenting the final search results to the user, you MUST include the EXACT URL link for every product you mention so they can easily click and buy it.
 8. VERY IMPORTANT: When displaying products, you MUST write their full specifications (Processor, RAM, Storage) exactly as provided in the search results.
+9. When the user asks whether a price is good (or wants to wait for a discount), call the `get_price_history` tool with the product's exact URL and base your answer on the recorded prices.
+10. When the user narrows down or re-sorts the products already found (cheaper ones, under a price, a spec like "16GB RAM", one site), call the `refine_results` tool instead of searching again. Only search again for a different product or a higher budget.
 """
 
 async def chat_node(state: AgentState):
@@ -51,18 +67,65 @@ async def chat_node(state: AgentState):
     """
     logger.info("[Agent] Thinking...")
     messages = state.get("messages", [])
+    summary = state.get("summary")
+    summarized_count = state.get("summarized_count", 0)
+    updates = {}
+    
+    # 1. Keep the most recent turns that fit in the budget next to the system prompt and the summary
+    fixed_tokens = count_tokens(build_prompt(SYSTEM_PROMPT, summary, []))
+    keep_from = fit_recent_turns(messages, summarized_count, CONTEXT_TOKEN_BUDGET - fixed_tokens)
     
-    if not messages or not isinstance(messages[0], SystemMessage):
-        messages.insert(0, SystemMessage(content=SYSTEM_PROMPT))
+    # 2. Older turns are folded into the rolling summary (stored in the state, so it's only redone on overflow)
+    if keep_from > summarized_count:
+        keep_from = fit_recent_turns(messages, summarized_count, int(CONTEXT_TOKEN_BUDGET * SUMMARIZE_DOWN_TO) - fixed_tokens)
+        folded = [m for m in messages[summarized_count:keep_from] if not isinstance(m, SystemMessage)]
+        started_at = time.perf_counter()
+        try:
+            summary = await summarize(llm, summary, folded)
+            updates = {"summary": summary, "summarized_count": keep_from}
+            logger.info(f"[Agent] Folded {len(folded)} message(s) into the summary in {time.perf_counter() - started_at:.2f}s")
+        except Exception as e:
+            # The turn still goes through, just without those messages; they're retried next turn
+            logger.warning(f"[Agent] Could not update the summary: {e}")
+    
+    # 3. System prompts stored by older versions of this node are replaced by the current one
+    recent = [m for m in messages[keep_from:] if not isinstance(m, SystemMessage)]
+    prompt = build_prompt(SYSTEM_PROMPT, summary, recent)
     
     # We changed this to await and ainvoke to support the async tool
-    response = await llm_with_tools.ainvoke(messages)
+    started_at = time.perf_counter()
+    response = await llm_with_tools.ainvoke(prompt)
+    latency = time.perf_counter() - started_at
+    
+    usage = getattr(response, "usage_metadata", None) or {}
+    logger.info(
+        f"[Agent] Prompt: ~{count_tokens(prompt)} tokens ({len(recent)} of {len(messages)} messages"
+        f"{', with summary' if summary else ''}; LLM reported {usage.get('input_tokens', '?')}) | LLM latency: {latency:.2f}s"
+    )
     
-    return {"messages": [response]}
+    return {"messages": [response], **updates}
 
-def build_graph():
+async def results_node(state: AgentState):
+    """
+    Stores the products of the search that just ran (its tool message's artifact) in the
+    state, with its query and budget, so `refine_results` can filter them in memory.
+    A search that found nothing replaces them too: refinements never fall back to the
+    products of an earlier, unrelated search.
+    """
+    # The tool messages of this round come right after the AI message that called them
+    for message in reversed(state.get("messages", [])):
+        if not isinstance(message, ToolMessage):
+            break
+        artifact = message.artifact
+        if message.name in SEARCH_TOOLS and isinstance(artifact, dict):
+            logger.info(f"[Agent] Keeping {len(artifact['products'])} product(s) from '{artifact['query']}' for refinements")
+            return {"search_query": artifact["query"], "budget": artifact["max_price"], "search_results": artifact["products"]}
+    return {}
+
+def build_graph(checkpointer=None):
     """
     Builds the Agentic Workflow with Tool routing.
+    Conversations are persisted with a BoundedSqliteSaver unless another checkpointer is given.
     """
     workflow = StateGraph(AgentState)
     
@@ -72,6 +135,7 @@ def build_graph():
     # 2. Add the Prebuilt Tool Node
     tool_node = ToolNode(tools)
     workflow.add_node("tools", tool_node)
+    workflow.add_node("results", results_node)
     
     # Define edges (Routing logic)
     workflow.set_entry_point("chat")
@@ -81,10 +145,28 @@ def build_graph():
     # If it's just text, it goes to END (waiting for user reply).
     workflow.add_conditional_edges("chat", tools_condition)
     
-    # After the tool finishes running, return to the chat node so the LLM can read the results
-    workflow.add_edge("tools", "chat")
+    # After the tool finishes running, keep its search results in the state, then
+    # return to the chat node so the LLM can read them
+    workflow.add_edge("tools", "results")
+    workflow.add_edge("results", "chat")
     
-    memory = MemorySaver()
+    # Persistent and bounded: only active threads stay in memory (see src/agent/checkpointer.py)
+    memory = checkpointer or BoundedSqliteSaver()
     app = workflow.compile(checkpointer=memory)
     
-    return app
\ No newline at end of file
+    return app
+
+# One compiled graph per process, shared by every chat session. Sessions only differ
+# by the thread_id in their config, which is what the checkpointer keys state by.
+_GRAPH = None
+_GRAPH_LOCK = threading.Lock()
+
+def get_graph():
+    """Returns the process-wide compiled graph, building it on first use."""
+    global _GRAPH
+    if _GRAPH is None:
+        with _GRAPH_LOCK:
+            if _GRAPH is None:
+                _GRAPH = build_graph()
+                logger.info("[Agent] Graph compiled.")
+    return _GRAPH
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from loguru import logger
+
+
+class _Flight:
+    """One in-flight call and the number of callers currently awaiting it."""
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is running, every
+    other caller with the same key awaits that call instead of starting its own,
+    and all of them receive its result (or its exception).
+
+    Cancellation: a caller that gets cancelled only stops waiting. The shared call
+    is cancelled once nobody is waiting for it anymore.
+    """
+    def __init__(self, name: str = "SingleFlight"):
+        self.name = name
+        # (event loop id, key) -> flight; a task can only be awaited on its own loop
+        self._flights: Dict[Tuple[int, Hashable], _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return (id(asyncio.get_running_loop()), key) in self._flights
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs `fn()` for this key, or joins the call that is already running.
+
+        Args:
+            key (Hashable): What makes two calls identical (e.g. the normalized query).
+            fn (Callable[[], Awaitable[Any]]): Starts the work; only called by the first caller.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(fn()))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+        else:
+            logger.info(f"[{self.name}] Joining the in-flight call for {key!r} ({flight.waiters} already waiting)")
+
+        flight.waiters += 1
+        try:
+            # shield: cancelling this caller must not cancel the call the others are waiting for
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                logger.info(f"[{self.name}] Every caller for {key!r} left, cancelling the call.")
+                flight.task.cancel()
+
+    def _forget(self, flight_key: Tuple[int, Hashable], flight: _Flight):
+        # A finished call is never reused: the next caller starts a fresh one
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+        # Nobody may be left to retrieve the exception; mark it as seen
+        if not flight.task.cancelled():
+            flight.task.exception()
@@ -13,4 +13,13 @@ class AgentState(TypedDict):
     search_query: str
     
     # The budget that the user will specify and we will store here
-    budget: float
\ No newline at end of file
+    budget: float
+    
+    # Every product of the last search (the search tools' artifact), for refine_results
+    search_results: list
+    
+    # The rolling summary of the turns that no longer fit in the prompt (see src/agent/context.py)
+    summary: str
+    
+    # How many messages (from the start of the conversation) the summary already covers
+    summarized_count: int
@@ -1,142 +1,537 @@
 import asyncio
-import sqlite3
-import os
+import re
+import time
 from datetime import datetime, timedelta
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
 from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.agent.singleflight import SingleFlight
+from src.database.catalog_search import search_catalog
+from src.database.db_manager import get_db_manager
+from src.database.search_cache import MemoryCache, SearchCache
+from src.schemas.product import ProductDetail
 
 # Import our scrapers
 from src.scrapers.amazon_scraper import AmazonScraper
 from src.scrapers.btech_scraper import BtechScraper
 from src.scrapers.noon_scraper import NoonScraper
+from src.scrapers.spec_enricher import enrich_specs
 
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ecommerce_cache.db")
-
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS search_cache (
-            query TEXT,
-            platform TEXT,
-            product_name TEXT,
-            price REAL,
-            url TEXT,
-            timestamp DATETIME
-        )
-    ''')
-    conn.commit()
-    conn.close()
+# Indexed, size-bounded cache of live search results. It lives in the same database
+# (and connection pool) as the product catalog, see src/database/search_cache.py.
+# Results younger than the fresh window are served as is; older ones, up to the stale
+# window, are served right away (labelled with their age) and refreshed in the background.
+search_cache = SearchCache(fresh_ttl=timedelta(hours=24), stale_ttl=timedelta(hours=72), max_rows=200_000)
 
-init_db()
+# In-process tier in front of it: the unfiltered results per normalized query. Every
+# caller's exact budget is applied when the report is built.
+memory_cache = MemoryCache(max_entries=512, ttl=timedelta(minutes=30))
 
-def get_cached_results(query: str, max_price: float = None) -> str:
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
-    
-    c.execute('''
-        SELECT platform, product_name, price, url 
-        FROM search_cache 
-        WHERE LOWER(query) = ? AND timestamp > ?
-    ''', (str(query).lower(), yesterday))
-    
-    rows = c.fetchall()
-    conn.close()
+# Concurrent live searches for the same cache key share one scrape
+search_flights = SingleFlight("SearchFlights")
+
+# Keeps a reference to background jobs so they aren't garbage-collected mid-run
+_background_tasks = set()
+
+def run_in_background(coro, label: str):
+    """Starts a fire-and-forget job and logs its failure instead of losing it."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
     
+    def done(task: asyncio.Task):
+        _background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background {label} failed: {task.exception()}")
+    task.add_done_callback(done)
+    return task
+
+def describe_age(seconds: float) -> str:
+    if seconds < 3600:
+        return f"{max(1, int(seconds // 60))} minute(s) ago"
+    if seconds < 2 * 86400:
+        return f"{int(seconds // 3600)} hour(s) ago"
+    return f"{int(seconds // 86400)} day(s) ago"
+
+async def get_cached_results(query_key: str) -> Tuple[Optional[Dict[str, list]], float, bool]:
+    """
+    Looks the query up in the SQLite cache.
+
+    Returns:
+        Tuple[Optional[Dict[str, list]], float, bool]: Platform name -> cached products, in
+        the order they were saved (None on a miss), how old they are in seconds, and
+        whether they are fresh. They aren't filtered by any budget.
+    """
+    rows = await search_cache.get(query_key)
     if not rows:
-        return None
+        return None, 0.0, False
+    results: Dict[str, list] = {}
+    for row in rows:
+        results.setdefault(row.platform, []).append(row)
+    return results, search_cache.age_seconds(rows), search_cache.is_fresh(rows)
+
+def refresh_in_background(query: str, query_key: str):
+    """Re-runs a live search for a stale cache entry, unless one is already running for that key."""
+    if search_flights.in_flight(query_key):
+        return
+    logger.info(f"🔄 Refreshing stale results for '{query_key}' in the background...")
+    run_in_background(
+        search_flights.do(query_key, lambda: scrape_all_platforms(query, query_key, stream=False)),
+        f"refresh of '{query_key}'"
+    )
+
+async def save_to_cache(query: str, results: dict):
+    """Saves the top products of every platform that answered, in one transaction."""
+    products = {
+        platform: data[:5]
+        for platform, data in results.items()
+        if data and not isinstance(data, Exception)
+    }
+    if not products:
+        return
         
-    logger.success(f"📦 Cache HIT for '{query}'! Skipping live scraping.")
-    
-    formatted = f"Cached Search Results for '{query}':\n\n"
-    platforms = set([row[0] for row in rows])
+    await search_cache.save_search(query, products)
+    logger.info(f"💾 Saved products from {', '.join(products)} to cache.")
     
-    for platform in platforms:
-        formatted += f"### {platform}\n"
-        platform_products = [r for r in rows if r[0] == platform]
-        
-        idx = 1
-        for prod in platform_products[:3]: 
-            _, name, price, url = prod
-            if max_price and price > max_price:
-                continue
-            formatted += f"{idx}. **{name}**\n   - Price: {price} EGP\n   - URL: {url}\n"
-            idx += 1
-        formatted += "\n"
-        
-    return formatted
+    # Expired rows and the size cap are handled in the background, at most once per interval
+    if search_cache.compaction_due():
+        run_in_background(search_cache.compact(), "search cache compaction")
 
-def save_to_cache(query: str, platform: str, products):
-    if not products or isinstance(products, Exception):
+async def save_to_catalog(results: dict):
+    """Upserts every product the platforms returned, which also records their price history."""
+    products = [product for data in results.values() if isinstance(data, list) for product in data]
+    if not products:
         return
+    try:
+        db = await get_db_manager()
+        counts = await db.upsert_products(products)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not save products to the catalog: {e}")
+        return
+    logger.info(f"🗂️ Catalog: {counts['inserted']} new, {counts['updated']} updated product(s).")
+
+# Push each platform's results to the UI as soon as its scraper finishes,
+# instead of waiting for the slowest site. The final tool message is unchanged.
+STREAM_PLATFORM_RESULTS = True
+
+# Latency budget for one live search. Every scraper gets it as its own timeout,
+# and whatever hasn't finished shortly after the deadline is cancelled.
+SEARCH_DEADLINE_SECONDS = 12.0
+DEADLINE_GRACE_SECONDS = 0.5
+
+# After the search, the top results of every platform are opened in parallel to read
+# their specs (Processor, RAM, Storage...), with a separate latency budget. This runs in
+# the background, after the tool has answered: the specs land in the catalog, where
+# cached searches, refinements and the local catalog read them.
+# The report shows at most 3 products per platform, so those are the ones enriched.
+ENRICH_SPECS = True
+ENRICH_TOP_N = 3
+ENRICH_CONCURRENCY = 3
+ENRICH_DEADLINE_SECONDS = 8.0
+
+# Only these specs make it into the report; long marketing bullets are left out
+KEY_SPEC_TERMS = ("processor", "cpu", "ram", "memory", "storage", "ssd", "hard disk", "graphics", "gpu", "screen", "display")
+MAX_SPECS_PER_PRODUCT = 6
+
+# The LLM re-reads every tool report on each later turn, so the search tools answer in a
+# compact form: one line per product, prices in EGP stated once, short canonical URLs.
+# The full products (original URLs, every spec) go in the tool message's artifact, which
+# stays in the conversation state without being sent to the LLM.
+COMPACT_COLUMNS = "one product per line: name | price in EGP | url | key specs"
+
+# In the compact form, specs get one short label each (first match wins, so "internal
+# memory" is storage, not RAM) and are left out when the product name already says them
+COMPACT_SPEC_LABELS = (
+    (("processor", "cpu"), "CPU"),
+    (("storage", "ssd", "hard disk", "internal memory"), "Storage"),
+    (("ram", "memory"), "RAM"),
+    (("graphics", "gpu"), "GPU"),
+    (("screen", "display"), "Screen"),
+)
+
+# Amazon product links carry the ASIN in /dp/<ASIN> or /gp/product/<ASIN>
+AMAZON_ASIN = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})(?=[/?]|$)")
+
+# How far back get_price_history looks when the LLM doesn't say
+PRICE_HISTORY_DAYS = 30
+
+# search_local_catalog answers from stored products when it finds at least this many
+# whose price was scraped recently enough; otherwise the agent runs a live search
+LOCAL_CATALOG_MIN_RESULTS = 3
+LOCAL_CATALOG_MAX_AGE = timedelta(hours=24)
+LOCAL_CATALOG_LIMIT = 9
+
+# refine_results shows at most this many of the stored products
+REFINE_LIMIT = 5
+
+# The platforms we search, in the order they appear in the final report
+SCRAPERS = {
+    "Amazon": AmazonScraper,
+    "B.TECH": BtechScraper,
+    "Noon": NoonScraper,
+}
+
+def summarize_specs(specs: dict) -> str:
+    key_specs = [
+        f"{name}: {value}" for name, value in specs.items()
+        if any(term in name.lower() for term in KEY_SPEC_TERMS) and len(value) <= 80
+    ]
+    return "; ".join(key_specs[:MAX_SPECS_PER_PRODUCT])
+
+def short_url(url: str) -> str:
+    """
+    Canonical short form of a product URL: Amazon links become /dp/<ASIN>, the other sites
+    lose their query string (search tracking, offer ids). Both still open the product page.
+    """
+    parts = urlsplit(str(url))
+    asin = AMAZON_ASIN.search(parts.path) if "amazon." in parts.netloc else None
+    if asin:
+        return f"{parts.scheme}://{parts.netloc}/dp/{asin.group(1)}"
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+def url_pattern(url: str) -> str:
+    """SQL LIKE pattern matching every stored URL that `short_url` shortens to `url`."""
+    url = re.sub(r"([\\%_])", r"\\\1", short_url(url))
+    asin = AMAZON_ASIN.search(url)
+    if asin:
+        return f"%/dp/{asin.group(1)}%"
+    return f"{url}%"
+
+def format_price(price: float) -> str:
+    return f"{price:.0f}" if float(price).is_integer() else f"{price:.2f}"
+
+def compact_specs(specs: dict, name: str = "") -> str:
+    """Key specs as "CPU Core i5, RAM 8 GB", one value per label, skipping what `name` already says."""
+    squeeze = lambda text: re.sub(r"\s+", "", text).lower()
+    in_name = squeeze(name)
+    picked = {}
+    for spec_name, value in specs.items():
+        label = next((label for terms, label in COMPACT_SPEC_LABELS if any(term in spec_name.lower() for term in terms)), None)
+        if label is None or label in picked or len(value) > 80:
+            continue
+        # Counted even when skipped, so a less specific spec doesn't take its place
+        picked[label] = None if squeeze(value) in in_name else value
+    return ", ".join(f"{label} {value}" for label, value in picked.items() if value)
+
+def compact_line(idx: int, name: str, price: float, url: str, specs: dict = None, note: str = None) -> str:
+    fields = [name.strip(), format_price(price), short_url(url)]
+    if note:
+        fields.insert(2, note)
+    key_specs = compact_specs(specs or {}, name)
+    if key_specs:
+        fields.append(key_specs)
+    return f"{idx}. " + " | ".join(fields) + "\n"
+
+def product_record(platform: str, name: str, price: float, url: str, specs: dict = None) -> Dict[str, Any]:
+    return {"platform": platform, "product_name": name, "price": price, "url": str(url), "specifications": specs or {}}
+
+def search_artifact(query: str, max_price: Optional[float], source: str, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The full results behind a compact report ("live", "cache" or "catalog")."""
+    return {"query": query, "max_price": max_price, "source": source, "products": products}
+
+def format_results(platform_name: str, data, max_price: float = None) -> str:
+    """Markdown report of one platform's results, streamed to the UI."""
+    if isinstance(data, asyncio.TimeoutError):
+        return f"### {platform_name}\nTimed out (no response within {SEARCH_DEADLINE_SECONDS:g}s).\n"
+    if isinstance(data, Exception):
+        return f"### {platform_name}\nError fetching data.\n"
+    if not data:
+        return f"### {platform_name}\nNo products found.\n"
         
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    for prod in products[:5]: 
-        # Forcing primitive types to safely store in SQLite
+    formatted = f"### {platform_name}\n"
+    for idx, prod in enumerate(data[:3]):
+        if max_price and prod.price > max_price:
+            continue
         safe_url = str(prod.url)
-        safe_name = str(prod.product_name)
-        safe_price = float(prod.price)
-        
-        c.execute('''
-            INSERT INTO search_cache (query, platform, product_name, price, url, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (str(query).lower(), str(platform), safe_name, safe_price, safe_url, now))
+        formatted += f"{idx+1}. **{prod.product_name}**\n   - Price: {prod.price} EGP\n   - URL: {safe_url}\n"
+        specs = summarize_specs(prod.specifications)
+        if specs:
+            formatted += f"   - Specs: {specs}\n"
+    return formatted + "\n"
+
+def format_compact(platform_name: str, data, max_price: float = None) -> str:
+    """The same results as `format_results`, in the compact form the LLM gets."""
+    if isinstance(data, asyncio.TimeoutError):
+        return f"[{platform_name}] timed out\n"
+    if isinstance(data, Exception):
+        return f"[{platform_name}] error\n"
+    shown = [prod for prod in data[:3] if not (max_price and prod.price > max_price)]
+    if not shown:
+        return f"[{platform_name}] no products found\n"
         
-    conn.commit()
-    conn.close()
-    logger.info(f"💾 Saved products from {platform} to cache.")
+    formatted = f"[{platform_name}]\n"
+    for idx, prod in enumerate(shown, start=1):
+        formatted += compact_line(idx, prod.product_name, prod.price, prod.url, prod.specifications)
+    return formatted
 
-@tool
-async def search_ecommerce_sites(query: str, max_price: float = None) -> str:
+def search_report(header: str, query: str, results: Dict[str, Any], max_price: Optional[float], source: str) -> Tuple[str, dict]:
+    """
+    Builds the compact report and its artifact from every platform's products (or the
+    exception it failed with), keeping only the products within the exact budget.
+    """
+    report = f"{header}\n"
+    products = []
+    for platform, data in results.items():
+        report += format_compact(platform, data, max_price)
+        if isinstance(data, list):
+            products.extend(
+                product_record(platform, prod.product_name, prod.price, prod.url, prod.specifications)
+                for prod in data if not (max_price and prod.price > max_price)
+            )
+    return report, search_artifact(query, max_price, source, products)
+
+async def publish_platform_results(platform_name: str, report: str):
+    """
+    Streams one platform's formatted results to the UI (see the 'platform_results'
+    custom event in src/ui/app.py).
+    """
+    try:
+        await adispatch_custom_event("platform_results", {"platform": platform_name, "report": report})
+    except RuntimeError:
+        # Not running inside a graph run (e.g. the tool was called directly): nothing to stream to
+        pass
+
+async def scrape_all_platforms(query: str, query_key: str, max_price: float = None, stream: bool = True) -> dict:
+    """
+    Runs every scraper under the search deadline, saves the results to the cache and
+    starts enriching the top ones with specs in the background, so the search never
+    takes longer than its deadline. `max_price` is only used to format the
+    per-platform results streamed to the session that started the search
+    (background refreshes don't stream).
+
+    Returns:
+        dict: Platform name -> list of products, or the exception it failed with
+        (asyncio.TimeoutError when it missed the deadline).
+    """
+    started_at = time.perf_counter()
+    deadline = asyncio.get_running_loop().time() + SEARCH_DEADLINE_SECONDS + DEADLINE_GRACE_SECONDS
+    tasks = {
+        asyncio.create_task(scraper_cls(headless=True).scrape(query, timeout_s=SEARCH_DEADLINE_SECONDS)): platform
+        for platform, scraper_cls in SCRAPERS.items()
+    }
+    results = {}
+    
+    # 1. Handle each scraper as soon as it finishes, until the deadline
+    pending = set(tasks)
+    while pending:
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            break
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            platform = tasks[task]
+            data = task.exception() or task.result()
+            results[platform] = data
+            logger.info(f"⏱️ {platform} finished in {time.perf_counter() - started_at:.2f}s")
+            
+            if stream and STREAM_PLATFORM_RESULTS:
+                await publish_platform_results(platform, format_results(platform, data, max_price))
+
+    # 2. Cancel the stragglers and report them as timed out
+    for task in pending:
+        task.cancel()
+        platform = tasks[task]
+        results[platform] = asyncio.TimeoutError()
+        logger.warning(f"⏱️ {platform} timed out after {time.perf_counter() - started_at:.2f}s, cancelled.")
+        if stream and STREAM_PLATFORM_RESULTS:
+            await publish_platform_results(platform, format_results(platform, results[platform], max_price))
+    if pending:
+        # Give the cancelled scrapers a moment to close their pages, without waiting on a hung browser
+        await asyncio.wait(pending, timeout=DEADLINE_GRACE_SECONDS)
+
+    # 3. One write for the whole search (in the report's platform order), and one for the catalog
+    await save_to_cache(query_key, {platform: results[platform] for platform in SCRAPERS})
+    await save_to_catalog(results)
+
+    # 4. Read the specs of the results any caller may be shown, whatever their budget,
+    # without holding up the answer (the products are in the catalog now, see enrich_specs)
+    if ENRICH_SPECS:
+        top_products = []
+        for data in results.values():
+            if isinstance(data, list):
+                top_products.extend(data[:ENRICH_TOP_N])
+        run_in_background(enrich_top_products(top_products), "spec enrichment")
+
+    return results
+
+async def enrich_top_products(products: List[ProductDetail]):
+    started_at = time.perf_counter()
+    await enrich_specs(products, ENRICH_CONCURRENCY, timeout_s=ENRICH_DEADLINE_SECONDS)
+    logger.info(f"⏱️ Spec enrichment finished in {time.perf_counter() - started_at:.2f}s")
+
+@tool(response_format="content_and_artifact")
+async def search_ecommerce_sites(query: str, max_price: float = None) -> Tuple[str, dict]:
     """
     Searches Amazon, B.TECH, and Noon for products matching the request.
     """
     logger.warning(f"🚀 [TOOL TRIGGERED] Query: '{query}' | Budget: {max_price}")
     
-    cached_report = get_cached_results(query, max_price)
-    if cached_report:
-        return cached_report
+    # Near-identical queries ('IdeaPad Lenovo', 'لينوفو ideapad') share one cache key.
+    # Cached results aren't filtered, so every budget is served from the same entry.
+    query_key = await search_cache.resolve_key(query)
+    cache_key = memory_cache.make_key(query_key)
+    
+    cached = memory_cache.get(cache_key)
+    if cached:
+        logger.success(f"⚡ Memory cache HIT for '{query}' (hit rate {memory_cache.hit_rate:.0%})")
+        return search_report(f"Cached results for '{query}' ({COMPACT_COLUMNS}):", query, cached, max_price, "cache")
+    
+    results, age, is_fresh = await get_cached_results(query_key)
+    if results:
+        header = f"Cached results for '{query}' ({COMPACT_COLUMNS}):"
+        if is_fresh:
+            logger.success(f"📦 Cache HIT for '{query}'! Skipping live scraping.")
+            memory_cache.put(cache_key, results)
+        else:
+            # Stale-while-revalidate: answer now, refresh for the next caller
+            logger.success(f"📦 Stale cache HIT for '{query}' ({describe_age(age)}), serving it while refreshing.")
+            header = (
+                f"Cached results for '{query}' ({COMPACT_COLUMNS}). Prices are from {describe_age(age)}, "
+                f"they may have changed; fresh results are being fetched in the background."
+            )
+            refresh_in_background(query, query_key)
+        return search_report(header, query, results, max_price, "cache")
         
     logger.info("No cache found. Running scrapers concurrently...")
     
-    amazon = AmazonScraper(headless=True)
-    btech = BtechScraper(headless=True)
-    noon = NoonScraper(headless=True)
+    # Identical searches from other sessions join this one instead of launching their own browsers
+    results = await search_flights.do(query_key, lambda: scrape_all_platforms(query, query_key, max_price))
+
+    # The LLM still gets one report with every platform, in a stable order
+    results = {platform: results[platform] for platform in SCRAPERS}
     
-    results = await asyncio.gather(
-        amazon.scrape(query),
-        btech.scrape(query),
-        noon.scrape(query),
-        return_exceptions=True
+    # Only complete results are pinned in memory: a site that failed, timed out or came back
+    # empty (scrapers return [] when blocked) is retried by the next search, as with SQLite
+    if all(isinstance(data, list) and data for data in results.values()):
+        memory_cache.put(cache_key, results)
+    return search_report(f"Live results for '{query}' ({COMPACT_COLUMNS}):", query, results, max_price, "live")
+
+@tool
+async def get_price_history(url: str, days: int = PRICE_HISTORY_DAYS) -> str:
+    """
+    Returns the recorded price history of a product (use its URL from the search results):
+    the current, lowest, highest and average price over the last `days` days.
+    Use it to tell the user whether the current price is a good deal.
+    """
+    logger.warning(f"📈 [TOOL TRIGGERED] Price history for '{url}' | Last {days} days")
+    window = timedelta(days=max(1, days))
+    
+    # Local data only: answered from the price_snapshots table, no scraping
+    db = await get_db_manager()
+    stats = await db.get_price_stats(url, window)
+    if stats is None:
+        # The reports show shortened URLs; find the stored one they stand for
+        stored_url = await db.find_product_url(url_pattern(url))
+        if stored_url:
+            url = stored_url
+            stats = await db.get_price_stats(url, window)
+    if stats is None:
+        return f"No price history recorded for {url} yet."
+    history = await db.get_price_history(url, window)
+    
+    report = (
+        f"Price history for {short_url(url)} (last {days} days, {stats['changes']} price change(s)):\n"
+        f"- Current: {stats['current']:g} EGP\n"
+        f"- Lowest: {stats['min']:g} EGP\n"
+        f"- Highest: {stats['max']:g} EGP\n"
+        f"- Average: {stats['avg']:.0f} EGP\n"
     )
+    if stats["min"] == stats["max"]:
+        report += "The price hasn't changed in this period.\n"
+    elif stats["current"] <= stats["min"]:
+        report += "The current price is the lowest in this period.\n"
+    elif stats["current"] >= stats["max"]:
+        report += "The current price is the highest in this period.\n"
     
-    amazon_data, btech_data, noon_data = results
+    # The most recent changes, oldest first
+    report += "Recorded prices:\n"
+    for scraped_at, price in history[-10:]:
+        report += f"- {scraped_at:%Y-%m-%d}: {price:g} EGP\n"
+    return report
+
+@tool(response_format="content_and_artifact")
+async def search_local_catalog(query: str, max_price: float = None) -> Tuple[str, dict]:
+    """
+    Searches the products we already scraped (Amazon, B.TECH, Noon), without a live search.
+    Call it before `search_ecommerce_sites`; it says when live results are needed.
+    """
+    logger.warning(f"🗂️ [TOOL TRIGGERED] Local catalog | Query: '{query}' | Budget: {max_price}")
     
-    save_to_cache(query, "Amazon", amazon_data)
-    save_to_cache(query, "B.TECH", btech_data)
-    save_to_cache(query, "Noon", noon_data)
+    # Only recent prices count; older matches mean the live sites have to be checked again
+    matches = await search_catalog(query, max_price, limit=LOCAL_CATALOG_LIMIT, max_age=LOCAL_CATALOG_MAX_AGE)
+    if len(matches) < LOCAL_CATALOG_MIN_RESULTS:
+        logger.info(f"🗂️ Only {len(matches)} recent local match(es) for '{query}', a live search is needed.")
+        report = (
+            f"Only {len(matches)} recently priced product(s) in the local catalog match '{query}'. "
+            f"Call `search_ecommerce_sites` to get live results."
+        )
+        return report, search_artifact(query, max_price, "catalog", [])
     
-    def format_results(platform_name: str, data) -> str:
-        if isinstance(data, Exception):
-            return f"### {platform_name}\nError fetching data.\n"
-        if not data:
-            return f"### {platform_name}\nNo products found.\n"
-            
-        formatted = f"### {platform_name}\n"
-        for idx, prod in enumerate(data[:3]):
-            if max_price and prod.price > max_price:
-                continue
-            safe_url = str(prod.url)
-            formatted += f"{idx+1}. **{prod.product_name}**\n   - Price: {prod.price} EGP\n   - URL: {safe_url}\n"
-        return formatted + "\n"
-
-    final_report = f"Live Search Results for '{query}':\n\n"
-    final_report += format_results("Amazon", amazon_data)
-    final_report += format_results("B.TECH", btech_data)
-    final_report += format_results("Noon", noon_data)
+    logger.success(f"🗂️ Local catalog HIT for '{query}': {len(matches)} product(s), no scraping needed.")
+    report = (
+        f"Local catalog results for '{query}', stored prices, no live search "
+        f"(one product per line: name | price in EGP | site, checked | url | key specs):\n"
+    )
+    now = datetime.now()
+    for idx, match in enumerate(matches, start=1):
+        note = f"{match.source_website}, {describe_age((now - match.scraped_at).total_seconds())}"
+        report += compact_line(idx, match.product_name, match.price, match.url, match.specifications, note)
+    products = [
+        product_record(match.source_website, match.product_name, match.price, match.url, match.specifications)
+        for match in matches
+    ]
+    return report, search_artifact(query, max_price, "catalog", products)
+
+def matches_terms(product: Dict[str, Any], terms: str) -> bool:
+    """True if every word of `terms` is in the product's name or specs (ignoring case and spaces, so "16GB" matches "16 GB")."""
+    squeeze = lambda text: re.sub(r"\s+", "", str(text)).lower()
+    specs = " ".join(squeeze(f"{name}:{value}") for name, value in product["specifications"].items())
+    haystack = squeeze(product["product_name"]) + " " + specs
+    return all(squeeze(term) in haystack for term in terms.split())
+
+@tool
+async def refine_results(
+    state: Annotated[dict, InjectedState],
+    max_price: float = None,
+    min_price: float = None,
+    contains: str = None,
+    platform: str = None,
+    sort_by: Literal["price_asc", "price_desc"] = "price_asc",
+) -> str:
+    """
+    Filters and sorts the products of the last search, without searching again.
+    `contains` keeps the products whose name or specs have every word (e.g. "16GB RAM"),
+    `platform` keeps one site (Amazon, B.TECH or Noon).
+    """
+    logger.warning(
+        f"🔎 [TOOL TRIGGERED] Refine | Price: {min_price}-{max_price} | Contains: {contains} | Platform: {platform} | Sort: {sort_by}"
+    )
+    products = state.get("search_results") or []
+    if not products:
+        if state.get("search_query"):
+            return f"The last search, for '{state['search_query']}', found no products to refine."
+        return "There are no search results to refine yet. Call `search_local_catalog` first."
+    
+    # 1. In-memory filters over the stored results (no database, network or browser)
+    picked = [
+        prod for prod in products
+        if (max_price is None or prod["price"] <= max_price)
+        and (min_price is None or prod["price"] >= min_price)
+        and (not platform or prod["platform"].lower() == platform.lower())
+        and (not contains or matches_terms(prod, contains))
+    ]
+    picked.sort(key=lambda prod: prod["price"], reverse=sort_by == "price_desc")
     
-    return final_report
\ No newline at end of file
+    # 2. Same compact form as the search reports
+    query, budget = state.get("search_query"), state.get("budget")
+    report = f"{len(picked)} of the {len(products)} products found for '{query}' match "
+    report += "(one product per line: name | price in EGP | site | url | key specs):\n"
+    for idx, prod in enumerate(picked[:REFINE_LIMIT], start=1):
+        report += compact_line(idx, prod["product_name"], prod["price"], prod["url"], prod["specifications"], prod["platform"])
+    if budget and max_price and max_price > budget:
+        report += f"The last search only covered products up to {format_price(budget)} EGP; search again for more expensive ones.\n"
+    return report
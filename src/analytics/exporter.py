@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+from loguru import logger
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.database.db_manager import PROJECT_ROOT
+
+# Analysts query these Parquet files (see src/analytics/queries.py), never the
+# SQLite database the agent writes to
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "ecommerce_data.db")
+EXPORT_DIR = os.path.join(PROJECT_ROOT, "analytics_export")
+WATERMARK_FILE = "_watermark.json"
+
+
+def _number(value: str) -> Optional[float]:
+    match = re.search(r"\d+(?:[.,]\d+)?", value)
+    return float(match.group().replace(",", ".")) if match else None
+
+
+def _gigabytes(value: str) -> Optional[float]:
+    """'512 GB' -> 512.0, '1 TB' -> 1024.0"""
+    number = _number(value)
+    if number is None:
+        return None
+    unit = value.upper()
+    if "TB" in unit:
+        return number * 1024
+    if "MB" in unit:
+        return number / 1024
+    return number
+
+
+def _text(value: str) -> Optional[str]:
+    return value.strip() or None
+
+
+# Typed column -> (the spec names the sites use for it, most specific first; parser).
+# Amazon, Noon and B.TECH all name their specs differently.
+SPEC_COLUMNS: Dict[str, Tuple[Tuple[str, ...], Callable[[str], object]]] = {
+    "brand": (("brand",), _text),
+    "processor": (("processor type", "processor", "cpu model", "processor version number/generation"), _text),
+    "cpu_ghz": (("processor speed", "cpu speed"), _number),
+    "ram_gb": (("ram size", "ram", "installed ram", "ram memory installed size", "memory"), _gigabytes),
+    "storage_gb": (("hard drive size", "hard disk size", "storage capacity", "storage", "ssd capacity", "internal memory"), _gigabytes),
+    "screen_inches": (("screen size", "standing screen display size", "display size"), _number),
+    "gpu": (("graphics coprocessor", "graphics card", "gpu"), _text),
+    "operating_system": (("operating system", "os"), _text),
+}
+
+
+def flatten_specs(specs: Dict[str, str]) -> Dict[str, object]:
+    """Maps a product's free-form specifications onto the typed SPEC_COLUMNS (None when missing)."""
+    by_name = {name.strip().lower(): str(value) for name, value in (specs or {}).items()}
+    flat = {}
+    for column, (names, parse) in SPEC_COLUMNS.items():
+        value = next((by_name[name] for name in names if name in by_name), None)
+        flat[column] = parse(value) if value is not None else None
+    return flat
+
+
+class ParquetExporter:
+    """
+    Incrementally copies the product catalog and its price history out of the app's
+    SQLite database into Parquet, partitioned by site and day:
+
+        analytics_export/products/source_website=Noon/day=2026-10-18/part_<uuid>.parquet
+        analytics_export/price_snapshots/source_website=Noon/day=2026-10-18/part_<uuid>.parquet
+
+    Every run only exports rows written after the previous run: the watermark is the
+    highest row_version already exported per table. Versions grow in commit order
+    (scraped_at does not: a late commit or a backfill can carry an older one), so no
+    row is skipped. A product appears once per time it was written; the query module
+    keeps the one with the highest row_version.
+    """
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, out_dir: str = EXPORT_DIR):
+        self.db_path = db_path
+        self.out_dir = out_dir
+
+    @property
+    def watermark_path(self) -> str:
+        return os.path.join(self.out_dir, WATERMARK_FILE)
+
+    def load_watermark(self) -> Dict[str, int]:
+        """Dataset -> the highest row_version already exported."""
+        if not os.path.exists(self.watermark_path):
+            return {}
+        with open(self.watermark_path, encoding="utf-8") as f:
+            watermark = json.load(f)
+        # Watermarks from before row_version were scraped_at strings: export everything
+        # again once (the query module drops the duplicates)
+        return {dataset: value for dataset, value in watermark.items() if isinstance(value, int)}
+
+    def save_watermark(self, watermark: Dict[str, int]):
+        # Write-then-rename, so a crash never leaves a half-written watermark
+        os.makedirs(self.out_dir, exist_ok=True)
+        tmp_path = self.watermark_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(watermark, f, indent=2)
+        os.replace(tmp_path, self.watermark_path)
+
+    def connect(self) -> sqlite3.Connection:
+        # Read-only: in WAL mode this never blocks the agent's writes
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+
+    def read_changes(self, watermark: Dict[str, int]) -> Dict[str, pd.DataFrame]:
+        """Reads every row written after the watermark, both tables from one consistent snapshot."""
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN")
+            products = pd.read_sql_query(
+                "SELECT url, source_website, product_name, price, currency, is_available, "
+                "specifications, specs_scraped_at, scraped_at, coalesce(row_version, 0) AS row_version "
+                "FROM products WHERE coalesce(row_version, 0) > ? ORDER BY row_version",
+                conn, params=(watermark.get("products", -1),)
+            )
+            price_snapshots = pd.read_sql_query(
+                "SELECT s.url, p.source_website, p.product_name, s.price, s.scraped_at, "
+                "coalesce(s.row_version, 0) AS row_version "
+                "FROM price_snapshots AS s JOIN products AS p ON p.url = s.url "
+                "WHERE coalesce(s.row_version, 0) > ? ORDER BY s.row_version",
+                conn, params=(watermark.get("price_snapshots", -1),)
+            )
+        finally:
+            conn.close()
+        return {"products": products, "price_snapshots": price_snapshots}
+
+    def export(self) -> Dict[str, int]:
+        """
+        Exports everything written since the last run.
+
+        Returns:
+            Dict[str, int]: Dataset -> number of rows written.
+        """
+        watermark = self.load_watermark()
+        changes = self.read_changes(watermark)
+        written = {}
+
+        for dataset, frame in changes.items():
+            written[dataset] = len(frame)
+            if frame.empty:
+                continue
+            # 1. The versions are also exported: the query module keeps the latest copy of a product by them
+            new_watermark = int(frame["row_version"].max())
+            if dataset == "products":
+                frame = self.flatten(frame)
+            self.write(dataset, frame)
+
+            # 2. Only advance it once the files are on disk
+            watermark[dataset] = new_watermark
+            self.save_watermark(watermark)
+
+        logger.success(f"[ParquetExporter] Exported {written} to {self.out_dir}")
+        return written
+
+    @staticmethod
+    def flatten(products: pd.DataFrame) -> pd.DataFrame:
+        """Adds the typed spec columns and keeps the raw specs as a JSON string."""
+        specs = products["specifications"].map(lambda raw: json.loads(raw) if raw else {})
+        flat = pd.DataFrame([flatten_specs(item) for item in specs], index=products.index, columns=list(SPEC_COLUMNS))
+        # Fixed column types, so every Parquet file has the same schema even when a batch has no value
+        for column, (_, parse) in SPEC_COLUMNS.items():
+            flat[column] = flat[column].astype("string" if parse is _text else "float64")
+        products = products.assign(is_available=products["is_available"].astype(bool))
+        return pd.concat([products, flat], axis=1)
+
+    def write(self, dataset: str, frame: pd.DataFrame):
+        """Appends a batch to the dataset as new Parquet files, one per (site, day) partition."""
+        frame = frame.assign(scraped_at=pd.to_datetime(frame["scraped_at"]))
+        frame = frame.assign(day=frame["scraped_at"].dt.date)
+        if "specs_scraped_at" in frame:
+            frame = frame.assign(specs_scraped_at=pd.to_datetime(frame["specs_scraped_at"]))
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, dataset).replace("'", "''")
+        con = duckdb.connect()
+        try:
+            con.register("batch", frame)
+            con.execute(
+                f"COPY batch TO '{path}' (FORMAT PARQUET, PARTITION_BY (source_website, day), "
+                f"FILENAME_PATTERN 'part_{{uuid}}', OVERWRITE_OR_IGNORE)"
+            )
+        finally:
+            con.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export the product catalog to partitioned Parquet files.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--out", default=EXPORT_DIR)
+    args = parser.parse_args(argv)
+    ParquetExporter(args.db, args.out).export()
+
+
+if __name__ == "__main__":
+    main()
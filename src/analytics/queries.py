@@ -0,0 +1,102 @@
+import os
+from glob import glob
+from typing import Optional
+
+import duckdb
+import pandas as pd
+
+from src.analytics.exporter import EXPORT_DIR
+
+
+class CatalogAnalytics:
+    """
+    Cross-site price comparison over the Parquet export (see src/analytics/exporter.py).
+
+    Everything runs in an in-memory DuckDB that only reads the exported files, so
+    analytical scans never touch the SQLite database the agent writes to.
+    Run the exporter first to refresh the data.
+    """
+    def __init__(self, export_dir: str = EXPORT_DIR):
+        self.export_dir = export_dir
+        self.con = duckdb.connect()
+
+        # 1. Every export appends a new version of a rewritten product; keep the latest write.
+        # Not the latest scraped_at: adding specs keeps it, and a late commit can carry an older one.
+        # Files exported before row_version existed have none and lose to the ones that do.
+        self.con.execute(f"""
+            CREATE VIEW products AS
+            SELECT * FROM {self._scan('products')}
+            QUALIFY row_number() OVER (PARTITION BY url ORDER BY row_version DESC NULLS LAST, scraped_at DESC) = 1
+        """)
+        # 2. The price history, without the duplicates a re-run after a failed export can leave
+        self.con.execute(f"""
+            CREATE VIEW price_snapshots AS
+            SELECT DISTINCT url, source_website, product_name, price, scraped_at, day
+            FROM {self._scan('price_snapshots')}
+        """)
+
+    def _scan(self, dataset: str) -> str:
+        pattern = os.path.join(self.export_dir, dataset, "**", "*.parquet")
+        if not glob(pattern, recursive=True):
+            raise FileNotFoundError(f"No exported {dataset} in {self.export_dir}, run src/analytics/exporter.py first.")
+        pattern = pattern.replace("'", "''")
+        return f"read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self) -> "CatalogAnalytics":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def site_price_summary(self, name_like: Optional[str] = None, min_ram_gb: Optional[float] = None) -> pd.DataFrame:
+        """
+        Price distribution per site for the available products matching a name pattern
+        (SQL ILIKE, e.g. '%ideapad%') and a minimum RAM.
+        """
+        return self.con.execute("""
+            SELECT source_website, count(*) AS products,
+                   min(price) AS min_price, median(price) AS median_price, avg(price) AS avg_price
+            FROM products
+            WHERE is_available
+              AND ($name_like IS NULL OR product_name ILIKE $name_like)
+              AND ($min_ram_gb IS NULL OR ram_gb >= $min_ram_gb)
+            GROUP BY source_website
+            ORDER BY median_price
+        """, {"name_like": name_like, "min_ram_gb": min_ram_gb}).df()
+
+    def compare_configurations(self, name_like: Optional[str] = None, min_sites: int = 2) -> pd.DataFrame:
+        """
+        The cheapest price of each hardware configuration (brand, processor, RAM, storage)
+        on every site that sells it, for configurations listed on at least `min_sites`
+        sites. One row per configuration, one price column per site.
+        """
+        cheapest = self.con.execute("""
+            SELECT lower(brand) AS brand, processor, ram_gb, storage_gb, source_website, min(price) AS price
+            FROM products
+            WHERE is_available AND brand IS NOT NULL AND ram_gb IS NOT NULL AND storage_gb IS NOT NULL
+              AND ($name_like IS NULL OR product_name ILIKE $name_like)
+            GROUP BY ALL
+        """, {"name_like": name_like}).df()
+        if cheapest.empty:
+            return cheapest
+
+        keys = ["brand", "processor", "ram_gb", "storage_gb"]
+        table = cheapest.pivot_table(index=keys, columns="source_website", values="price", aggfunc="min", dropna=False)
+        table = table[table.notna().sum(axis=1) >= min_sites]
+        sites = list(table.columns)
+        table["spread"] = table[sites].max(axis=1) - table[sites].min(axis=1)
+        table["cheapest_site"] = table[sites].idxmin(axis=1)
+        return table.sort_values("spread", ascending=False).reset_index()
+
+    def daily_prices(self, name_like: str, days: int = 30) -> pd.DataFrame:
+        """Lowest recorded price per site and day for the products matching a name pattern."""
+        return self.con.execute("""
+            SELECT day, source_website, min(price) AS min_price, count(DISTINCT url) AS products
+            FROM price_snapshots
+            WHERE product_name ILIKE $name_like AND day >= current_date - CAST($days AS INTEGER)
+            GROUP BY day, source_website
+            ORDER BY day, source_website
+        """, {"name_like": name_like, "days": days}).df()
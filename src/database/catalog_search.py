@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import JSON, DateTime, Float, bindparam, text
+
+from src.database.db_manager import DatabaseManager, get_db_manager
+from src.database.search_cache import ARABIC_TO_ENGLISH, query_tokens
+
+
+class CatalogMatch(NamedTuple):
+    url: str
+    source_website: str
+    product_name: str
+    price: float
+    specifications: Dict[str, str]
+    scraped_at: datetime
+    # Lower is better (bm25 relevance weighted by freshness)
+    score: float
+
+
+# English token -> the Arabic spellings product titles use for it ('lenovo' -> 'لينوفو')
+ENGLISH_TO_ARABIC: Dict[str, List[str]] = {}
+for _arabic, _english in ARABIC_TO_ENGLISH.items():
+    ENGLISH_TO_ARABIC.setdefault(_english, []).append(_arabic)
+
+# A product's relevance is halved once its price is this old
+CATALOG_HALF_LIFE = timedelta(days=7)
+
+# Title matches count much more than matches in the specs
+_SEARCH_CATALOG = text(
+    "SELECT p.url, p.source_website, p.product_name, p.price, p.specifications, p.scraped_at, "
+    "bm25(products_fts, 10.0, 1.0) / (1.0 + (julianday(:now) - julianday(p.scraped_at)) / :half_life_days) AS score "
+    "FROM products_fts JOIN products AS p ON p.rowid = products_fts.rowid "
+    "WHERE products_fts MATCH :match AND p.is_available "
+    "AND (:max_price IS NULL OR p.price <= :max_price) "
+    "AND (:since IS NULL OR p.scraped_at >= :since) "
+    "ORDER BY score, p.scraped_at DESC LIMIT :limit"
+).bindparams(
+    bindparam("now", type_=DateTime),
+    bindparam("since", type_=DateTime),
+    bindparam("max_price", type_=Float),
+).columns(specifications=JSON, scraped_at=DateTime)
+
+
+def _quote(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Turns a search query into an FTS5 MATCH expression: every token must match, as a
+    prefix ('ideapad' finds 'IdeaPad'), in English or Arabic spelling. Numbers must
+    match exactly, so '15' doesn't find '156'.
+    'لينوفو ideapad 3' -> '("lenovo"* OR "لينوفو"*) AND ("ideapad"*) AND ("3")'
+    """
+    terms = []
+    for token in dict.fromkeys(query_tokens(query)):
+        spellings = [token, *ENGLISH_TO_ARABIC.get(token, [])]
+        suffix = "" if token.isdigit() else "*"
+        terms.append("(" + " OR ".join(_quote(spelling) + suffix for spelling in spellings) + ")")
+    return " AND ".join(terms) or None
+
+
+async def search_catalog(
+    query: str,
+    max_price: Optional[float] = None,
+    limit: int = 10,
+    max_age: Optional[timedelta] = None,
+    db: Optional[DatabaseManager] = None
+) -> List[CatalogMatch]:
+    """
+    Ranked full-text search over every product stored in the catalog, without scraping.
+
+    Args:
+        query (str): What the user is looking for (English or Arabic).
+        max_price (Optional[float]): Leave out products above this price.
+        limit (int): Maximum number of matches.
+        max_age (Optional[timedelta]): Leave out products whose price is older than this.
+
+    Returns:
+        List[CatalogMatch]: Best matches first; recent prices rank higher (see CATALOG_HALF_LIFE).
+    """
+    match = match_expression(query)
+    if not match:
+        return []
+    db = db or await get_db_manager()
+    now = datetime.now()
+    params = {
+        "match": match,
+        "now": now,
+        "half_life_days": CATALOG_HALF_LIFE / timedelta(days=1),
+        "max_price": max_price or None,
+        "since": now - max_age if max_age else None,
+        "limit": limit,
+    }
+    async with db.engine.connect() as conn:
+        rows = (await conn.execute(_SEARCH_CATALOG, params)).all()
+    return [CatalogMatch(*row) for row in rows]
@@ -1,18 +1,40 @@
+import asyncio
+import os
+from sqlalchemy import DateTime, bindparam, case, event, func, literal, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.future import select
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
-from src.database.models import Base, ProductModel
+from src.database.models import Base, PriceSnapshotModel, ProductModel
 from src.schemas.product import ProductDetail
 
+# One database file for the whole app (product catalog + search cache), at the project
+# root no matter which directory the app is started from
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DB_URL = f"sqlite+aiosqlite:///{os.path.join(PROJECT_ROOT, 'ecommerce_data.db')}"
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    # WAL lets searches read while another session writes; NORMAL is safe with WAL
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
 class DatabaseManager:
     """
     Handles asynchronous database connections and CRUD operations using SQLAlchemy.
     """
-    def __init__(self, db_url: str = "sqlite+aiosqlite:///ecommerce_data.db"):
-        # We use aiosqlite for asynchronous SQLite operations
-        self.engine = create_async_engine(db_url, echo=False)
+    def __init__(self, db_url: str = DEFAULT_DB_URL):
+        # We use aiosqlite for asynchronous SQLite operations.
+        # Connections are pooled and reused instead of being opened per call.
+        self.engine = create_async_engine(db_url, echo=False, pool_size=5, max_overflow=5)
+        event.listen(self.engine.sync_engine, "connect", _configure_sqlite)
         self.SessionLocal = async_sessionmaker(
             bind=self.engine, 
             expire_on_commit=False, 
@@ -23,42 +45,323 @@ class DatabaseManager:
         """Creates tables if they don't exist."""
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+
+            # Databases created before 'specs_scraped_at' existed get the column added in place
+            columns = await conn.execute(text("PRAGMA table_info(products)"))
+            if "specs_scraped_at" not in {row[1] for row in columns}:
+                await conn.execute(text("ALTER TABLE products ADD COLUMN specs_scraped_at DATETIME"))
+
+            # Databases created before 'row_version' existed get it added in place; their
+            # existing rows keep a NULL version and are exported once, on the next run
+            for table in ("products", "price_snapshots"):
+                columns = await conn.execute(text(f"PRAGMA table_info({table})"))
+                if "row_version" not in {row[1] for row in columns}:
+                    await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN row_version INTEGER"))
+                    await conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_row_version ON {table} (row_version)"))
+            for statement in _ROW_VERSION_DDL:
+                await conn.execute(text(statement))
+
+            # Full-text index of the catalog, kept in sync with every write by triggers
+            fts_is_new = not (await conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'")
+            )).first()
+            for statement in _CATALOG_FTS_DDL:
+                await conn.execute(text(statement))
+            if fts_is_new:
+                await conn.execute(text(_CATALOG_FTS_BACKFILL))
+
+            # A new price history starts from the prices already in the catalog
+            if not (await conn.execute(select(PriceSnapshotModel.url).limit(1))).first():
+                await conn.execute(text(
+                    "INSERT OR IGNORE INTO price_snapshots (url, scraped_at, price) "
+                    "SELECT url, scraped_at, price FROM products"
+                ))
         logger.info("[DatabaseManager] Database initialized successfully.")
 
     async def upsert_product(self, product_data: ProductDetail):
         """
         Inserts a new product or updates an existing one based on the URL.
         """
+        counts = await self.upsert_products([product_data])
+        action = "INSERTED new" if counts["inserted"] else "UPDATED existing"
+        logger.debug(f"[DatabaseManager] {action} product: {product_data.product_name[:30]}...")
+
+    async def upsert_products(self, products: List[ProductDetail]) -> Dict[str, int]:
+        """
+        Inserts or updates many products in a single transaction, using
+        SQLite's `INSERT ... ON CONFLICT(url) DO UPDATE`.
+
+        Like `upsert_product`, an update refreshes the price, availability and
+        scraped_at, but never replaces stored specs with an empty dict, and
+        unchanged specs keep their original `specs_scraped_at`. Every product whose
+        price changed (or that is new) also gets a row in the price history.
+
+        Returns:
+            Dict[str, int]: {"inserted": n, "updated": m}
+        """
+        # 1. One row per URL (the last occurrence wins, as it would with one upsert per item)
+        rows_by_url = {}
+        for product in products:
+            parsed_date = datetime.fromisoformat(product.scraped_at)
+            rows_by_url[str(product.url)] = {
+                "url": str(product.url),
+                "source_website": product.source_website,
+                "product_name": product.product_name,
+                "price": product.price,
+                "currency": product.currency,
+                "specifications": product.specifications,
+                "specs_scraped_at": parsed_date if product.specifications else None,
+                "is_available": product.is_available,
+                "scraped_at": parsed_date,
+            }
+        if not rows_by_url:
+            return {"inserted": 0, "updated": 0}
+        urls = list(rows_by_url)
+
+        # 2. The upsert itself: new specs win only when they are non-empty and different
+        stmt = sqlite_insert(ProductModel)
+        new_specs = text(
+            "excluded.specifications NOT IN ('{}', 'null') "
+            "AND excluded.specifications != products.specifications"
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductModel.url],
+            set_={
+                "price": stmt.excluded.price,
+                "is_available": stmt.excluded.is_available,
+                "scraped_at": stmt.excluded.scraped_at,
+                "specifications": case((new_specs, stmt.excluded.specifications), else_=ProductModel.specifications),
+                "specs_scraped_at": case((new_specs, stmt.excluded.specs_scraped_at), else_=ProductModel.specs_scraped_at),
+            }
+        )
+
+        async with self.engine.begin() as conn:
+            # 3. Take the write lock before reading: SQLite has one writer at a time, so no
+            # other session can add or remove these URLs between the count and the upsert
+            await conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+            # 4. Count which URLs already exist (chunked to stay under SQLite's variable limit)
+            existing = 0
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                existing += (await conn.execute(
+                    select(func.count()).select_from(ProductModel).where(ProductModel.url.in_(chunk))
+                )).scalar_one()
+
+            # 5. One executemany for the whole batch, committed once
+            await conn.execute(stmt, list(rows_by_url.values()))
+
+            # 6. Price history, in the same transaction: skipped when the price didn't change
+            await conn.execute(_INSERT_PRICE_SNAPSHOT, [
+                {"url": row["url"], "scraped_at": row["scraped_at"], "price": row["price"]}
+                for row in rows_by_url.values()
+            ])
+
+        return {"inserted": len(urls) - existing, "updated": existing}
+
+    async def get_price_history(self, url: str, window: timedelta) -> List[Tuple[datetime, float]]:
+        """
+        Returns a product's price changes over the last `window`, oldest first. The
+        first entry is the price that was already in effect when the window started.
+        """
+        since = datetime.now() - window
+        async with self.SessionLocal() as session:
+            stmt = (
+                select(PriceSnapshotModel.scraped_at, PriceSnapshotModel.price)
+                .where(PriceSnapshotModel.url == url, PriceSnapshotModel.scraped_at >= _window_start(url, since))
+                .order_by(PriceSnapshotModel.scraped_at)
+            )
+            rows = (await session.execute(stmt)).all()
+        return [(row.scraped_at, row.price) for row in rows]
+
+    async def get_price_stats(self, url: str, window: timedelta) -> Optional[Dict[str, float]]:
+        """
+        Lowest, highest and average price of a product over the last `window`.
+        The average is weighted by how long each price lasted.
+
+        Returns:
+            Optional[Dict[str, float]]: {"current", "min", "max", "avg", "changes"},
+            or None if the product has no recorded price.
+        """
+        now = datetime.now()
+        since = now - window
+        snapshot = PriceSnapshotModel
+
+        # 1. Every price in the window, with how many days it lasted (until the next change, or now)
+        next_change = func.lead(snapshot.scraped_at).over(order_by=snapshot.scraped_at)
+        points = (
+            select(
+                snapshot.price,
+                (
+                    func.julianday(func.coalesce(next_change, literal(now, DateTime)))
+                    - func.julianday(func.max(snapshot.scraped_at, literal(since, DateTime)))
+                ).label("days"),
+            )
+            .where(snapshot.url == url, snapshot.scraped_at >= _window_start(url, since))
+            .subquery()
+        )
+        # 2. Aggregate them (a window that only started now falls back to the plain average)
+        weighted_avg = func.sum(points.c.price * points.c.days) / func.nullif(func.sum(points.c.days), 0)
+        stats_stmt = select(
+            func.min(points.c.price),
+            func.max(points.c.price),
+            func.coalesce(weighted_avg, func.avg(points.c.price)),
+            func.count(),
+        )
+        current_stmt = select(snapshot.price).where(snapshot.url == url).order_by(snapshot.scraped_at.desc()).limit(1)
+
         async with self.SessionLocal() as session:
-            # 1. Check if the product already exists by URL
-            stmt = select(ProductModel).where(ProductModel.url == str(product_data.url))
+            current = (await session.execute(current_stmt)).scalar()
+            if current is None:
+                return None
+            low, high, avg, count = (await session.execute(stats_stmt)).one()
+        return {"current": current, "min": low, "max": high, "avg": avg, "changes": count - 1}
+
+    async def find_product_url(self, pattern: str) -> Optional[str]:
+        """
+        Returns the stored URL matching a LIKE `pattern` (backslash escapes), most recently
+        scraped first. Used to map the shortened URLs the agent sees back to catalog entries.
+        """
+        async with self.SessionLocal() as session:
+            stmt = (
+                select(ProductModel.url)
+                .where(ProductModel.url.like(pattern, escape="\\"))
+                .order_by(ProductModel.scraped_at.desc())
+                .limit(1)
+            )
+            return (await session.execute(stmt)).scalar()
+
+    async def get_fresh_specs(self, url: str, max_age: timedelta) -> Optional[Dict[str, str]]:
+        """
+        Returns the stored specifications of a product if they were scraped within `max_age`.
+
+        Returns:
+            Optional[Dict[str, str]]: The specs, or None if the product is unknown,
+            has no specs yet, or its specs are too old.
+        """
+        async with self.SessionLocal() as session:
+            stmt = select(ProductModel.specifications, ProductModel.specs_scraped_at).where(ProductModel.url == url)
+            row = (await session.execute(stmt)).first()
+
+        if not row or not row.specifications or row.specs_scraped_at is None:
+            return None
+        if datetime.now() - row.specs_scraped_at > max_age:
+            return None
+        return row.specifications
+
+    async def save_specs(self, url: str, specs: Dict[str, str]) -> bool:
+        """
+        Stores freshly scraped specifications on an already known product.
+
+        Returns:
+            bool: False if the product isn't in the table yet (it's saved with
+            its specs once the search result itself is upserted).
+        """
+        if not specs:
+            return False
+        async with self.SessionLocal() as session:
+            stmt = (
+                update(ProductModel)
+                .where(ProductModel.url == url)
+                .values(specifications=specs, specs_scraped_at=datetime.now())
+            )
             result = await session.execute(stmt)
-            existing_product = result.scalars().first()
-
-            # Parse the ISO format string back to a Python datetime object
-            parsed_date = datetime.fromisoformat(product_data.scraped_at)
-
-            if existing_product:
-                # 2. Update existing product
-                existing_product.price = product_data.price
-                existing_product.is_available = product_data.is_available
-                existing_product.specifications = product_data.specifications
-                existing_product.scraped_at = parsed_date
-                logger.debug(f"[DatabaseManager] UPDATED existing product: {product_data.product_name[:30]}...")
-            else:
-                # 3. Insert new product
-                new_product = ProductModel(
-                    url=str(product_data.url),
-                    source_website=product_data.source_website,
-                    product_name=product_data.product_name,
-                    price=product_data.price,
-                    currency=product_data.currency,
-                    specifications=product_data.specifications,
-                    is_available=product_data.is_available,
-                    scraped_at=parsed_date
-                )
-                session.add(new_product)
-                logger.debug(f"[DatabaseManager] INSERTED new product: {product_data.product_name[:30]}...")
-
-            # 4. Commit the transaction (Safely at the end!)
-            await session.commit()
\ No newline at end of file
+            await session.commit()
+        return result.rowcount > 0
+
+
+
+# Every write to the catalog stamps the row with the next row_version of its table. SQLite
+# has one writer at a time and the trigger runs inside the writer's transaction, so versions
+# grow in commit order, unlike scraped_at (a late commit or a backfill can carry an older
+# scraped_at). The analytics exporter uses them as its watermark.
+def _next_row_version(table: str) -> str:
+    return f"(SELECT coalesce(max(row_version), 0) + 1 FROM {table})"
+
+
+_ROW_VERSION_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS products_version_insert AFTER INSERT ON products BEGIN "
+    f"UPDATE products SET row_version = {_next_row_version('products')} WHERE rowid = new.rowid; END",
+    # The version update itself changes row_version, so it never re-fires this trigger
+    "CREATE TRIGGER IF NOT EXISTS products_version_update AFTER UPDATE ON products "
+    "WHEN new.row_version IS old.row_version BEGIN "
+    f"UPDATE products SET row_version = {_next_row_version('products')} WHERE rowid = new.rowid; END",
+    # Snapshots are never updated, only appended
+    "CREATE TRIGGER IF NOT EXISTS price_snapshots_version_insert AFTER INSERT ON price_snapshots BEGIN "
+    f"UPDATE price_snapshots SET row_version = {_next_row_version('price_snapshots')} "
+    "WHERE url = new.url AND scraped_at = new.scraped_at; END",
+]
+
+
+# Product names and flattened specs ("RAM 16 GB Storage 512 GB ...") as an FTS5 index over
+# the products table, keyed by its rowid. Arabic letter variants are folded the same way
+# queries are (see normalize_arabic in search_cache.py).
+def _fold_arabic(column: str) -> str:
+    for variant, letter in (("أ", "ا"), ("إ", "ا"), ("آ", "ا"), ("ة", "ه"), ("ى", "ي")):
+        column = f"replace({column}, '{variant}', '{letter}')"
+    return column
+
+
+def _flatten_specs(column: str) -> str:
+    return f"(SELECT group_concat(key || ' ' || value, ' ') FROM json_each(coalesce({column}, '{{}}')))"
+
+
+def _catalog_fts_values(row: str) -> str:
+    return f"{row}.rowid, {_fold_arabic(row + '.product_name')}, {_fold_arabic(_flatten_specs(row + '.specifications'))}"
+
+
+_CATALOG_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "product_name, specs, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN "
+    f"INSERT INTO products_fts (rowid, product_name, specs) VALUES ({_catalog_fts_values('new')}); END",
+    # Upserts rewrite the specs column on every price update; only real changes are reindexed
+    "CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF product_name, specifications ON products "
+    "WHEN old.product_name IS NOT new.product_name OR old.specifications IS NOT new.specifications BEGIN "
+    "DELETE FROM products_fts WHERE rowid = old.rowid; "
+    f"INSERT INTO products_fts (rowid, product_name, specs) VALUES ({_catalog_fts_values('new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN "
+    "DELETE FROM products_fts WHERE rowid = old.rowid; END",
+]
+
+_CATALOG_FTS_BACKFILL = (
+    "INSERT INTO products_fts (rowid, product_name, specs) "
+    f"SELECT {_catalog_fts_values('products')} FROM products"
+)
+
+# Appends a price snapshot unless it repeats the product's latest one (or the exact same
+# snapshot is already stored); the (url, scraped_at) primary key makes the lookup cheap
+_INSERT_PRICE_SNAPSHOT = text(
+    "INSERT OR IGNORE INTO price_snapshots (url, scraped_at, price) "
+    "SELECT :url, :scraped_at, :price "
+    "WHERE :price IS NOT (SELECT price FROM price_snapshots WHERE url = :url ORDER BY scraped_at DESC LIMIT 1)"
+).bindparams(bindparam("scraped_at", type_=DateTime))
+
+
+def _window_start(url: str, since: datetime):
+    """The snapshot that was in effect at `since` (or `since` itself if the history starts later)."""
+    return (
+        select(func.coalesce(func.max(PriceSnapshotModel.scraped_at), literal(since, DateTime)))
+        .where(PriceSnapshotModel.url == url, PriceSnapshotModel.scraped_at <= since)
+        .scalar_subquery()
+    )
+
+# One shared manager per event loop (an async engine can't be shared across loops).
+# We keep the setup task, so concurrent first callers wait for the same init_db.
+_MANAGERS: Dict[int, "asyncio.Task[DatabaseManager]"] = {}
+
+
+async def _create_db_manager() -> DatabaseManager:
+    manager = DatabaseManager()
+    await manager.init_db()
+    return manager
+
+
+async def get_db_manager() -> DatabaseManager:
+    """Returns the process-wide DatabaseManager for the running event loop, creating its tables on first use."""
+    key = id(asyncio.get_running_loop())
+    task = _MANAGERS.get(key)
+    if task is None or (task.done() and (task.cancelled() or task.exception())):
+        task = asyncio.ensure_future(_create_db_manager())
+        _MANAGERS[key] = task
+    return await task
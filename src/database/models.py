@@ -1,6 +1,7 @@
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-from sqlalchemy import String, Float, Boolean, JSON, DateTime
+from sqlalchemy import String, Float, Boolean, JSON, DateTime, Index, Integer
 from datetime import datetime
+from typing import Optional
 
 Base = declarative_base()
 
@@ -21,6 +22,52 @@ class ProductModel(Base):
     
     # SQLAlchemy's JSON type handles Python dictionaries automatically
     specifications: Mapped[dict] = mapped_column(JSON, default=dict)
+    # When the specifications were last scraped (search results update the price without them)
+    specs_scraped_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     is_available: Mapped[bool] = mapped_column(Boolean, default=True)
-    scraped_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    scraped_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Bumped by a trigger on every write, in commit order (see _ROW_VERSION_DDL in db_manager.py)
+    row_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+
+
+class SearchResultModel(Base):
+    """
+    SQLAlchemy Model for the 'search_results' table: the cached live search results
+    (see src/database/search_cache.py), keyed by the normalized query.
+    """
+    __tablename__ = "search_results"
+    __table_args__ = (
+        # Every cache lookup is "this key, newer than the TTL"
+        Index("ix_search_results_key_created", "query_key", "created_at"),
+        # Compaction deletes by age
+        Index("ix_search_results_created", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    query_key: Mapped[str] = mapped_column(String, nullable=False)
+    platform: Mapped[str] = mapped_column(String, nullable=False)
+    product_name: Mapped[str] = mapped_column(String, nullable=False)
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+
+    # Unix timestamp (seconds)
+    created_at: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class PriceSnapshotModel(Base):
+    """
+    SQLAlchemy Model for the 'price_snapshots' table: an append-only price history
+    written alongside every product upsert. A snapshot is only added when the price
+    differs from the product's previous one, so each row is a price change.
+    """
+    __tablename__ = "price_snapshots"
+    # The (url, scraped_at) primary key is the only index the history queries need;
+    # WITHOUT ROWID stores the rows in it directly instead of in a second b-tree
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    url: Mapped[str] = mapped_column(String, primary_key=True)
+    scraped_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    # Set by a trigger on insert, in commit order (see _ROW_VERSION_DDL in db_manager.py)
+    row_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
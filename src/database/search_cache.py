@@ -0,0 +1,374 @@
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+from loguru import logger
+from sqlalchemy import delete, func, insert, select
+
+from src.database.db_manager import DatabaseManager, get_db_manager
+from src.database.models import ProductModel, SearchResultModel
+from src.schemas.brands import ARABIC_BRAND_MAP
+
+
+class CachedProduct(NamedTuple):
+    platform: str
+    product_name: str
+    price: float
+    url: str
+    # Unix timestamp of the search that stored it
+    created_at: float
+    # Read from the product catalog, where spec enrichment stores them ({} if unknown)
+    specifications: Dict[str, str]
+
+
+# Filler words the LLM adds or drops between turns; they don't change what the sites return
+STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "the", "with", "في", "مع", "من"})
+
+# Tashkeel and tatweel, then the letter variants people type interchangeably
+_ARABIC_MARKS = re.compile(r"[\u064B-\u0652\u0640]")
+_ARABIC_LETTERS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ة": "ه", "ى": "ي"})
+
+
+def normalize_arabic(text: str) -> str:
+    """'آيفون' -> 'ايفون'"""
+    return _ARABIC_MARKS.sub("", text).translate(_ARABIC_LETTERS)
+
+
+# Arabic spelling -> English token: the scrapers' brand map plus a few product types
+ARABIC_TO_ENGLISH = {
+    normalize_arabic(ara): eng
+    for eng, ara in {**ARABIC_BRAND_MAP, "laptop": "لابتوب", "mobile": "موبايل"}.items()
+}
+
+
+def query_tokens(query: str) -> List[str]:
+    """Splits a query into lowercase tokens, with Arabic brand names transliterated and filler words dropped."""
+    text = normalize_arabic(unicodedata.normalize("NFKC", str(query)).lower())
+    tokens = (ARABIC_TO_ENGLISH.get(token, token) for token in re.findall(r"\w+", text))
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+def normalize_query(query: str) -> str:
+    """
+    The canonical key every cached search is stored under: case, spacing, word order
+    and Arabic/English brand spelling don't matter.
+    'IdeaPad  Lenovo', 'lenovo ideapad' and 'لينوفو IdeaPad' -> 'ideapad lenovo'
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return re.sub(r"\s+", " ", str(query)).strip().lower()
+    return " ".join(sorted(set(tokens)))
+
+
+def _numbers(tokens: Set[str]) -> Set[str]:
+    return {token for token in tokens if any(char.isdigit() for char in token)}
+
+
+class TokenSetIndex:
+    """
+    Finds an already cached key that is near-identical to a new one, so
+    'lenovo ideapad slim 3 laptop' can reuse 'lenovo ideapad slim 3'.
+
+    Two keys match when the Jaccard similarity of their token sets reaches `threshold`
+    and they contain exactly the same numbers ('iphone 15' never matches 'iphone 14').
+    """
+    def __init__(self, threshold: float = 0.8, max_keys: int = 50_000):
+        self.threshold = threshold
+        self.max_keys = max_keys
+        # Insertion-ordered, so the oldest keys are dropped first
+        self._keys: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._keys_by_token: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str):
+        if not key or key in self._keys:
+            return
+        tokens = set(key.split())
+        self._keys[key] = tokens
+        for token in tokens:
+            self._keys_by_token.setdefault(token, set()).add(key)
+
+        while len(self._keys) > self.max_keys:
+            old_key, old_tokens = self._keys.popitem(last=False)
+            for token in old_tokens:
+                self._keys_by_token[token].discard(old_key)
+                if not self._keys_by_token[token]:
+                    del self._keys_by_token[token]
+
+    def clear(self):
+        self._keys.clear()
+        self._keys_by_token.clear()
+
+    def find(self, key: str) -> Optional[str]:
+        """Returns `key` itself if indexed, else the most similar indexed key, else None."""
+        if key in self._keys:
+            return key
+        tokens = set(key.split())
+        if not tokens:
+            return None
+
+        numbers = _numbers(tokens)
+        candidates = set().union(*(self._keys_by_token.get(token, ()) for token in tokens))
+        best_key, best_score = None, self.threshold
+        for candidate in candidates:
+            candidate_tokens = self._keys[candidate]
+            if _numbers(candidate_tokens) != numbers:
+                continue
+            score = len(tokens & candidate_tokens) / len(tokens | candidate_tokens)
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+
+class MemoryCache:
+    """
+    Small in-process LRU cache with a TTL, in front of the SQLite cache.
+
+    It holds the unfiltered results of a search per normalized query, so a repeated search
+    (whatever its budget) costs a dict lookup instead of a database query.
+    """
+    def __init__(self, max_entries: int = 512, ttl: timedelta = timedelta(minutes=30)):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str) -> str:
+        return normalize_query(query)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl.total_seconds(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+class SearchCache:
+    """
+    Cache of live search results in the `search_results` table, keyed by the normalized query.
+
+    It shares DatabaseManager's async engine (and its connection pool) with the product
+    catalog. Lookups hit the (query_key, created_at) index and the table never grows
+    past `max_rows`.
+
+    Results are "fresh" for `fresh_ttl` and then "stale" until `stale_ttl`: stale results
+    can still be shown right away while they are refreshed (stale-while-revalidate).
+    Rows older than `stale_ttl` are ignored and later deleted by `compact`.
+    """
+    def __init__(
+        self,
+        db: Optional[DatabaseManager] = None,
+        fresh_ttl: timedelta = timedelta(hours=24),
+        stale_ttl: timedelta = timedelta(hours=72),
+        max_rows: int = 200_000,
+        compact_interval: timedelta = timedelta(hours=1)
+    ):
+        # When no manager is given, we use the shared one
+        self._db = db
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_rows = max_rows
+        self.compact_interval = compact_interval
+        # Rows deleted per transaction during compaction
+        self.compact_batch = 5000
+        self._compacting = False
+        self._last_compaction = 0.0
+        # Keys of the unexpired searches, loaded from the table on first use
+        self.key_index = TokenSetIndex()
+        self._index_loaded = False
+
+    async def get_db(self) -> DatabaseManager:
+        return self._db or await get_db_manager()
+
+    async def resolve_key(self, query: str) -> str:
+        """
+        Returns the cache key for a query: its canonical form, or the key of a
+        near-identical search that is already cached (see TokenSetIndex).
+        """
+        key = normalize_query(query)
+        if not self._index_loaded:
+            await self._load_index()
+        similar = self.key_index.find(key)
+        if similar and similar != key:
+            logger.debug(f"[SearchCache] '{query}' shares the cache entry of '{similar}'")
+        return similar or key
+
+    async def _load_index(self):
+        cutoff = time.time() - self.stale_ttl.total_seconds()
+        stmt = select(SearchResultModel.query_key).where(SearchResultModel.created_at > cutoff).distinct()
+        db = await self.get_db()
+        async with db.engine.connect() as conn:
+            keys = (await conn.execute(stmt)).scalars().all()
+        for key in keys:
+            self.key_index.add(key)
+        self._index_loaded = True
+
+    async def get(self, query: str) -> List[CachedProduct]:
+        """
+        Returns the cached products for the query (fresh or stale), in the order they were saved,
+        with the specs the catalog has for them. When a query was searched more than once,
+        each platform's latest results win.
+        """
+        cutoff = time.time() - self.stale_ttl.total_seconds()
+        stmt = (
+            select(
+                SearchResultModel.platform, SearchResultModel.product_name, SearchResultModel.price,
+                SearchResultModel.url, SearchResultModel.created_at, ProductModel.specifications
+            )
+            .outerjoin(ProductModel, ProductModel.url == SearchResultModel.url)
+            .where(SearchResultModel.query_key == normalize_query(query), SearchResultModel.created_at > cutoff)
+            .order_by(SearchResultModel.id)
+        )
+        db = await self.get_db()
+        async with db.engine.connect() as conn:
+            rows = [
+                CachedProduct(*row[:5], specifications=row.specifications or {})
+                for row in (await conn.execute(stmt)).all()
+            ]
+
+        latest: Dict[str, float] = {}
+        for row in rows:
+            latest[row.platform] = max(latest.get(row.platform, 0.0), row.created_at)
+        return [row for row in rows if row.created_at == latest[row.platform]]
+
+    @staticmethod
+    def age_seconds(rows: List[CachedProduct]) -> float:
+        """How old the oldest of these cached results is."""
+        return time.time() - min(row.created_at for row in rows)
+
+    def is_fresh(self, rows: List[CachedProduct]) -> bool:
+        return self.age_seconds(rows) <= self.fresh_ttl.total_seconds()
+
+    async def save_search(self, query: str, results: Dict[str, list]) -> int:
+        """
+        Stores every platform's products for one search in a single transaction.
+
+        Args:
+            query (str): The search term.
+            results (Dict[str, list]): Platform name -> list of ProductDetail.
+
+        Returns:
+            int: The number of rows written.
+        """
+        now = time.time()
+        key = normalize_query(query)
+        rows = [
+            # Forcing primitive types to safely store in SQLite
+            {
+                "query_key": key,
+                "platform": str(platform),
+                "product_name": str(prod.product_name),
+                "price": float(prod.price),
+                "url": str(prod.url),
+                "created_at": now,
+            }
+            for platform, products in results.items()
+            for prod in products
+        ]
+        if not rows:
+            return 0
+
+        db = await self.get_db()
+        async with db.engine.begin() as conn:
+            await conn.execute(insert(SearchResultModel), rows)
+        self.key_index.add(key)
+        return len(rows)
+
+    async def _delete_in_batches(self, ids_stmt, limit_total: Optional[int] = None) -> int:
+        """
+        Deletes the rows whose ids `ids_stmt` selects, `compact_batch` at a time and each
+        batch in its own short transaction, so a big cleanup never blocks searches for long.
+        """
+        db = await self.get_db()
+        deleted = 0
+        while True:
+            batch = self.compact_batch if limit_total is None else min(self.compact_batch, limit_total - deleted)
+            if batch <= 0:
+                break
+            async with db.engine.begin() as conn:
+                result = await conn.execute(
+                    delete(SearchResultModel).where(SearchResultModel.id.in_(ids_stmt.limit(batch)))
+                )
+            deleted += result.rowcount
+            if result.rowcount < batch:
+                break
+        return deleted
+
+    def compaction_due(self) -> bool:
+        return not self._compacting and time.time() - self._last_compaction >= self.compact_interval.total_seconds()
+
+    async def compact(self) -> int:
+        """
+        Deletes expired rows, then the oldest rows beyond `max_rows`.
+        Meant to run as a background task; concurrent calls are skipped.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        if self._compacting:
+            return 0
+        self._compacting = True
+        self._last_compaction = time.time()
+        started_at = time.perf_counter()
+        try:
+            cutoff = time.time() - self.stale_ttl.total_seconds()
+            deleted = await self._delete_in_batches(
+                select(SearchResultModel.id).where(SearchResultModel.created_at <= cutoff)
+            )
+
+            # Size cap: whatever is left beyond `max_rows`, oldest first
+            db = await self.get_db()
+            async with db.engine.connect() as conn:
+                total = (await conn.execute(select(func.count()).select_from(SearchResultModel))).scalar_one()
+            if total > self.max_rows:
+                deleted += await self._delete_in_batches(
+                    select(SearchResultModel.id).order_by(SearchResultModel.created_at, SearchResultModel.id),
+                    limit_total=total - self.max_rows
+                )
+        finally:
+            self._compacting = False
+
+        # Expired keys shouldn't attract new queries: reload the index on next use
+        if deleted:
+            self.key_index.clear()
+            self._index_loaded = False
+
+        logger.info(f"[SearchCache] Compacted {deleted} row(s) in {time.perf_counter() - started_at:.2f}s.")
+        return deleted
@@ -0,0 +1,3 @@
+# Brand names as they appear in Arabic product titles. The scrapers use it to match
+# English queries against Arabic titles, and the search cache to canonicalize queries.
+ARABIC_BRAND_MAP = {"lenovo": "لينوفو", "samsung": "سامسونج", "iphone": "ايفون", "apple": "ابل"}
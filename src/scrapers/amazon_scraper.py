@@ -1,83 +1,83 @@
-import asyncio
 import re
-from playwright.async_api import async_playwright
-from pydantic import BaseModel, HttpUrl
+from datetime import datetime
+from typing import List
+from urllib.parse import quote_plus
+from selectolax.parser import HTMLParser
 from loguru import logger
 
-class Product(BaseModel):
-    product_name: str
-    price: float
-    url: HttpUrl
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.readiness import ReadinessProfile
+from src.scrapers.resource_blocker import AMAZON_TRACKER_DOMAINS, BlockingPolicy
+from src.schemas.product import ProductDetail
 
-class AmazonScraper:
-    def __init__(self, headless: bool = True):
-        self.headless = headless
+class AmazonScraper(BaseScraper):
+    """
+    Scraper for Amazon Egypt.
+    Reads the whole results grid from a single HTML snapshot (one round trip)
+    instead of querying every element through the browser.
+    """
 
-    async def scrape(self, query: str):
-        logger.info(f"[AmazonScraper] Searching for '{query}'...")
-        products = []
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=self.headless)
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-                )
-                page = await context.new_page()
-                
-                search_url = f"https://www.amazon.eg/s?k={query.replace(' ', '+')}"
-                await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                
-                try:
-                    await page.wait_for_selector("div[data-component-type='s-search-result']", timeout=10000)
-                except:
-                    logger.warning("[AmazonScraper] Blocked or no results.")
-                    await browser.close()
-                    return products
-                    
-                items = await page.query_selector_all("div[data-component-type='s-search-result']")
-                
-                # Increased to 8 to ensure we catch valid non-sponsored products
-                for item in items[:8]: 
-                    try:
-                        # 1. Ultra-resilient Title extraction (Just look for the h2 tag)
-                        title_el = await item.query_selector("h2")
-                        if not title_el:
-                            continue
-                        full_title = await title_el.inner_text()
-                        
-                        # 2. Resilient Price extraction
-                        price_el = await item.query_selector(".a-price-whole")
-                        if not price_el:
-                            continue
-                        price_text = await price_el.inner_text()
-                        
-                        clean_price = re.sub(r'[^\d.]', '', price_text)
-                        if not clean_price or clean_price == '.':
-                            continue
-                        price = float(clean_price)
-                        
-                        # 3. Resilient Link extraction (Fallback added)
-                        link_el = await item.query_selector("h2 a")
-                        if not link_el:
-                            link_el = await item.query_selector("a.a-link-normal")
-                            
-                        if not link_el:
-                            continue
-                            
-                        link_href = await link_el.get_attribute("href")
-                        full_url = link_href if link_href.startswith("http") else f"https://www.amazon.eg{link_href}"
-                        
-                        products.append(Product(
-                            product_name=full_title.strip(),
-                            price=price,
-                            url=full_url
-                        ))
-                    except Exception as e:
-                        continue
-                        
-                await browser.close()
-                logger.success(f"[AmazonScraper] Successfully scraped {len(products)} products with full specs!")
-                return products
-        except Exception as e:
-            logger.error(f"[AmazonScraper] Error: {e}")
-            return e
\ No newline at end of file
+    site_name = "Amazon"
+
+    page_timeout_ms = 30000
+
+    # Amazon renders results server-side; one result card is enough to start reading
+    readiness = ReadinessProfile(
+        selector="div[data-component-type='s-search-result']",
+        min_count=1,
+        timeout_ms=10000
+    )
+
+    blocking = BlockingPolicy().extend(deny_domains=AMAZON_TRACKER_DOMAINS)
+
+    def build_search_url(self, product_query: str) -> str:
+        return f"https://www.amazon.eg/s?k={quote_plus(product_query)}"
+
+    def parse_results(self, html: str, product_query: str) -> List[ProductDetail]:
+        results: List[ProductDetail] = []
+        tree = HTMLParser(html)
+
+        items = tree.css("div[data-component-type='s-search-result']")
+        if not items:
+            logger.warning("[AmazonScraper] Blocked or no results.")
+            return results
+
+        # Increased to 8 to ensure we catch valid non-sponsored products
+        for item in items[:8]:
+            # 1. Ultra-resilient Title extraction (Just look for the h2 tag)
+            title_el = item.css_first("h2")
+            if not title_el:
+                continue
+            full_title = title_el.text(strip=True)
+
+            # 2. Resilient Price extraction
+            price_el = item.css_first(".a-price-whole")
+            if not price_el:
+                continue
+            clean_price = re.sub(r'[^\d.]', '', price_el.text(strip=True)).rstrip('.')
+            if not clean_price:
+                continue
+            price = float(clean_price)
+
+            # 3. Resilient Link extraction (Fallback added)
+            link_el = item.css_first("h2 a") or item.css_first("a.a-link-normal")
+            link_href = link_el.attributes.get("href") if link_el else None
+            if not link_href:
+                continue
+            full_url = link_href if link_href.startswith("http") else f"https://www.amazon.eg{link_href}"
+
+            try:
+                results.append(ProductDetail(
+                    source_website="Amazon",
+                    product_name=full_title,
+                    price=price,
+                    currency="EGP",
+                    url=full_url,
+                    specifications={},
+                    is_available=True,
+                    scraped_at=datetime.now().isoformat()
+                ))
+            except Exception:
+                continue
+
+        return results
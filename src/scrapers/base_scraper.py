@@ -1,28 +1,117 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, Dict, List, Optional
+from playwright.async_api import Page
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from src.database.db_manager import DatabaseManager, get_db_manager
 from src.schemas.product import ProductDetail
+from src.scrapers.browser_pool import BrowserPool, DEFAULT_USER_AGENT, get_browser_pool
+from src.scrapers.http_client import HTTP_TIMEOUT_S, fetch_html
+from src.scrapers.readiness import ReadinessProfile, wait_until_ready
+from src.scrapers.resource_blocker import BlockingPolicy, ResourceBlocker
 
-class BaseScraper(ABC):
+# How many requests each scraper served through each path, e.g. {("NoonScraper", "http"): 12}
+FETCH_PATH_STATS: Counter = Counter()
+
+# How often the spec scrapers found fresh specs in the products table, e.g. {("NoonSpecScraper", "hit"): 40}
+SPEC_CACHE_STATS: Counter = Counter()
+
+
+class BrowserScraper(ABC):
     """
-    Abstract Base Class for all e-commerce scrapers.
-    Forces all child classes to implement the 'scrape' method.
+    Shared plumbing for every scraper: the plain HTTP client, the shared
+    browser pool and the per-site page configuration.
     """
-    
-    def __init__(self, headless: bool = True):
+
+    # Options passed to `browser.new_context` for this site's pages.
+    # Child classes override this to add a viewport, locale, etc.
+    context_options: Dict = {"user_agent": DEFAULT_USER_AGENT}
+
+    # When is a freshly loaded page of this site usable? Child classes describe their own grid/table.
+    readiness: ReadinessProfile = ReadinessProfile()
+
+    # We only read text and attributes, so images, fonts, media and trackers are blocked by default
+    blocking: BlockingPolicy = BlockingPolicy()
+
+    # Navigation timeout for the browser path
+    page_timeout_ms: int = 60000
+
+    def __init__(self, headless: bool = True, pool: Optional[BrowserPool] = None):
         self.headless = headless
+        # When no pool is given, we share the process-wide pool instead of launching our own browser
+        self._pool = pool
+        # Which path ("http" or "browser") served the last request
+        self.last_fetch_path: Optional[str] = None
 
-    @abstractmethod
-    async def scrape(self, product_query: str) -> List[ProductDetail]:
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @property
+    def pool(self) -> BrowserPool:
+        return self._pool or get_browser_pool(self.headless)
+
+    @asynccontextmanager
+    async def new_page(self) -> AsyncIterator[Page]:
         """
-        Searches for a product and returns a list of parsed product details.
-        
-        Args:
-            product_query (str): The search term entered by the user.
-            
-        Returns:
-            List[ProductDetail]: A list of validated product objects.
+        Borrows a page from the shared browser pool for the duration of the block,
+        with the site's resource blocking policy installed.
         """
-        pass
+        async with self.pool.page(**self.context_options) as page:
+            blocker = ResourceBlocker(self.blocking)
+            await blocker.attach(page)
+            try:
+                yield page
+            finally:
+                blocker.log_summary(self.name)
+
+    async def wait_until_ready(self, page: Page, timeout_ms: Optional[float] = None) -> bool:
+        """
+        Waits for the site's readiness profile instead of sleeping a fixed amount of time.
+        """
+        return await wait_until_ready(page, self.readiness, timeout_ms)
+
+    @staticmethod
+    def deadline_after(timeout_s: Optional[float]) -> Optional[float]:
+        """Turns a latency budget in seconds into an absolute event-loop deadline."""
+        if timeout_s is None:
+            return None
+        return asyncio.get_running_loop().time() + timeout_s
+
+    @staticmethod
+    def budget_ms(deadline: Optional[float], cap_ms: float) -> float:
+        """How long the next step may take: its own cap, or less if the deadline is closer."""
+        if deadline is None:
+            return cap_ms
+        remaining_ms = (deadline - asyncio.get_running_loop().time()) * 1000
+        # Playwright treats timeout=0 as "no timeout", so never go below 1ms
+        return max(1.0, min(cap_ms, remaining_ms))
+
+    async def fetch_html(self, url: str, deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Fast path: fetches the page over plain HTTP, without starting Chromium.
+        """
+        timeout = self.budget_ms(deadline, HTTP_TIMEOUT_S * 1000) / 1000
+        return await fetch_html(url, timeout=timeout)
+
+    async def load_rendered_html(self, url: str, deadline: Optional[float] = None) -> str:
+        """
+        Slow path: renders the page in the browser pool and returns its HTML once ready.
+        """
+        async with self.new_page() as page:
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.budget_ms(deadline, self.page_timeout_ms))
+            await self.wait_until_ready(page, self.budget_ms(deadline, self.readiness.timeout_ms))
+            return await page.content()
+
+    def record_fetch_path(self, path: str, started_at: float):
+        self.last_fetch_path = path
+        FETCH_PATH_STATS[(self.name, path)] += 1
+        logger.info(f"[{self.name}] Served via {path} in {time.perf_counter() - started_at:.2f}s.")
 
     def clean_price(self, price_str: str) -> float:
         """
@@ -35,4 +124,213 @@ class BaseScraper(ABC):
             clean_str = re.sub(r'[^\d.]', '', price_str.replace(',', ''))
             return float(clean_str) if clean_str else 0.0
         except (ValueError, TypeError):
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+
+class BaseScraper(BrowserScraper):
+    """
+    Abstract Base Class for all e-commerce search scrapers.
+    Child classes describe how to build the search URL and how to parse the results;
+    'scrape' tries a plain HTTP fetch first and only falls back to the browser when that fails.
+    """
+
+    # The display name used in ProductDetail.source_website and in logs
+    site_name: str = ""
+
+    @abstractmethod
+    def build_search_url(self, product_query: str) -> str:
+        """Returns the site's search results URL for the query."""
+        pass
+
+    @abstractmethod
+    def parse_results(self, html: str, product_query: str) -> List[ProductDetail]:
+        """
+        Parses the product grid out of a search results page.
+
+        Args:
+            html (str): The page HTML (static or rendered).
+            product_query (str): The search term, used to drop irrelevant results.
+
+        Returns:
+            List[ProductDetail]: A list of validated product objects.
+        """
+        pass
+
+    def parse_embedded(self, html: str, product_query: str) -> List[ProductDetail]:
+        """
+        Parses results from data embedded in the initial HTML (e.g. `__NEXT_DATA__`).
+        Sites that don't embed their results keep this default.
+        """
+        return []
+
+    async def scrape(self, product_query: str, timeout_s: Optional[float] = None) -> List[ProductDetail]:
+        """
+        Searches for a product and returns a list of parsed product details.
+
+        Args:
+            product_query (str): The search term entered by the user.
+            timeout_s (Optional[float]): Latency budget for the whole search; every
+                network step is capped so the scraper gives up once it is spent.
+
+        Returns:
+            List[ProductDetail]: A list of validated product objects.
+        """
+        logger.info(f"[{self.name}] Searching for '{product_query}' on {self.site_name}...")
+        started_at = time.perf_counter()
+        deadline = self.deadline_after(timeout_s)
+        search_url = self.build_search_url(product_query)
+
+        # 1. Fast path: embedded JSON or static markup from a plain HTTP response
+        results: List[ProductDetail] = []
+        html = await self.fetch_html(search_url, deadline)
+        if html:
+            results = self.parse_embedded(html, product_query) or self.parse_results(html, product_query)
+        path = "http"
+
+        # 2. Slow path: render the page in Chromium
+        if not results:
+            path = "browser"
+            try:
+                html = await self.load_rendered_html(search_url, deadline)
+                results = self.parse_results(html, product_query) or self.parse_embedded(html, product_query)
+            except Exception as e:
+                logger.error(f"[{self.name}] Error: {e}")
+
+        self.record_fetch_path(path, started_at)
+        logger.success(f"[{self.name}] Successfully scraped {len(results)} products!")
+        return results
+
+
+class BaseSpecScraper(BrowserScraper):
+    """
+    Base Class for the spec scrapers, which work on a single product URL
+    instead of a search query.
+
+    Specs barely change, so `get_specs` first looks the URL up in the products
+    table and only scrapes the page when the stored specs are older than `spec_cache_ttl`.
+    """
+
+    # How long scraped specs stay valid in the products table
+    spec_cache_ttl: timedelta = timedelta(days=7)
+
+    def __init__(
+        self,
+        headless: bool = True,
+        pool: Optional[BrowserPool] = None,
+        store: Optional[DatabaseManager] = None,
+        use_cache: bool = True
+    ):
+        super().__init__(headless, pool)
+        # When no store is given, we use the shared DatabaseManager
+        self._store = store
+        self.use_cache = use_cache
+
+    async def get_store(self) -> DatabaseManager:
+        return self._store or await get_db_manager()
+
+    async def get_cached_specs(self, url: str) -> Optional[Dict[str, str]]:
+        """Returns the stored specs for the URL if they are fresh enough, counting hits and misses."""
+        try:
+            specs = await (await self.get_store()).get_fresh_specs(url, self.spec_cache_ttl)
+        except SQLAlchemyError as e:
+            logger.warning(f"[{self.name}] Spec cache unavailable: {e}")
+            specs = None
+
+        SPEC_CACHE_STATS[(self.name, "hit" if specs else "miss")] += 1
+        hits, misses = SPEC_CACHE_STATS[(self.name, "hit")], SPEC_CACHE_STATS[(self.name, "miss")]
+        logger.debug(f"[{self.name}] Spec cache {'HIT' if specs else 'MISS'} (hit rate {hits / (hits + misses):.0%})")
+        return specs
+
+    async def save_specs(self, url: str, specs: Dict[str, str]):
+        try:
+            await (await self.get_store()).save_specs(url, specs)
+        except SQLAlchemyError as e:
+            logger.warning(f"[{self.name}] Could not store specs: {e}")
+
+    @abstractmethod
+    def parse_specs(self, html: str) -> Dict[str, str]:
+        """
+        Extracts the technical specifications from a product page's HTML.
+
+        Returns:
+            Dict[str, str]: Specification name -> value.
+        """
+        pass
+
+    async def get_specs(self, url: str, timeout_s: Optional[float] = None) -> Dict[str, str]:
+        """
+        Fetches a product page (plain HTTP first, browser as fallback) and extracts its specifications.
+        """
+        logger.info(f"[{self.name}] Fetching specs for: {url}")
+        if self.use_cache:
+            cached = await self.get_cached_specs(url)
+            if cached:
+                logger.success(f"[{self.name}] Using {len(cached)} cached spec points.")
+                return cached
+
+        started_at = time.perf_counter()
+        deadline = self.deadline_after(timeout_s)
+        specs: Dict[str, str] = {}
+
+        html = await self.fetch_html(url, deadline)
+        if html:
+            specs = self.parse_specs(html)
+        path = "http"
+
+        if not specs:
+            path = "browser"
+            try:
+                html = await self.load_rendered_html(url, deadline)
+                specs = self.parse_specs(html)
+            except Exception as e:
+                logger.error(f"[{self.name}] Error scraping details: {e}")
+
+        self.record_fetch_path(path, started_at)
+        logger.success(f"[{self.name}] Extracted {len(specs)} spec points.")
+        if specs and self.use_cache:
+            await self.save_specs(url, specs)
+        return specs
+
+    async def get_specs_many(
+        self,
+        urls: List[str],
+        concurrency: int = 3,
+        timeout_s: Optional[float] = None
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Fetches the specs of several product pages of this site in parallel, as tabs
+        of the shared browser pool, with at most `concurrency` pages open at once.
+
+        Args:
+            urls (List[str]): Product page URLs.
+            concurrency (int): Maximum number of pages fetched at the same time.
+            timeout_s (Optional[float]): Latency budget for the whole batch. Pages that
+                are still loading when it runs out are cancelled and left out.
+
+        Returns:
+            Dict[str, Dict[str, str]]: URL -> specifications, for the pages that finished.
+        """
+        deadline = self.deadline_after(timeout_s)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(url: str) -> Dict[str, str]:
+            async with slots:
+                if deadline is None:
+                    return await self.get_specs(url)
+                # Pages queued behind the semaphore only get what's left of the budget
+                return await self.get_specs(url, timeout_s=self.budget_ms(deadline, float("inf")) / 1000)
+
+        tasks = {asyncio.create_task(fetch_one(url)): url for url in dict.fromkeys(urls)}
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks, timeout=timeout_s)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"[{self.name}] {len(pending)} spec page(s) missed the {timeout_s}s budget.")
+
+        return {
+            tasks[task]: task.result()
+            for task in done
+            if not task.exception() and task.result()
+        }
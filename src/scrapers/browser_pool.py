@@ -0,0 +1,195 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from loguru import logger
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+
+
+class PooledBrowser:
+    """
+    A single Chromium instance owned by the pool, plus the bookkeeping
+    needed to decide when it should be recycled.
+    """
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.uses = 0
+        self.active_pages = 0
+        self.retiring = False
+        # Idle contexts waiting to be reused, keyed by their creation options
+        self.idle_contexts: Dict[str, List[BrowserContext]] = {}
+
+    def is_healthy(self) -> bool:
+        return self.browser.is_connected() and not self.retiring
+
+
+class BrowserPool:
+    """
+    Process-wide pool of long-lived Chromium browsers shared by every scraper.
+
+    Browsers are launched once (pre-warmed on start) and handed out as fresh pages
+    on recycled contexts. A browser is relaunched when it crashes (health check)
+    or after serving `max_uses` pages, and at most `max_pages` pages are open
+    across the whole pool at any time.
+    """
+    def __init__(
+        self,
+        headless: bool = True,
+        size: int = 2,
+        max_pages: int = 8,
+        max_uses: int = 50,
+        max_idle_contexts: int = 4,
+    ):
+        self.headless = headless
+        self.size = size
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.max_idle_contexts = max_idle_contexts
+
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._page_slots = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        """Starts Playwright and pre-warms the pool. Safe to call more than once."""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            if len(self._browsers) >= self.size:
+                return
+            while len(self._browsers) < self.size:
+                self._browsers.append(await self._launch())
+        logger.info(f"[BrowserPool] Ready with {len(self._browsers)} warm browser(s).")
+
+    async def close(self):
+        """Closes every browser and stops Playwright."""
+        async with self._lock:
+            for pooled in self._browsers:
+                await self._close_browser(pooled)
+            self._browsers.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+        logger.info("[BrowserPool] Closed.")
+
+    @asynccontextmanager
+    async def page(self, **context_options) -> AsyncIterator[Page]:
+        """
+        Yields a fresh page from the pool and returns its context when done.
+
+        Args:
+            **context_options: Options for `browser.new_context` (user_agent, viewport, locale...).
+                Contexts are only reused between callers that ask for the same options.
+        """
+        async with self._page_slots:
+            pooled, context = await self._checkout(context_options)
+            page = None
+            try:
+                # Created inside the try, so a failed or cancelled new_context is still checked in
+                if context is None:
+                    context = await pooled.browser.new_context(**context_options)
+                page = await context.new_page()
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await self._checkin(pooled, context, context_options)
+
+    async def _launch(self) -> PooledBrowser:
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        return PooledBrowser(browser)
+
+    async def _close_browser(self, pooled: PooledBrowser):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Ignoring error while closing browser: {e}")
+
+    async def _checkout(self, context_options: dict) -> Tuple[PooledBrowser, Optional[BrowserContext]]:
+        """Reserves a browser and an idle context (None if the caller has to create one)."""
+        if self._playwright is None or not self._browsers:
+            await self.start()
+
+        async with self._lock:
+            # 1. Health check: replace crashed browsers before handing anything out
+            for i, pooled in enumerate(self._browsers):
+                if not pooled.browser.is_connected():
+                    logger.warning("[BrowserPool] Browser disconnected, relaunching it.")
+                    self._browsers[i] = await self._launch()
+
+            # 2. Pick the least busy healthy browser
+            candidates = [b for b in self._browsers if b.is_healthy()]
+            if not candidates:
+                self._browsers.append(await self._launch())
+                candidates = [self._browsers[-1]]
+            pooled = min(candidates, key=lambda b: b.active_pages)
+            pooled.uses += 1
+            pooled.active_pages += 1
+            if pooled.uses >= self.max_uses:
+                # Finish the in-flight pages, then recycle (see _checkin)
+                pooled.retiring = True
+
+            # 3. Reuse an idle context with the same options if we have one
+            key = self._context_key(context_options)
+            idle = pooled.idle_contexts.get(key)
+            context = idle.pop() if idle else None
+        return pooled, context
+
+    async def _checkin(self, pooled: PooledBrowser, context: Optional[BrowserContext], context_options: dict):
+        async with self._lock:
+            pooled.active_pages -= 1
+
+            if pooled.retiring:
+                if context is not None:
+                    await self._close_context(context)
+                if pooled.active_pages == 0:
+                    logger.debug(f"[BrowserPool] Recycling browser after {pooled.uses} uses.")
+                    await self._close_browser(pooled)
+                    if pooled in self._browsers:
+                        self._browsers.remove(pooled)
+                        # Don't replace it if we had to grow past `size` while it was retiring
+                        if len(self._browsers) < self.size:
+                            self._browsers.append(await self._launch())
+                return
+
+            if context is None:
+                return
+            idle = pooled.idle_contexts.setdefault(self._context_key(context_options), [])
+            if pooled.browser.is_connected() and len(idle) < self.max_idle_contexts:
+                idle.append(context)
+            else:
+                await self._close_context(context)
+
+    async def _close_context(self, context: BrowserContext):
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _context_key(context_options: dict) -> str:
+        return repr(sorted(context_options.items()))
+
+
+# One pool per (event loop, headless flag): Playwright objects cannot cross event loops.
+_POOLS: Dict[Tuple[int, bool], BrowserPool] = {}
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """Returns the process-wide browser pool for the running event loop."""
+    key = (id(asyncio.get_running_loop()), headless)
+    if key not in _POOLS:
+        _POOLS[key] = BrowserPool(headless=headless)
+    return _POOLS[key]
+
+
+async def close_browser_pools():
+    """Closes every pool created on the running event loop (call on shutdown)."""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [k for k in _POOLS if k[0] == loop_id]:
+        await _POOLS.pop(key).close()
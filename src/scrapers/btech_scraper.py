@@ -1,13 +1,15 @@
-import asyncio
 import re
 from datetime import datetime
 from typing import List
 from urllib.parse import quote
-from playwright.async_api import async_playwright
 from selectolax.parser import HTMLParser
 from loguru import logger
 
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.embedded_data import extract_json_ld, extract_next_data, find_dicts_with_keys, first_value, to_price
+from src.scrapers.readiness import ReadinessProfile
+from src.scrapers.resource_blocker import BTECH_TRACKER_DOMAINS, BlockingPolicy
+from src.schemas.brands import ARABIC_BRAND_MAP
 from src.schemas.product import ProductDetail
 
 class BtechScraper(BaseScraper):
@@ -16,15 +18,28 @@ class BtechScraper(BaseScraper):
     Updated for their new Tailwind CSS / React Frontend.
     """
 
+    site_name = "B.TECH"
+
+    # Products are wrapped in <article> tags once the frontend has hydrated; the page is
+    # read as soon as there is one and their number stopped growing
+    readiness = ReadinessProfile(
+        selector='article',
+        min_count=1,
+        stable_ms=500,
+        scroll_px=1500,
+        timeout_ms=10000
+    )
+
+    blocking = BlockingPolicy().extend(deny_domains=BTECH_TRACKER_DOMAINS)
+
     def _is_relevant(self, query: str, title: str) -> bool:
         query_lower = query.lower()
         title_lower = title.lower()
-        
+
         keywords = query_lower.split()
         matches = [word for word in keywords if word in title_lower]
-        
-        arabic_map = {"lenovo": "لينوفو", "samsung": "سامسونج", "iphone": "ايفون", "apple": "ابل"}
-        for eng, ara in arabic_map.items():
+
+        for eng, ara in ARABIC_BRAND_MAP.items():
             if eng in query_lower and ara in title_lower:
                 matches.append(eng)
 
@@ -34,86 +49,110 @@ class BtechScraper(BaseScraper):
 
         return len(matches) >= 1
 
-    async def scrape(self, product_query: str) -> List[ProductDetail]:
-        results: List[ProductDetail] = []
+    def build_search_url(self, product_query: str) -> str:
         encoded_query = quote(product_query)
         # The new B.TECH search URL
-        search_url = f"https://btech.com/en/s?q={encoded_query}"
-        
-        logger.info(f"[BtechScraper] Searching for '{product_query}' on B.TECH...")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
-            
-            try:
-                await page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
-                await asyncio.sleep(4) # B.TECH's new frontend takes a moment to hydrate
-                
-                await page.mouse.wheel(0, 1500)
-                await asyncio.sleep(2)
-
-                html_content = await page.content()
-                tree = HTMLParser(html_content)
-                
-                # Based on your Inspect, products are wrapped in <article> tags
-                items = tree.css('article')
-                
-                for item in items:
-                    # 1. Title & URL Extraction (from the 'a' tag)
-                    link_node = item.css_first('a')
-                    if not link_node:
-                        continue
-                        
-                    # Extract title from h2 if exists, else fallback to 'title' attribute
-                    h2_node = link_node.css_first('h2')
-                    title = h2_node.text(strip=True) if h2_node else link_node.attributes.get('title', '')
-                    
-                    raw_url = link_node.attributes.get('href', '')
-                    # Fix relative URLs
-                    url = f"https://btech.com{raw_url}" if raw_url.startswith('/') else raw_url
-                    
-                    if not title or not url:
-                        continue
-                    
-                    if not self._is_relevant(product_query, title):
-                        continue
-
-                    # 2. Price Extraction using Regex on the whole article text
-                    article_text = item.text(strip=True)
-                    # Look for "EGP" followed by optional space, then numbers and commas
-                    price_match = re.search(r'EGP\s*([\d,]+)', article_text)
-                    
-                    if price_match:
-                        raw_price = price_match.group(1).replace(',', '')
-                        price_value = float(raw_price)
-                    else:
-                        price_value = 0.0
-
-                    if price_value > 0:
-                        # 4. Data Mapping
-                        product = ProductDetail(
-                            source_website="B.TECH",
-                            product_name=title,
-                            price=price_value,
-                            currency="EGP",
-                            url=url,
-                            specifications={},
-                            is_available=True,
-                            scraped_at=datetime.now().isoformat()
-                        )
-                        results.append(product)
-                    
-                    if len(results) >= 5: 
-                        break
-
-            except Exception as e:
-                logger.error(f"[BtechScraper] Error: {e}")
-            finally:
-                await browser.close()
-                
-        logger.success(f"[BtechScraper] Successfully scraped {len(results)} products!")
-        return results
\ No newline at end of file
+        return f"https://btech.com/en/s?q={encoded_query}"
+
+    def parse_embedded(self, html: str, product_query: str) -> List[ProductDetail]:
+        """
+        Reads search results from the hydration state (`__NEXT_DATA__`) or the
+        JSON-LD item list the server embeds in the initial HTML.
+        """
+        results: List[ProductDetail] = []
+        tree = HTMLParser(html)
+        payloads = [extract_next_data(tree)] + extract_json_ld(tree)
+
+        hits = find_dicts_with_keys(payloads, ("name", "title"), ("final_price", "special_price", "price", "offers"))
+        for hit in hits:
+            title = str(first_value(hit, ("name", "title"))).strip()
+            if not title or not self._is_relevant(product_query, title):
+                continue
+
+            raw_url = first_value(hit, ("url", "url_key", "slug"))
+            if not isinstance(raw_url, str):
+                continue
+            if raw_url.startswith("http"):
+                url = raw_url
+            elif raw_url.startswith("/"):
+                url = f"https://btech.com{raw_url}"
+            else:
+                url = f"https://btech.com/en/p/{raw_url}"
+
+            price_value = to_price(first_value(hit, ("final_price", "special_price", "price", "offers")))
+            if price_value > 0 and not any(str(p.url) == url for p in results):
+                try:
+                    results.append(ProductDetail(
+                        source_website="B.TECH",
+                        product_name=title,
+                        price=price_value,
+                        currency="EGP",
+                        url=url,
+                        specifications={},
+                        is_available=True,
+                        scraped_at=datetime.now().isoformat()
+                    ))
+                except Exception as e:
+                    logger.debug(f"[BtechScraper] Skipping embedded hit: {e}")
+
+            if len(results) >= 5:
+                break
+
+        return results
+
+    def parse_results(self, html: str, product_query: str) -> List[ProductDetail]:
+        results: List[ProductDetail] = []
+        tree = HTMLParser(html)
+
+        # Based on your Inspect, products are wrapped in <article> tags
+        items = tree.css('article')
+
+        for item in items:
+            # 1. Title & URL Extraction (from the 'a' tag)
+            link_node = item.css_first('a')
+            if not link_node:
+                continue
+
+            # Extract title from h2 if exists, else fallback to 'title' attribute
+            h2_node = link_node.css_first('h2')
+            title = h2_node.text(strip=True) if h2_node else link_node.attributes.get('title', '')
+
+            raw_url = link_node.attributes.get('href', '')
+            # Fix relative URLs
+            url = f"https://btech.com{raw_url}" if raw_url.startswith('/') else raw_url
+
+            if not title or not url:
+                continue
+
+            if not self._is_relevant(product_query, title):
+                continue
+
+            # 2. Price Extraction using Regex on the whole article text
+            article_text = item.text(strip=True)
+            # Look for "EGP" followed by optional space, then numbers and commas
+            price_match = re.search(r'EGP\s*([\d,]+)', article_text)
+
+            if price_match:
+                raw_price = price_match.group(1).replace(',', '')
+                price_value = float(raw_price)
+            else:
+                price_value = 0.0
+
+            if price_value > 0:
+                # 4. Data Mapping
+                product = ProductDetail(
+                    source_website="B.TECH",
+                    product_name=title,
+                    price=price_value,
+                    currency="EGP",
+                    url=url,
+                    specifications={},
+                    is_available=True,
+                    scraped_at=datetime.now().isoformat()
+                )
+                results.append(product)
+
+            if len(results) >= 5:
+                break
+
+        return results
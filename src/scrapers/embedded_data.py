@@ -0,0 +1,96 @@
+import json
+from typing import Any, Iterator, List, Optional, Sequence
+from selectolax.parser import HTMLParser
+
+# Guards against pathological payloads (Next.js pages can embed megabytes of JSON)
+MAX_WALK_DEPTH = 25
+
+
+def extract_next_data(tree: HTMLParser) -> Optional[Any]:
+    """Returns the parsed `__NEXT_DATA__` payload of a Next.js page, if any."""
+    node = tree.css_first('script#__NEXT_DATA__')
+    if not node:
+        return None
+    try:
+        return json.loads(node.text())
+    except ValueError:
+        return None
+
+
+def extract_json_ld(tree: HTMLParser) -> List[Any]:
+    """Returns every parseable `application/ld+json` block on the page."""
+    blocks = []
+    for node in tree.css('script[type="application/ld+json"]'):
+        try:
+            blocks.append(json.loads(node.text()))
+        except ValueError:
+            continue
+    return blocks
+
+
+def find_dicts_with_keys(
+    data: Any,
+    name_keys: Sequence[str],
+    price_keys: Sequence[str],
+    depth: int = 0
+) -> Iterator[dict]:
+    """
+    Walks a JSON payload and yields every object that looks like a product,
+    i.e. has at least one of `name_keys` and one of `price_keys`.
+    Product objects are not searched further (their children are variants, images...).
+    """
+    if depth > MAX_WALK_DEPTH:
+        return
+    if isinstance(data, dict):
+        if any(data.get(k) for k in name_keys) and any(data.get(k) is not None for k in price_keys):
+            yield data
+            return
+        for value in data.values():
+            yield from find_dicts_with_keys(value, name_keys, price_keys, depth + 1)
+    elif isinstance(data, list):
+        for item in data:
+            yield from find_dicts_with_keys(item, name_keys, price_keys, depth + 1)
+
+
+def find_values_for_key(data: Any, key: str, depth: int = 0) -> Iterator[Any]:
+    """Yields the value of every `key` found anywhere in a JSON payload."""
+    if depth > MAX_WALK_DEPTH:
+        return
+    if isinstance(data, dict):
+        for k, value in data.items():
+            if k == key:
+                yield value
+            else:
+                yield from find_values_for_key(value, key, depth + 1)
+    elif isinstance(data, list):
+        for item in data:
+            yield from find_values_for_key(item, key, depth + 1)
+
+
+def first_value(data: dict, keys: Sequence[str]) -> Any:
+    """Returns the first non-empty value among `keys`."""
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def to_price(value: Any) -> float:
+    """
+    Converts the many shapes a price takes in embedded JSON to a float:
+    29600, "29,600", "EGP 29,600.00" or {"amount": 29600}.
+    """
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = first_value(value, ("value", "amount", "price", "current"))
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        digits = "".join(ch for ch in value.replace(",", "") if ch.isdigit() or ch == ".")
+        try:
+            return float(digits) if digits else 0.0
+        except ValueError:
+            return 0.0
+    return 0.0
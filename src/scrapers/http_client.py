@@ -0,0 +1,62 @@
+import asyncio
+from typing import Dict, Optional
+import httpx
+from loguru import logger
+
+from src.scrapers.browser_pool import DEFAULT_USER_AGENT
+
+DEFAULT_HEADERS = {
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,ar;q=0.8",
+}
+
+# Default budget for a plain GET; bot walls usually answer fast, so we don't wait long
+HTTP_TIMEOUT_S = 6.0
+
+# One pooled client per event loop, like the browser pool: keep-alive connections
+# to Amazon / Noon / B.TECH are reused across searches.
+_CLIENTS: Dict[int, httpx.AsyncClient] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the process-wide pooled HTTP client for the running event loop."""
+    key = id(asyncio.get_running_loop())
+    client = _CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(HTTP_TIMEOUT_S, connect=3.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+        _CLIENTS[key] = client
+    return client
+
+
+async def fetch_html(url: str, timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Fetches a page with a plain HTTP GET (no JavaScript).
+
+    Returns:
+        Optional[str]: The HTML body, or None if the request failed or was refused
+        (bot walls usually answer with 403/503), so callers can fall back to the browser.
+    """
+    try:
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        response = await get_http_client().get(url, **kwargs)
+    except httpx.HTTPError as e:
+        logger.debug(f"[HttpClient] GET {url} failed: {e!r}")
+        return None
+
+    if response.status_code != 200:
+        logger.debug(f"[HttpClient] GET {url} returned {response.status_code}")
+        return None
+    return response.text
+
+
+async def close_http_clients():
+    """Closes the client created on the running event loop (call on shutdown)."""
+    client = _CLIENTS.pop(id(asyncio.get_running_loop()), None)
+    if client is not None:
+        await client.aclose()
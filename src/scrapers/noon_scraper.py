@@ -1,13 +1,15 @@
-import asyncio
 import re
 from datetime import datetime
 from typing import List
 from urllib.parse import quote
-from playwright.async_api import async_playwright
 from selectolax.parser import HTMLParser
 from loguru import logger
 
-from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.base_scraper import BaseScraper, DEFAULT_USER_AGENT
+from src.scrapers.embedded_data import extract_next_data, find_dicts_with_keys, first_value, to_price
+from src.scrapers.readiness import ReadinessProfile
+from src.scrapers.resource_blocker import NOON_TRACKER_DOMAINS, BlockingPolicy
+from src.schemas.brands import ARABIC_BRAND_MAP
 from src.schemas.product import ProductDetail
 
 class NoonScraper(BaseScraper):
@@ -16,15 +18,33 @@ class NoonScraper(BaseScraper):
     Updated for their Next.js dynamic classes using stable data-qa attributes.
     """
 
+    site_name = "Noon"
+
+    context_options = {
+        "user_agent": DEFAULT_USER_AGENT,
+        "viewport": {"width": 1920, "height": 1080}
+    }
+
+    # The grid is usable once React has rendered the product names (one is enough: niche
+    # queries and tight budgets return only a few) and their number stopped growing
+    readiness = ReadinessProfile(
+        selector='[data-qa="plp-product-box-name"]',
+        min_count=1,
+        stable_ms=500,
+        scroll_px=1500,
+        timeout_ms=10000
+    )
+
+    blocking = BlockingPolicy().extend(deny_domains=NOON_TRACKER_DOMAINS)
+
     def _is_relevant(self, query: str, title: str) -> bool:
         query_lower = query.lower()
         title_lower = title.lower()
-        
+
         keywords = query_lower.split()
         matches = [word for word in keywords if word in title_lower]
-        
-        arabic_map = {"lenovo": "لينوفو", "samsung": "سامسونج", "iphone": "ايفون", "apple": "ابل"}
-        for eng, ara in arabic_map.items():
+
+        for eng, ara in ARABIC_BRAND_MAP.items():
             if eng in query_lower and ara in title_lower:
                 matches.append(eng)
 
@@ -34,91 +54,112 @@ class NoonScraper(BaseScraper):
 
         return len(matches) >= 1
 
-    async def scrape(self, product_query: str) -> List[ProductDetail]:
-        results: List[ProductDetail] = []
+    def build_search_url(self, product_query: str) -> str:
         encoded_query = quote(product_query)
-        search_url = f"https://www.noon.com/egypt-en/search/?q={encoded_query}"
-        
-        logger.info(f"[NoonScraper] Searching for '{product_query}' on Noon...")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-                viewport={"width": 1920, "height": 1080}
-            )
-            page = await context.new_page()
-            
-            try:
-                # We changed this to domcontentloaded to prevent Timeout errors
-                await page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
-                await asyncio.sleep(5) # Wait for React components to hydrate
-                
-                await page.mouse.wheel(0, 1500)
-                await asyncio.sleep(3)
-
-                html_content = await page.content()
-                tree = HTMLParser(html_content)
-                
-                # Target all anchor links that represent products (containing '/p/')
-                items = tree.css('a[href*="/p/"]')
-                
-                for item in items:
-                    raw_url = item.attributes.get('href', '')
-                    if not raw_url:
-                        continue
-                        
-                    url = f"https://www.noon.com{raw_url}" if raw_url.startswith('/') else raw_url
-                    
-                    # 1. Title Extraction based on data-qa attribute (from your Inspect)
-                    title_node = item.css_first('[data-qa="plp-product-box-name"]')
-                    
-                    title = ""
-                    if title_node:
-                        # Grab from title attribute (cleaner) or text
-                        title = title_node.attributes.get('title', '') or title_node.text(strip=True)
-                    else:
-                        # Fallback
-                        img_node = item.css_first('img')
-                        if img_node:
-                            title = img_node.attributes.get('alt', '')
-                            
-                    if not title or not self._is_relevant(product_query, title):
-                        continue
-
-                    # 2. Price Extraction based on data-qa attribute (from your Inspect)
-                    price_node = item.css_first('[data-qa="plp-product-box-price"]')
-                    price_value = 0.0
-                    
-                    if price_node:
-                        price_text = price_node.text(strip=True)
-                        # Extract the number (e.g., from "EGP 29,600")
-                        price_match = re.search(r'([\d,]+(?:\.\d+)?)', price_text)
-                        if price_match:
-                            raw_price = price_match.group(1).replace(',', '')
-                            price_value = float(raw_price)
-
-                    # 3. Validation and Mapping (Avoid duplicate DOM entries)
-                    if price_value > 0 and not any(p.url == url for p in results):
-                        product = ProductDetail(
-                            source_website="Noon",
-                            product_name=title,
-                            price=price_value,
-                            currency="EGP",
-                            url=url,
-                            specifications={},
-                            is_available=True,
-                            scraped_at=datetime.now().isoformat()
-                        )
-                        results.append(product)
-                    
-                    if len(results) >= 5: 
-                        break
-
-            except Exception as e:
-                logger.error(f"[NoonScraper] Error: {e}")
-            finally:
-                await browser.close()
-                
-        logger.success(f"[NoonScraper] Successfully scraped {len(results)} products!")
-        return results
\ No newline at end of file
+        return f"https://www.noon.com/egypt-en/search/?q={encoded_query}"
+
+    def parse_embedded(self, html: str, product_query: str) -> List[ProductDetail]:
+        """
+        Reads the search hits Next.js embeds in `__NEXT_DATA__`, so the fast path
+        doesn't need React to render the grid.
+        """
+        results: List[ProductDetail] = []
+        data = extract_next_data(HTMLParser(html))
+        if data is None:
+            return results
+
+        for hit in find_dicts_with_keys(data, ("name",), ("sale_price", "price")):
+            title = str(hit.get("name", "")).strip()
+            if not title or not self._is_relevant(product_query, title):
+                continue
+
+            # Noon product URLs look like /egypt-en/<url slug>/<sku>/p/
+            slug, sku = hit.get("url"), hit.get("sku")
+            if isinstance(slug, str) and slug.startswith("http"):
+                url = slug
+            elif slug and sku:
+                url = f"https://www.noon.com/egypt-en/{str(slug).strip('/')}/{sku}/p/"
+            else:
+                continue
+
+            price_value = to_price(first_value(hit, ("sale_price", "price")))
+            if price_value > 0 and not any(str(p.url) == url for p in results):
+                try:
+                    results.append(ProductDetail(
+                        source_website="Noon",
+                        product_name=title,
+                        price=price_value,
+                        currency="EGP",
+                        url=url,
+                        specifications={},
+                        is_available=True,
+                        scraped_at=datetime.now().isoformat()
+                    ))
+                except Exception as e:
+                    logger.debug(f"[NoonScraper] Skipping embedded hit: {e}")
+
+            if len(results) >= 5:
+                break
+
+        return results
+
+    def parse_results(self, html: str, product_query: str) -> List[ProductDetail]:
+        results: List[ProductDetail] = []
+        tree = HTMLParser(html)
+
+        # Target all anchor links that represent products (containing '/p/')
+        items = tree.css('a[href*="/p/"]')
+
+        for item in items:
+            raw_url = item.attributes.get('href', '')
+            if not raw_url:
+                continue
+
+            url = f"https://www.noon.com{raw_url}" if raw_url.startswith('/') else raw_url
+
+            # 1. Title Extraction based on data-qa attribute (from your Inspect)
+            title_node = item.css_first('[data-qa="plp-product-box-name"]')
+
+            title = ""
+            if title_node:
+                # Grab from title attribute (cleaner) or text
+                title = title_node.attributes.get('title', '') or title_node.text(strip=True)
+            else:
+                # Fallback
+                img_node = item.css_first('img')
+                if img_node:
+                    title = img_node.attributes.get('alt', '')
+
+            if not title or not self._is_relevant(product_query, title):
+                continue
+
+            # 2. Price Extraction based on data-qa attribute (from your Inspect)
+            price_node = item.css_first('[data-qa="plp-product-box-price"]')
+            price_value = 0.0
+
+            if price_node:
+                price_text = price_node.text(strip=True)
+                # Extract the number (e.g., from "EGP 29,600")
+                price_match = re.search(r'([\d,]+(?:\.\d+)?)', price_text)
+                if price_match:
+                    raw_price = price_match.group(1).replace(',', '')
+                    price_value = float(raw_price)
+
+            # 3. Validation and Mapping (Avoid duplicate DOM entries)
+            if price_value > 0 and not any(str(p.url) == url for p in results):
+                product = ProductDetail(
+                    source_website="Noon",
+                    product_name=title,
+                    price=price_value,
+                    currency="EGP",
+                    url=url,
+                    specifications={},
+                    is_available=True,
+                    scraped_at=datetime.now().isoformat()
+                )
+                results.append(product)
+
+            if len(results) >= 5:
+                break
+
+        return results
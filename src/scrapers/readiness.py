@@ -0,0 +1,92 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from loguru import logger
+
+# Counts the elements matching a selector inside the page
+_COUNT_AT_LEAST_JS = "([selector, minCount]) => document.querySelectorAll(selector).length >= minCount"
+_COUNT_JS = "(selector) => document.querySelectorAll(selector).length"
+
+# How often the element count is read while waiting for it to settle
+STABLE_POLL_MS = 100
+
+
+@dataclass(frozen=True)
+class ReadinessProfile:
+    """
+    Describes when a site's page is "usable" so scrapers can read it as soon as
+    it is ready instead of sleeping for a fixed amount of time.
+    """
+    # CSS selector that must be present (None = don't wait for any element)
+    selector: Optional[str] = None
+    # How many elements must match `selector` before we consider the page ready
+    min_count: int = 1
+    # Then wait until that count hasn't changed for this long (0 = don't), so a grid that
+    # renders in batches is read whole, while a page with only a few results isn't held up
+    stable_ms: int = 0
+    # Also wait for the network to go quiet (no requests for 500ms)
+    network_idle: bool = False
+    # Scroll this many pixels first to trigger lazy-loaded sections
+    scroll_px: int = 0
+    # Hard cap for the whole wait, whatever happens
+    timeout_ms: int = 10000
+
+
+async def wait_until_ready(page: Page, profile: ReadinessProfile, timeout_ms: Optional[int] = None) -> bool:
+    """
+    Waits until the page satisfies the readiness profile or the hard cap is reached.
+
+    Args:
+        page (Page): The page that has just been navigated.
+        profile (ReadinessProfile): The site's readiness conditions.
+        timeout_ms (Optional[int]): Overrides the profile's hard cap.
+
+    Returns:
+        bool: True if every condition was met, False if we gave up at the cap.
+    """
+    loop = asyncio.get_running_loop()
+    cap_ms = timeout_ms if timeout_ms is not None else profile.timeout_ms
+    deadline = loop.time() + cap_ms / 1000
+
+    def remaining_ms() -> float:
+        # Playwright treats timeout=0 as "no timeout", so never go below 1ms
+        return max(1.0, (deadline - loop.time()) * 1000)
+
+    try:
+        if profile.scroll_px:
+            await page.mouse.wheel(0, profile.scroll_px)
+
+        if profile.selector:
+            await page.wait_for_function(
+                _COUNT_AT_LEAST_JS,
+                arg=[profile.selector, profile.min_count],
+                timeout=remaining_ms()
+            )
+            if profile.stable_ms:
+                await _wait_for_stable_count(page, profile.selector, profile.stable_ms, deadline)
+
+        if profile.network_idle:
+            await page.wait_for_load_state("networkidle", timeout=remaining_ms())
+
+    except PlaywrightTimeoutError:
+        logger.debug(f"[Readiness] Gave up waiting for '{profile.selector}' after {cap_ms}ms.")
+        return False
+
+    waited_ms = cap_ms - remaining_ms()
+    logger.debug(f"[Readiness] Page ready in {waited_ms:.0f}ms ('{profile.selector}').")
+    return True
+
+
+async def _wait_for_stable_count(page: Page, selector: str, stable_ms: int, deadline: float):
+    """Polls the number of elements matching `selector` until it stops changing (or the deadline)."""
+    loop = asyncio.get_running_loop()
+    count = await page.evaluate(_COUNT_JS, selector)
+    stable_since = loop.time()
+    while (loop.time() - stable_since) * 1000 < stable_ms:
+        if loop.time() + STABLE_POLL_MS / 1000 > deadline:
+            raise PlaywrightTimeoutError(f"'{selector}' count still changing ({count})")
+        await asyncio.sleep(STABLE_POLL_MS / 1000)
+        latest = await page.evaluate(_COUNT_JS, selector)
+        if latest != count:
+            count, stable_since = latest, loop.time()
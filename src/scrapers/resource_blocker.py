@@ -0,0 +1,124 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import Page, Route
+from loguru import logger
+
+# Analytics / ads / session-replay hosts we never need to read product data
+TRACKER_DOMAINS: Tuple[str, ...] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "analytics.tiktok.com",
+    "sc-static.net",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "criteo.net",
+    "bat.bing.com",
+    "newrelic.com",
+    "nr-data.net",
+)
+
+# Each site's own trackers, shared by its search and spec scrapers. Entries are hostname
+# suffixes (see is_denied_host), so they must be full domains.
+AMAZON_TRACKER_DOMAINS: Tuple[str, ...] = (
+    "amazon-adsystem.com",
+    "fls-eu.amazon.eg",
+    "fls-eu.amazon.com",
+    "unagi.amazon.eg",
+    "unagi.amazon.com",
+)
+NOON_TRACKER_DOMAINS: Tuple[str, ...] = ("sentry.io", "branch.io", "appsflyer.com")
+BTECH_TRACKER_DOMAINS: Tuple[str, ...] = ("useinsider.com", "smartlook.com", "onesignal.com")
+
+# Blocked requests are never downloaded, so their size is unknown: the "saved" figure in
+# the logs is an estimate from typical transfer sizes on the sites we scrape.
+ESTIMATED_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 35_000,
+    "script": 60_000,
+    "stylesheet": 25_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+def is_denied_host(host: str, deny_domains: Tuple[str, ...]) -> bool:
+    """Matches on the hostname suffix: "doubleclick.net" denies "ad.doubleclick.net", not "doubleclick.example.com"."""
+    host = host.lower().rstrip(".")
+    return any(host == domain or host.endswith("." + domain) for domain in deny_domains)
+
+
+@dataclass(frozen=True)
+class BlockingPolicy:
+    """
+    Which requests a site's pages are allowed to make.
+
+    A request is blocked when its resource type is in `blocked_types` or its host is one
+    of `deny_domains` (or a subdomain of one), unless its URL contains one of `allow_patterns`.
+    """
+    blocked_types: FrozenSet[str] = frozenset({"image", "font", "media"})
+    deny_domains: Tuple[str, ...] = TRACKER_DOMAINS
+    # Substrings of URLs that must always go through (exceptions to the rules above)
+    allow_patterns: Tuple[str, ...] = ()
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if any(pattern in url for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return is_denied_host(urlparse(url).hostname or "", self.deny_domains)
+
+    def extend(self, deny_domains: Tuple[str, ...] = (), allow_patterns: Tuple[str, ...] = ()) -> "BlockingPolicy":
+        """Returns a copy of this policy with site-specific deny/allow entries added."""
+        return BlockingPolicy(
+            blocked_types=self.blocked_types,
+            deny_domains=self.deny_domains + deny_domains,
+            allow_patterns=self.allow_patterns + allow_patterns
+        )
+
+
+class ResourceBlocker:
+    """
+    Playwright route interceptor that aborts the requests a BlockingPolicy rejects
+    and keeps a tally of what was blocked for the current page.
+    """
+    def __init__(self, policy: BlockingPolicy):
+        self.policy = policy
+        self.blocked_by_type: Counter = Counter()
+        self.allowed = 0
+        self.estimated_bytes_saved = 0
+
+    async def attach(self, page: Page):
+        await page.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        if self.policy.should_block(request.url, request.resource_type):
+            self.blocked_by_type[request.resource_type] += 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort()
+        else:
+            self.allowed += 1
+            await route.continue_()
+
+    @property
+    def blocked(self) -> int:
+        return sum(self.blocked_by_type.values())
+
+    def log_summary(self, owner: str):
+        if not self.blocked:
+            return
+        breakdown = ", ".join(f"{kind}={count}" for kind, count in self.blocked_by_type.most_common())
+        logger.info(
+            f"[{owner}] Blocked {self.blocked}/{self.blocked + self.allowed} requests "
+            f"({breakdown}; ~{self.estimated_bytes_saved / 1024:.0f} KB saved, estimated from typical sizes)"
+        )
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Dict, List, Optional, Type
+from urllib.parse import urlparse
+from loguru import logger
+
+from src.schemas.product import ProductDetail
+from src.scrapers.base_scraper import BaseSpecScraper
+from src.scrapers.amazon_spec_scraper import AmazonSpecScraper
+from src.scrapers.btech_spec_scraper import BtechSpecScraper
+from src.scrapers.noon_spec_scraper import NoonSpecScraper
+
+# Which spec scraper understands which product pages (matched against the URL host)
+SPEC_SCRAPERS: Dict[str, Type[BaseSpecScraper]] = {
+    "amazon.eg": AmazonSpecScraper,
+    "noon.com": NoonSpecScraper,
+    "btech.com": BtechSpecScraper,
+}
+
+
+def spec_scraper_for(url: str) -> Optional[Type[BaseSpecScraper]]:
+    """Returns the spec scraper class for a product URL, or None for unknown sites."""
+    host = urlparse(url).netloc.lower()
+    for domain, scraper_cls in SPEC_SCRAPERS.items():
+        if host == domain or host.endswith("." + domain):
+            return scraper_cls
+    return None
+
+
+async def enrich_specs(
+    products: List[ProductDetail],
+    concurrency: int = 3,
+    timeout_s: Optional[float] = None
+) -> List[ProductDetail]:
+    """
+    Fills in `specifications` for the given products, fetching every site's pages
+    in parallel (see `BaseSpecScraper.get_specs_many`) within one latency budget.
+
+    Products that already have specs, belong to an unknown site or miss the
+    budget are returned unchanged. Nothing is written here: `get_specs` stores every
+    page it fetched on its catalog row (`save_specs`), where the next lookup reads it.
+    The products must already be in the catalog (see save_to_catalog in src/agent/tools.py).
+    """
+    # 1. Group the product URLs by the site that can parse them
+    batches: Dict[Type[BaseSpecScraper], List[str]] = {}
+    for product in products:
+        scraper_cls = spec_scraper_for(str(product.url))
+        if scraper_cls and not product.specifications:
+            batches.setdefault(scraper_cls, []).append(str(product.url))
+    if not batches:
+        return products
+
+    # 2. One batch per site, all sites at the same time
+    logger.info(f"[SpecEnricher] Enriching {sum(len(urls) for urls in batches.values())} product(s)...")
+    batch_results = await asyncio.gather(
+        *(scraper_cls(headless=True).get_specs_many(urls, concurrency, timeout_s) for scraper_cls, urls in batches.items()),
+        return_exceptions=True
+    )
+    specs_by_url: Dict[str, Dict[str, str]] = {}
+    for result in batch_results:
+        if isinstance(result, Exception):
+            logger.error(f"[SpecEnricher] Batch failed: {result}")
+            continue
+        specs_by_url.update(result)
+
+    # 3. Attach the specs to the products
+    for product in products:
+        specs = specs_by_url.get(str(product.url))
+        if specs:
+            product.specifications = specs
+    logger.success(f"[SpecEnricher] Got specs for {len(specs_by_url)} product(s).")
+    return products
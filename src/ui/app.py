@@ -5,20 +5,42 @@ import os
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(PROJECT_ROOT)
 
+import asyncio
 import chainlit as cl
 import uuid
 from langchain_core.messages import HumanMessage
 from loguru import logger
 
 # Import our compiled LangGraph agent
-from src.agent.graph import build_graph
+from src.agent.context import SUMMARY_TAG
+from src.agent.graph import get_graph
+from src.scrapers.browser_pool import get_browser_pool
+
+# The pool warm-up started by the first chat; kept here so it isn't garbage-collected mid-run
+_pool_warmup = None
+
+def warm_up_browser_pool():
+    """Starts the shared browsers once in the background (again only if the last attempt failed)."""
+    global _pool_warmup
+    if _pool_warmup is not None and not (_pool_warmup.done() and (_pool_warmup.cancelled() or _pool_warmup.exception())):
+        return
+    _pool_warmup = asyncio.create_task(get_browser_pool(headless=True).start())
+    
+    def done(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            logger.error(f"Browser pool warm-up failed: {task.exception()}")
+    _pool_warmup.add_done_callback(done)
 
 @cl.on_chat_start
 async def on_chat_start():
     """Initializes the agent session."""
     logger.info("New chat session started in UI.")
     
-    agent_app = build_graph()
+    # Warm up the shared browsers in the background so the first search doesn't pay for the launch
+    warm_up_browser_pool()
+    
+    # Every session shares the compiled graph; its conversation is isolated by thread_id
+    agent_app = get_graph()
     cl.user_session.set("agent_app", agent_app)
     
     thread_id = str(uuid.uuid4())
@@ -29,6 +51,19 @@ async def on_chat_start():
         author="Assistant"
     ).send()
 
+@cl.on_chat_end
+async def on_chat_end():
+    """Frees the session's conversation from memory; it stays in checkpoints.db."""
+    agent_app = cl.user_session.get("agent_app")
+    config = cl.user_session.get("config")
+    if not agent_app or not config:
+        return
+    
+    checkpointer = agent_app.checkpointer
+    checkpointer.evict(config["configurable"]["thread_id"])
+    report = checkpointer.memory_report()
+    logger.info(f"Chat session ended. {len(report)} active thread(s) in memory, {sum(report.values()) / 1024:.1f} KB total.")
+
 @cl.on_message
 async def on_message(message: cl.Message):
     """Handles incoming messages with Token-by-Token streaming and Tool state handling."""
@@ -48,8 +83,8 @@ async def on_message(message: cl.Message):
         async for event in agent_app.astream_events(state_input, config=config, version="v2"):
             kind = event["event"]
             
-            # 1. STREAMING TOKEN BY TOKEN ✨
-            if kind == "on_chat_model_stream":
+            # 1. STREAMING TOKEN BY TOKEN ✨ (the running summary of older turns is internal)
+            if kind == "on_chat_model_stream" and SUMMARY_TAG not in event.get("tags", []):
                 chunk = event["data"]["chunk"]
                 # Append each token dynamically to the UI
                 if chunk.content and isinstance(chunk.content, str):
@@ -65,7 +100,11 @@ async def on_message(message: cl.Message):
                     )
                     await tool_msg.send()
                     
-            # 3. TOOL FINISHED ✅
+            # 3. PLATFORM RESULTS STREAMED 📦 (one event per site, as soon as its scraper finishes)
+            elif kind == "on_custom_event" and event["name"] == "platform_results":
+                await cl.Message(content=event["data"]["report"], author="System").send()
+                    
+            # 4. TOOL FINISHED ✅
             elif kind == "on_tool_end":
                 if tool_msg:
                     await tool_msg.remove()
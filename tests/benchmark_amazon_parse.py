@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+import re
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selectolax.parser import HTMLParser
+from src.scrapers.amazon_scraper import AmazonScraper
+
+QUERY = "Lenovo IdeaPad"
+
+
+def build_search_page(n_results: int = 48) -> str:
+    """Builds an Amazon-like search results page with the markup the scraper reads."""
+    cards = []
+    for i in range(n_results):
+        cards.append(f"""
+        <div data-component-type="s-search-result" data-asin="B0TEST{i:04d}">
+          <div class="s-image"><img src="https://m.media-amazon.com/images/I/{i}.jpg" alt=""></div>
+          <h2 class="a-size-mini"><a class="a-link-normal" href="/Lenovo-IdeaPad-Slim-{i}/dp/B0TEST{i:04d}/ref=sr_1_{i}?keywords=lenovo">
+            <span>Lenovo IdeaPad Slim 3 Laptop, Intel Core i5, 16GB RAM, 512GB SSD, model {i}</span></a></h2>
+          <div class="a-row"><span class="a-price"><span class="a-price-whole">{20000 + i * 137:,}<span class="a-price-decimal">.</span></span>
+          <span class="a-price-fraction">00</span></span></div>
+          <div class="a-row"><span class="a-size-base">{i % 5}.{i % 10} out of 5 stars</span></div>
+        </div>""")
+    return f"<html><body><div class='s-main-slot'>{''.join(cards)}</div></body></html>"
+
+
+class RoundTrips:
+    def __init__(self, latency_s: float):
+        self.count = 0
+        self.latency_s = latency_s
+
+    async def hit(self):
+        self.count += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+
+
+class SimulatedHandle:
+    """Stands in for a Playwright ElementHandle: every call is one CDP round trip."""
+    def __init__(self, node, trips: RoundTrips):
+        self._node = node
+        self._trips = trips
+
+    async def query_selector(self, selector):
+        await self._trips.hit()
+        node = self._node.css_first(selector)
+        return SimulatedHandle(node, self._trips) if node else None
+
+    async def query_selector_all(self, selector):
+        await self._trips.hit()
+        return [SimulatedHandle(node, self._trips) for node in self._node.css(selector)]
+
+    async def inner_text(self):
+        await self._trips.hit()
+        return self._node.text()
+
+    async def get_attribute(self, name):
+        await self._trips.hit()
+        return self._node.attributes.get(name)
+
+    async def content(self):
+        await self._trips.hit()
+        return self._node.html
+
+
+class CountingHandle:
+    """Wraps a real Playwright Page/ElementHandle and counts the calls that cross CDP."""
+    def __init__(self, handle, trips: RoundTrips):
+        self._handle = handle
+        self._trips = trips
+
+    async def query_selector(self, selector):
+        self._trips.count += 1
+        handle = await self._handle.query_selector(selector)
+        return CountingHandle(handle, self._trips) if handle else None
+
+    async def query_selector_all(self, selector):
+        self._trips.count += 1
+        return [CountingHandle(h, self._trips) for h in await self._handle.query_selector_all(selector)]
+
+    async def inner_text(self):
+        self._trips.count += 1
+        return await self._handle.inner_text()
+
+    async def get_attribute(self, name):
+        self._trips.count += 1
+        return await self._handle.get_attribute(name)
+
+    async def content(self):
+        self._trips.count += 1
+        return await self._handle.content()
+
+
+async def legacy_parse(page) -> int:
+    """The previous AmazonScraper loop: query_selector + inner_text/get_attribute per element."""
+    products = 0
+    items = await page.query_selector_all("div[data-component-type='s-search-result']")
+    for item in items[:8]:
+        title_el = await item.query_selector("h2")
+        if not title_el:
+            continue
+        await title_el.inner_text()
+        price_el = await item.query_selector(".a-price-whole")
+        if not price_el:
+            continue
+        price_text = await price_el.inner_text()
+        if not re.sub(r'[^\d.]', '', price_text):
+            continue
+        link_el = await item.query_selector("h2 a") or await item.query_selector("a.a-link-normal")
+        if not link_el:
+            continue
+        await link_el.get_attribute("href")
+        products += 1
+    return products
+
+
+async def snapshot_parse(page) -> int:
+    """The current AmazonScraper path: one page.content() and a selectolax pass."""
+    html = await page.content()
+    return len(AmazonScraper().parse_results(html, QUERY))
+
+
+async def run(page_factory, runs: int):
+    for label, parse in (("legacy per-element", legacy_parse), ("single snapshot", snapshot_parse)):
+        timings, trips_per_run, products = [], 0, 0
+        for _ in range(runs):
+            page, trips = await page_factory()
+            started = time.perf_counter()
+            products = await parse(page)
+            timings.append((time.perf_counter() - started) * 1000)
+            trips_per_run = trips.count
+        print(f"{label:<20} products={products:<3} round_trips={trips_per_run:<4} "
+              f"median={statistics.median(timings):8.2f} ms  p95={sorted(timings)[int(runs * 0.95) - 1]:8.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark AmazonScraper parsing strategies.")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=1.0,
+                        help="Simulated CDP round-trip latency (offline mode).")
+    parser.add_argument("--browser", action="store_true",
+                        help="Measure against a real Chromium page instead of the simulation.")
+    args = parser.parse_args()
+
+    html = build_search_page()
+
+    if not args.browser:
+        print(f"Offline simulation, {args.latency_ms} ms per CDP round trip, {args.runs} runs")
+        tree = HTMLParser(html)
+
+        async def simulated_page():
+            trips = RoundTrips(args.latency_ms / 1000)
+            return SimulatedHandle(tree.body, trips), trips
+
+        await run(simulated_page, args.runs)
+        return
+
+    from playwright.async_api import async_playwright
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+        print(f"Real Chromium page, {args.runs} runs")
+
+        async def real_page():
+            trips = RoundTrips(0)
+            return CountingHandle(page, trips), trips
+
+        await run(real_page, args.runs)
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
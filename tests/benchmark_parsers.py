@@ -0,0 +1,70 @@
+import argparse
+import statistics
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.btech_scraper import BtechScraper
+from src.scrapers.noon_scraper import NoonScraper
+from src.scrapers.amazon_spec_scraper import AmazonSpecScraper
+from src.scrapers.btech_spec_scraper import BtechSpecScraper
+from src.scrapers.noon_spec_scraper import NoonSpecScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+QUERY = "Lenovo IdeaPad"
+
+# (label, fixture, parse function) - every parser runs on saved HTML only, so this is CI-safe
+CASES = [
+    ("AmazonScraper", "amazon_search.html", lambda html: AmazonScraper().parse_results(html, QUERY)),
+    ("NoonScraper", "noon_search.html", lambda html: NoonScraper().parse_results(html, QUERY)),
+    ("NoonScraper (embedded)", "noon_search_static.html", lambda html: NoonScraper().parse_embedded(html, QUERY)),
+    ("BtechScraper", "btech_search.html", lambda html: BtechScraper().parse_results(html, QUERY)),
+    ("AmazonSpecScraper", "amazon_spec.html", lambda html: AmazonSpecScraper().parse_specs(html)),
+    ("NoonSpecScraper", "noon_spec.html", lambda html: NoonSpecScraper().parse_specs(html)),
+    ("BtechSpecScraper", "btech_spec.html", lambda html: BtechSpecScraper().parse_specs(html)),
+]
+
+
+def benchmark(parse, html: str, runs: int):
+    # Warm-up (imports, selector compilation)
+    items = len(parse(html))
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        parse(html)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return items, timings, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline parse benchmark for every scraper.")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'parser':<24}{'page KB':>8}{'items':>7}{'median ms':>11}{'p95 ms':>9}{'items/sec':>11}{'peak KB':>9}")
+    for label, fixture, parse in CASES:
+        with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+            html = f.read()
+
+        items, timings, peak = benchmark(parse, html, args.runs)
+        median = statistics.median(timings)
+        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+        items_per_sec = items / median if median else 0.0
+
+        print(f"{label:<24}{len(html) / 1024:>8.0f}{items:>7}{median * 1000:>11.3f}{p95 * 1000:>9.3f}"
+              f"{items_per_sec:>11.0f}{peak / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.search_cache import TokenSetIndex, normalize_query
+from src.schemas.brands import ARABIC_BRAND_MAP
+
+# Replays a synthetic query log shaped like what the LLM sends to search_ecommerce_sites
+# (same product, different casing / spacing / word order / Arabic brand / filler words)
+# and reports the cache hit rate for each way of building the cache key.
+PRODUCTS = [
+    "Lenovo IdeaPad", "Lenovo IdeaPad Slim 3", "Lenovo LOQ", "Lenovo ThinkPad E14", "Lenovo Legion 5",
+    "HP Victus", "HP Pavilion 15", "HP Envy", "Dell Inspiron 15", "Dell Vostro",
+    "Samsung Galaxy A55", "Samsung Galaxy S24", "Samsung Galaxy A15", "Samsung Galaxy Tab S9",
+    "iPhone 15", "iPhone 15 Pro", "iPhone 14", "Apple MacBook Air", "Apple AirPods Pro",
+    "Asus Vivobook 15", "Asus TUF Gaming", "Acer Aspire 7", "Xiaomi Redmi Note 13", "Xiaomi Poco X6",
+]
+FILLERS = ["laptop", "mobile", "for", "the"]
+
+
+def variant(product: str, rng: random.Random) -> str:
+    words = product.split()
+    # Arabic brand spelling
+    if rng.random() < 0.2:
+        words = [ARABIC_BRAND_MAP.get(word.lower(), word) for word in words]
+    # Word order
+    if rng.random() < 0.25:
+        rng.shuffle(words)
+    # A filler word the LLM sometimes adds
+    if rng.random() < 0.25:
+        words.append(rng.choice(FILLERS))
+    # Casing and spacing
+    casing = rng.choice([str.lower, str.title, lambda w: w, str.upper])
+    return (" " * rng.choice([1, 1, 2])).join(casing(word) for word in words)
+
+
+def build_log(size: int, rng: random.Random):
+    # A few products get most of the traffic
+    weights = [1 / (rank + 1) for rank in range(len(PRODUCTS))]
+    products = rng.choices(PRODUCTS, weights=weights, k=size)
+    return [(product, variant(product, rng)) for product in products]
+
+
+def replay(log, make_key, index: TokenSetIndex = None):
+    """Returns (hits, wrong hits) for an unbounded cache keyed by `make_key`."""
+    cached = {}
+    hits = wrong = 0
+    for product, query in log:
+        key = make_key(query)
+        if index is not None:
+            key = index.find(key) or key
+        if key in cached:
+            hits += 1
+            wrong += cached[key] != product
+        else:
+            cached[key] = product
+            if index is not None:
+                index.add(key)
+    return hits, wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search cache hit rate on a replayed query log.")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    log = build_log(args.queries, random.Random(args.seed))
+    strategies = [
+        ("LOWER(query)", lambda q: q.lower(), None),
+        ("canonical", normalize_query, None),
+        ("canonical + token set", normalize_query, TokenSetIndex()),
+    ]
+
+    # Every miss is a live scrape of all three sites
+    print(f"{'cache key':<24}{'hit rate':>10}{'live scrapes':>14}{'wrong hits':>12}")
+    for label, make_key, index in strategies:
+        hits, wrong = replay(log, make_key, index)
+        print(f"{label:<24}{hits / len(log):>10.1%}{len(log) - hits:>14}{wrong:>12}")
+
+
+if __name__ == "__main__":
+    main()
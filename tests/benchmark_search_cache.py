@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager
+from src.database.search_cache import SearchCache, normalize_query
+
+# Lookup latency of the search cache with a large table: the old unindexed
+# `search_cache` table (LOWER(query) full scan) vs the indexed `search_results`
+# behind the async storage layer.
+BRANDS = ["lenovo", "hp", "dell", "asus", "acer", "samsung", "iphone", "xiaomi", "oppo", "realme"]
+PRODUCTS = ["laptop", "ideapad", "vivobook", "galaxy a55", "15 pro", "redmi note", "monitor", "tablet", "airpods", "watch"]
+PLATFORMS = ["Amazon", "B.TECH", "Noon"]
+
+
+def random_query(rng: random.Random) -> str:
+    return f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {rng.randint(1, 2000)}"
+
+
+def fill_legacy(path: str, rows: int, rng: random.Random, queries):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE search_cache (query TEXT, platform TEXT, product_name TEXT, price REAL, url TEXT, timestamp DATETIME)")
+    now = datetime.now()
+    conn.executemany(
+        "INSERT INTO search_cache VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (queries[i % len(queries)], PLATFORMS[i % 3], f"Product {i}", 1000.0 + i, f"https://example.com/p/{i}",
+             (now - timedelta(minutes=rng.randint(0, 3 * 24 * 60))).strftime('%Y-%m-%d %H:%M:%S'))
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+async def fill_indexed(path: str, rows: int, rng: random.Random, queries) -> SearchCache:
+    db = DatabaseManager(f"sqlite+aiosqlite:///{path}")
+    await db.init_db()
+    # Bulk load straight through sqlite3, it's only test data
+    conn = sqlite3.connect(path)
+    now = time.time()
+    conn.executemany(
+        "INSERT INTO search_results (query_key, platform, product_name, price, url, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (normalize_query(queries[i % len(queries)]), PLATFORMS[i % 3], f"Product {i}", 1000.0 + i,
+             f"https://example.com/p/{i}", now - rng.randint(0, 3 * 24 * 3600))
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+    # Same 24h cutoff as the legacy lookup
+    return SearchCache(db, stale_ttl=timedelta(hours=24), max_rows=rows)
+
+
+def legacy_lookup(path: str, query: str):
+    # Same statement as the old get_cached_results
+    conn = sqlite3.connect(path)
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+    rows = conn.execute(
+        "SELECT platform, product_name, price, url FROM search_cache WHERE LOWER(query) = ? AND timestamp > ?",
+        (query.lower(), yesterday)
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def measure(lookup, queries, lookups: int):
+    timings = []
+    for query in queries[:lookups]:
+        started = time.perf_counter()
+        lookup(query)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def measure_async(lookup, queries, lookups: int):
+    timings = []
+    for query in queries[:lookups]:
+        started = time.perf_counter()
+        await lookup(query)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(label: str, timings):
+    p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{label:<12}{statistics.median(timings) * 1000:>12.3f}{p95 * 1000:>10.3f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Search cache lookup latency at scale.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    queries = list({random_query(rng) for _ in range(args.rows // 15)})
+    probes = rng.sample(queries, min(args.lookups, len(queries)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        indexed_path = os.path.join(tmp, "indexed.db")
+
+        started = time.perf_counter()
+        fill_legacy(legacy_path, args.rows, rng, queries)
+        cache = await fill_indexed(indexed_path, args.rows, rng, queries)
+        print(f"Built 2 x {args.rows:,} rows in {time.perf_counter() - started:.1f}s\n")
+
+        print(f"{'table':<12}{'median ms':>12}{'p95 ms':>10}")
+        report("legacy", measure(lambda q: legacy_lookup(legacy_path, q), probes, args.lookups))
+        await cache.get(probes[0])  # warm up the connection pool
+        report("indexed", await measure_async(cache.get, probes, args.lookups))
+
+        started = time.perf_counter()
+        deleted = await cache.compact()
+        print(f"\ncompact(): deleted {deleted:,} expired rows in {time.perf_counter() - started:.2f}s")
+        await (await cache.get_db()).engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
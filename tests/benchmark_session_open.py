@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The graph module creates the Groq client on import; nothing here calls the LLM
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from src.agent import graph
+from src.agent.checkpointer import BoundedSqliteSaver
+
+# Session-open latency when many users connect at once: what on_chat_start did before
+# (compile a new graph per session) vs the shared graph from get_graph(). Each session
+# also reads its (empty) state once, like the first message would.
+
+
+async def open_session(get_app, connected_at: float) -> float:
+    # Measured from the moment every user connected, so time spent waiting on other sessions counts
+    agent_app = get_app()
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    await agent_app.aget_state(config)
+    return time.perf_counter() - connected_at
+
+
+async def burst(get_app, sessions: int):
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(open_session(get_app, started) for _ in range(sessions)))
+    return timings, time.perf_counter() - started
+
+
+def report(label: str, timings, total: float):
+    p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{label:<18}{statistics.median(timings) * 1000:>12.2f}{p95 * 1000:>10.2f}{max(timings) * 1000:>10.2f}{total * 1000:>11.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Chainlit session-open latency under simultaneous connects.")
+    parser.add_argument("--sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Every graph built here checkpoints to a throwaway database, not the app's checkpoints.db
+        path = os.path.join(tmp, "checkpoints.db")
+        graph.BoundedSqliteSaver = lambda: BoundedSqliteSaver(path)
+
+        print(f"{args.sessions} simultaneous session opens\n")
+        print(f"{'graph':<18}{'median ms':>12}{'p95 ms':>10}{'max ms':>10}{'burst ms':>11}")
+        report("build per session", *await burst(graph.build_graph, args.sessions))
+        # The first call compiles the shared graph, like the first session after a restart
+        report("shared get_graph", *await burst(graph.get_graph, args.sessions))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The graph module creates the Groq client on import; only --live calls the LLM
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.agent import tools
+from src.agent.context import count_tokens
+from tests.test_parsers_offline import QUERY, load_fixture
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.btech_scraper import BtechScraper
+from src.scrapers.noon_scraper import NoonScraper
+from src.scrapers.amazon_spec_scraper import AmazonSpecScraper
+from src.scrapers.btech_spec_scraper import BtechSpecScraper
+from src.scrapers.noon_spec_scraper import NoonSpecScraper
+
+# Size of the search_ecommerce_sites report the LLM re-reads on every later turn: the old
+# markdown report (headings, bold names, full URLs, a "Price:" label per product) vs the
+# compact one, built from the saved search and product pages in tests/fixtures.
+# With --live, also times a real follow-up turn on Groq with each report in the history.
+FOLLOW_UP = "Which of these has the most RAM for the price?"
+
+
+def fixture_results() -> dict:
+    results = {
+        "Amazon": AmazonScraper().parse_results(load_fixture("amazon_search.html"), QUERY),
+        "B.TECH": BtechScraper().parse_results(load_fixture("btech_search.html"), QUERY),
+        "Noon": NoonScraper().parse_results(load_fixture("noon_search.html"), QUERY),
+    }
+    # What spec enrichment adds to the top results
+    specs = {
+        "Amazon": AmazonSpecScraper().parse_specs(load_fixture("amazon_spec.html")),
+        "B.TECH": BtechSpecScraper().parse_specs(load_fixture("btech_spec.html")),
+        "Noon": NoonSpecScraper().parse_specs(load_fixture("noon_spec.html")),
+    }
+    for platform, data in results.items():
+        for prod in data[:tools.ENRICH_TOP_N]:
+            prod.specifications = specs[platform]
+    return results
+
+
+def legacy_report(results: dict, max_price: float = None) -> str:
+    # Same layout as the old search_ecommerce_sites output (format_results is still what the UI streams)
+    report = f"Live Search Results for '{QUERY}':\n\n"
+    for platform in tools.SCRAPERS:
+        report += tools.format_results(platform, results[platform], max_price)
+    return report
+
+
+def compact_report(results: dict, max_price: float = None) -> str:
+    report = f"Live results for '{QUERY}' ({tools.COMPACT_COLUMNS}):\n"
+    for platform in tools.SCRAPERS:
+        report += tools.format_compact(platform, results[platform], max_price)
+    return report
+
+
+def history(report: str):
+    # The turn that ran the search, followed by the user's next question
+    return [
+        HumanMessage(content=f"I want a {QUERY} laptop"),
+        AIMessage(content="", tool_calls=[{"name": "search_ecommerce_sites", "args": {"query": QUERY}, "id": "call_1"}]),
+        ToolMessage(content=report, tool_call_id="call_1"),
+        AIMessage(content="Here are the options I found..."),
+        HumanMessage(content=FOLLOW_UP),
+    ]
+
+
+async def time_turns(messages, runs: int):
+    from src.agent.graph import SYSTEM_PROMPT, llm_with_tools
+
+    prompt = [SystemMessage(content=SYSTEM_PROMPT)] + messages
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await llm_with_tools.ainvoke(prompt)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Token size and turn latency of the search tool report.")
+    parser.add_argument("--turns", type=int, default=5, help="Later turns that re-read the report")
+    parser.add_argument("--live", action="store_true", help="Time real follow-up turns on Groq (needs GROQ_API_KEY)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = fixture_results()
+    reports = {"legacy markdown": legacy_report(results), "compact": compact_report(results)}
+
+    print(f"search_ecommerce_sites report for '{QUERY}' (3 platforms, top 3 each, with specs)\n")
+    print(f"{'format':<18}{'chars':>8}{'tokens':>8}{f'x{args.turns} turns':>12}")
+    tokens = {}
+    for label, report in reports.items():
+        tokens[label] = count_tokens([ToolMessage(content=report, tool_call_id="call_1")])
+        print(f"{label:<18}{len(report):>8}{tokens[label]:>8}{tokens[label] * args.turns:>12}")
+    saved = 1 - tokens["compact"] / tokens["legacy markdown"]
+    print(f"\nThe compact report is {saved:.0%} smaller ({tokens['legacy markdown'] - tokens['compact']} tokens per turn).")
+
+    if not args.live or os.environ["GROQ_API_KEY"] == "benchmark":
+        print("Turn latency not measured: run with --live and a real GROQ_API_KEY.")
+        return
+
+    print(f"\nFollow-up turn latency on Groq ({args.runs} runs each)")
+    print(f"{'format':<18}{'median ms':>12}{'max ms':>10}")
+    for label, report in reports.items():
+        timings = await time_turns(history(report), args.runs)
+        print(f"{label:<18}{statistics.median(timings) * 1000:>12.0f}{max(timings) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
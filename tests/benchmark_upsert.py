@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.future import select
+
+from src.database.db_manager import DatabaseManager
+from src.database.models import ProductModel
+from src.schemas.product import ProductDetail
+
+# Write throughput of the product catalog: the old per-item upsert (SELECT, then
+# UPDATE or INSERT, one commit per product) vs `upsert_products`
+# (one `INSERT ... ON CONFLICT(url) DO UPDATE` batch in one transaction).
+SITES = ["Amazon", "Noon", "B.TECH"]
+
+
+def make_products(count: int, price_offset: float = 0.0):
+    return [
+        ProductDetail(
+            source_website=SITES[i % 3],
+            product_name=f"Product {i}",
+            price=1000.0 + i + price_offset,
+            url=f"https://example.com/p/{i}",
+            specifications={"RAM": "16 GB"} if i % 2 else {},
+        )
+        for i in range(count)
+    ]
+
+
+async def legacy_upsert(db: DatabaseManager, product_data: ProductDetail):
+    # The per-item path upsert_product used before the bulk upsert existed
+    async with db.SessionLocal() as session:
+        stmt = select(ProductModel).where(ProductModel.url == str(product_data.url))
+        result = await session.execute(stmt)
+        existing_product = result.scalars().first()
+        parsed_date = datetime.fromisoformat(product_data.scraped_at)
+
+        if existing_product:
+            existing_product.price = product_data.price
+            existing_product.is_available = product_data.is_available
+            if product_data.specifications and product_data.specifications != existing_product.specifications:
+                existing_product.specifications = product_data.specifications
+                existing_product.specs_scraped_at = parsed_date
+            existing_product.scraped_at = parsed_date
+        else:
+            session.add(ProductModel(
+                url=str(product_data.url),
+                source_website=product_data.source_website,
+                product_name=product_data.product_name,
+                price=product_data.price,
+                currency=product_data.currency,
+                specifications=product_data.specifications,
+                specs_scraped_at=parsed_date if product_data.specifications else None,
+                is_available=product_data.is_available,
+                scraped_at=parsed_date,
+            ))
+        await session.commit()
+
+
+async def run_legacy(db: DatabaseManager, products) -> float:
+    started = time.perf_counter()
+    for product in products:
+        await legacy_upsert(db, product)
+    return time.perf_counter() - started
+
+
+async def run_bulk(db: DatabaseManager, products) -> float:
+    started = time.perf_counter()
+    counts = await db.upsert_products(products)
+    elapsed = time.perf_counter() - started
+    assert counts["inserted"] + counts["updated"] == len(products), counts
+    return elapsed
+
+
+def report(label: str, count: int, legacy_s: float, bulk_s: float):
+    print(f"{label:<10}{legacy_s:>12.2f}{bulk_s:>10.2f}{count / legacy_s:>14,.0f}{count / bulk_s:>12,.0f}{legacy_s / bulk_s:>10.1f}x")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-item vs bulk product upserts.")
+    parser.add_argument("--products", type=int, default=10_000)
+    args = parser.parse_args()
+
+    inserts = make_products(args.products)
+    updates = make_products(args.products, price_offset=-50.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tmp, 'legacy.db')}")
+        bulk_db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bulk.db')}")
+        await legacy_db.init_db()
+        await bulk_db.init_db()
+
+        print(f"{args.products:,} products\n")
+        print(f"{'pass':<10}{'per-item s':>12}{'bulk s':>10}{'per-item /s':>14}{'bulk /s':>12}{'speedup':>11}")
+        # First pass inserts every product, the second one updates all of them
+        report("insert", args.products, await run_legacy(legacy_db, inserts), await run_bulk(bulk_db, inserts))
+        report("update", args.products, await run_legacy(legacy_db, updates), await run_bulk(bulk_db, updates))
+
+        await legacy_db.engine.dispose()
+        await bulk_db.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import asyncio
+import sys
+import os
+from loguru import logger
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.btech_scraper import BtechScraper
+from src.scrapers.noon_scraper import NoonScraper
+from src.scrapers.amazon_spec_scraper import AmazonSpecScraper
+from src.scrapers.btech_spec_scraper import BtechSpecScraper
+from src.scrapers.noon_spec_scraper import NoonSpecScraper
+from src.scrapers.browser_pool import close_browser_pools
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Records the offline fixture corpus from the live sites. The committed fixtures are
+# synthetic (written by hand after each parser's selectors and guessed embedded-JSON
+# fields); run this where Chromium can reach the sites to replace them with real pages,
+# and again when their markup changes. Review the diff, then re-run test_parsers_offline.py.
+SEARCH_QUERY = "Lenovo IdeaPad"
+SPEC_URLS = {
+    "amazon_spec.html": (AmazonSpecScraper, "https://www.amazon.eg/dp/B0D3J7ZX58"),
+    "noon_spec.html": (NoonSpecScraper, "https://www.noon.com/egypt-en/ideapad-5-laptop-with-15-6-inch-display-core-i5-1235u-processor-16gb-ram-512gb-ssd-2gb-nvidia-geforce-mx550-graphics-card-windows-11-home-english-arabic-storm-grey/N70048443V/p/?o=b3aa78e1e41a164c"),
+    "btech_spec.html": (BtechSpecScraper, "https://btech.com/en/p/lenovo-ideapad-slim-3-15iru8-laptop-intel-i3-1315u-256gb-ssd-8gb-ram-15-6-dos-grey?offering_id=84d57b15-d6b3-4ebe-b09d-a0642bf4c4da"),
+}
+
+
+def save(name: str, html: str):
+    with open(os.path.join(FIXTURES_DIR, name), "w", encoding="utf-8") as f:
+        f.write(html)
+    logger.success(f"Saved {name} ({len(html) / 1024:.0f} KB)")
+
+
+async def main():
+    for name, scraper in (("amazon_search.html", AmazonScraper()), ("noon_search.html", NoonScraper()), ("btech_search.html", BtechScraper())):
+        url = scraper.build_search_url(SEARCH_QUERY)
+        save(name, await scraper.load_rendered_html(url))
+
+    # What the HTTP fast path sees for Noon (no JavaScript)
+    static_html = await NoonScraper().fetch_html(NoonScraper().build_search_url(SEARCH_QUERY))
+    if static_html:
+        save("noon_search_static.html", static_html)
+
+    for name, (scraper_cls, url) in SPEC_URLS.items():
+        save(name, await scraper_cls().load_rendered_html(url))
+
+    await close_browser_pools()
+
+if __name__ == "__main__":
+    asyncio.run(main())
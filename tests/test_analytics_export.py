@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics.exporter import ParquetExporter, flatten_specs
+from src.analytics.queries import CatalogAnalytics
+from src.database.db_manager import DatabaseManager
+from src.schemas.product import ProductDetail
+
+AMAZON_SPECS = {"Brand": "Lenovo", "Processor Type": "Intel Core i5", "RAM Size": "16 GB", "Hard Drive Size": "512 GB"}
+NOON_SPECS = {"Brand": "LENOVO", "Processor Type": "Intel Core i5", "RAM": "16GB", "Internal Memory": "0.5 TB"}
+
+
+def product(idx: int, site: str, price: float, days_ago: float = 0, specs: dict = None) -> ProductDetail:
+    scraped_at = datetime.now() - timedelta(days=days_ago)
+    return ProductDetail(
+        source_website=site, product_name=f"Lenovo IdeaPad {idx}", price=price,
+        url=f"https://www.example.com/p/{idx}", specifications=specs or {}, scraped_at=scraped_at.isoformat()
+    )
+
+
+async def upsert(db_path: str, products):
+    db = DatabaseManager(f"sqlite+aiosqlite:///{db_path}")
+    await db.init_db()
+    await db.upsert_products(products)
+    await db.engine.dispose()
+
+
+def test_flatten_specs():
+    flat = flatten_specs(NOON_SPECS)
+    assert flat["brand"] == "LENOVO"
+    assert flat["ram_gb"] == 16.0
+    assert flat["storage_gb"] == 512.0
+    assert flat["gpu"] is None
+
+
+def test_incremental_export_and_cross_site_comparison():
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "catalog.db")
+    exporter = ParquetExporter(db_path, os.path.join(tmp, "export"))
+
+    asyncio.run(upsert(db_path, [product(1, "Amazon", 20000, 1, AMAZON_SPECS), product(2, "Noon", 19000, 1, NOON_SPECS)]))
+    assert exporter.export() == {"products": 2, "price_snapshots": 2}
+    # Nothing new since the watermark
+    assert exporter.export() == {"products": 0, "price_snapshots": 0}
+
+    # A price drop exports one new product version and one snapshot
+    asyncio.run(upsert(db_path, [product(2, "Noon", 18000, 0, NOON_SPECS)]))
+    assert exporter.export() == {"products": 1, "price_snapshots": 1}
+
+    with CatalogAnalytics(exporter.out_dir) as analytics:
+        summary = analytics.site_price_summary("%ideapad%").set_index("source_website")
+        comparison = analytics.compare_configurations()
+
+    assert summary.loc["Noon", "min_price"] == 18000
+    assert summary["products"].sum() == 2
+    assert len(comparison) == 1
+    assert comparison.loc[0, "cheapest_site"] == "Noon"
+    assert comparison.loc[0, "spread"] == 2000
+
+
+def test_rows_written_late_with_an_older_scraped_at_are_exported():
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "catalog.db")
+    exporter = ParquetExporter(db_path, os.path.join(tmp, "export"))
+
+    asyncio.run(upsert(db_path, [product(1, "Amazon", 20000, 0, AMAZON_SPECS)]))
+    assert exporter.export() == {"products": 1, "price_snapshots": 1}
+
+    # A slower scrape that started yesterday commits after the export
+    asyncio.run(upsert(db_path, [product(2, "Noon", 19000, 1, NOON_SPECS)]))
+    assert exporter.export() == {"products": 1, "price_snapshots": 1}
+
+    with CatalogAnalytics(exporter.out_dir) as analytics:
+        summary = analytics.site_price_summary("%ideapad%").set_index("source_website")
+    assert summary.loc["Noon", "min_price"] == 19000
+
+
+def test_the_latest_write_of_a_product_wins():
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "catalog.db")
+    exporter = ParquetExporter(db_path, os.path.join(tmp, "export"))
+    noon = product(2, "Noon", 19000, 0)
+
+    async def save_specs():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{db_path}")
+        await db.save_specs(str(noon.url), NOON_SPECS)
+        await db.engine.dispose()
+
+    asyncio.run(upsert(db_path, [noon]))
+    assert exporter.export()["products"] == 1
+    # Spec enrichment rewrites the row with the same scraped_at
+    asyncio.run(save_specs())
+    assert exporter.export()["products"] == 1
+    with CatalogAnalytics(exporter.out_dir) as analytics:
+        assert analytics.con.execute("SELECT ram_gb FROM products").fetchall() == [(16.0,)]
+
+    # A late commit of an older scrape still replaces the exported copy
+    asyncio.run(upsert(db_path, [product(2, "Noon", 18500, 1, NOON_SPECS)]))
+    assert exporter.export()["products"] == 1
+    with CatalogAnalytics(exporter.out_dir) as analytics:
+        assert analytics.con.execute("SELECT price FROM products").fetchall() == [(18500.0,)]
@@ -0,0 +1,72 @@
+import asyncio
+import sys
+import os
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.browser_pool import BrowserPool, PooledBrowser
+
+
+class FailingBrowser:
+    """Stands in for a Chromium whose new_context fails (or hangs until the deadline)."""
+    def __init__(self, hang: bool = False):
+        self.hang = hang
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def new_context(self, **options):
+        if self.hang:
+            await asyncio.sleep(10)
+        raise RuntimeError("Target closed")
+
+    async def close(self):
+        self.closed = True
+
+
+def pool_with(browser: FailingBrowser, max_uses: int = 50) -> BrowserPool:
+    pool = BrowserPool(size=1, max_uses=max_uses)
+    # Already started: no Playwright needed
+    pool._playwright = object()
+    pool._browsers = [PooledBrowser(browser)]
+
+    async def launch():
+        return PooledBrowser(FailingBrowser())
+    pool._launch = launch
+    return pool
+
+
+async def open_page(pool: BrowserPool):
+    async with pool.page():
+        pass
+
+
+def test_failed_context_is_checked_back_in():
+    async def main():
+        pool = pool_with(FailingBrowser())
+        try:
+            await open_page(pool)
+        except RuntimeError:
+            pass
+        return pool._browsers[0]
+
+    pooled = asyncio.run(main())
+    assert pooled.active_pages == 0
+    assert pooled.idle_contexts == {}
+
+
+def test_cancelled_checkout_still_recycles_a_retiring_browser():
+    async def main():
+        browser = FailingBrowser(hang=True)
+        pool = pool_with(browser, max_uses=1)
+        try:
+            await asyncio.wait_for(open_page(pool), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        return browser, pool._browsers
+
+    browser, browsers = asyncio.run(main())
+    assert browser.closed
+    assert len(browsers) == 1 and browsers[0].browser is not browser
@@ -0,0 +1,53 @@
+import asyncio
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.catalog_search import match_expression, search_catalog
+from src.database.db_manager import DatabaseManager
+from src.schemas.product import ProductDetail
+
+
+def product(idx: int, name: str, price: float, days_ago: float = 0, specs: dict = None) -> ProductDetail:
+    scraped_at = datetime.now() - timedelta(days=days_ago)
+    return ProductDetail(
+        source_website="Noon", product_name=name, price=price, url=f"https://www.example.com/p/{idx}",
+        specifications=specs or {}, scraped_at=scraped_at.isoformat()
+    )
+
+
+def test_match_expression():
+    assert match_expression("لينوفو IdeaPad 3") == '("lenovo"* OR "لينوفو"*) AND ("ideapad"*) AND ("3")'
+    assert match_expression('hp "victus') == '("hp"*) AND ("victus"*)'
+    assert match_expression("the") is None
+
+
+def test_index_follows_catalog_writes():
+    async def main():
+        tmp = tempfile.mkdtemp()
+        db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tmp, 'catalog.db')}")
+        await db.init_db()
+        await db.upsert_products([
+            product(1, "Lenovo IdeaPad Slim 3 Laptop", 20000),
+            product(2, "لابتوب لينوفو ايديا باد", 18000, days_ago=3),
+            product(3, "HP Victus 15", 25000),
+        ])
+        lenovo = await search_catalog("lenovo", db=db)
+        budget = await search_catalog("lenovo", max_price=19000, db=db)
+        recent = await search_catalog("lenovo", max_age=timedelta(days=1), db=db)
+
+        # Specs saved later are searchable too
+        await db.save_specs("https://www.example.com/p/3", {"Processor": "Intel Core i7"})
+        by_spec = await search_catalog("i7", db=db)
+        await db.engine.dispose()
+        return lenovo, budget, recent, by_spec
+
+    lenovo, budget, recent, by_spec = asyncio.run(main())
+    assert {match.url[-1] for match in lenovo} == {"1", "2"}
+    assert [match.url[-1] for match in budget] == ["2"]
+    assert [match.url[-1] for match in recent] == ["1"]
+    assert [match.url[-1] for match in by_spec] == ["3"]
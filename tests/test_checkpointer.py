@@ -0,0 +1,76 @@
+import asyncio
+import sys
+import os
+import tempfile
+from typing import Annotated, TypedDict
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph
+from langgraph.graph.message import add_messages
+
+from src.agent.checkpointer import BoundedSqliteSaver
+
+
+class EchoState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def build_echo_graph(saver: BoundedSqliteSaver):
+    async def echo(state: EchoState):
+        return {"messages": [AIMessage(content=f"echo: {state['messages'][-1].content}")]}
+
+    workflow = StateGraph(EchoState)
+    workflow.add_node("echo", echo)
+    workflow.set_entry_point("echo")
+    return workflow.compile(checkpointer=saver)
+
+
+async def chat(app, thread_id: str, text: str):
+    config = {"configurable": {"thread_id": thread_id}}
+    return await app.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+
+
+def test_conversations_survive_a_restart_and_history_is_capped():
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.db")
+
+    async def main():
+        saver = BoundedSqliteSaver(path, max_checkpoints_per_thread=3)
+        app = build_echo_graph(saver)
+        for turn in range(5):
+            await chat(app, "user-1", f"hello {turn}")
+        stored = saver.conn.execute("SELECT count(*) FROM checkpoints WHERE thread_id = 'user-1'").fetchone()[0]
+        saver.close()
+
+        # A new process: the conversation continues where it stopped
+        restarted = build_echo_graph(BoundedSqliteSaver(path))
+        result = await chat(restarted, "user-1", "hello again")
+        return stored, result
+
+    stored, result = asyncio.run(main())
+    assert stored == 3
+    assert len(result["messages"]) == 12
+    assert result["messages"][-1].content == "echo: hello again"
+
+
+def test_only_active_threads_stay_in_memory():
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.db")
+
+    async def main():
+        saver = BoundedSqliteSaver(path, max_active_threads=2)
+        app = build_echo_graph(saver)
+        for thread_id in ("a", "b", "c"):
+            await chat(app, thread_id, "hi")
+        report = saver.memory_report()
+
+        # An evicted thread is read back from disk on its next turn
+        result = await chat(app, "a", "back")
+        return report, saver.memory_report(), result
+
+    report, report_after, result = asyncio.run(main())
+    assert set(report) == {"b", "c"}
+    assert all(size > 0 for size in report.values())
+    assert set(report_after) == {"c", "a"}
+    assert len(result["messages"]) == 4
@@ -0,0 +1,70 @@
+import asyncio
+import sys
+import os
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.agent.context import SUMMARY_TAG, build_prompt, count_tokens, fit_recent_turns, summarize
+
+
+def conversation():
+    # Three turns; the second one calls a tool with a long report
+    return [
+        HumanMessage(content="I need a laptop"),
+        AIMessage(content="What is your budget?"),
+        HumanMessage(content="30000 EGP, Lenovo"),
+        AIMessage(content="", tool_calls=[{"name": "search_ecommerce_sites", "args": {"query": "Lenovo laptop"}, "id": "call_1"}]),
+        ToolMessage(content="Live Search Results " * 400, tool_call_id="call_1"),
+        AIMessage(content="Here are the best options..."),
+        HumanMessage(content="Which one has 16GB RAM?"),
+    ]
+
+
+def test_everything_is_kept_when_it_fits():
+    assert fit_recent_turns(conversation(), 0, budget=100_000) == 0
+
+
+def test_turns_are_dropped_whole_and_oldest_first():
+    messages = conversation()
+    # Room for the last turn only: the tool call and its report go together
+    assert fit_recent_turns(messages, 0, budget=count_tokens(messages[6:])) == 6
+    # Room for the last two turns: the first turn is dropped
+    assert fit_recent_turns(messages, 0, budget=count_tokens(messages[2:])) == 2
+
+
+def test_latest_turn_is_kept_even_over_budget():
+    messages = conversation()[:5]
+    assert fit_recent_turns(messages, 0, budget=10) == 2
+
+
+def test_already_summarized_messages_are_skipped():
+    assert fit_recent_turns(conversation(), 2, budget=100_000) == 2
+
+
+def test_prompt_starts_with_system_prompt_and_summary():
+    prompt = build_prompt("You are a shopping assistant.", "User wants a Lenovo under 30k.", conversation()[6:])
+    assert [type(message) for message in prompt] == [SystemMessage, SystemMessage, HumanMessage]
+    assert build_prompt("You are a shopping assistant.", None, [])[0].content == "You are a shopping assistant."
+
+
+def test_summary_tokens_are_tagged_apart_from_the_reply():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="SUMMARY"), AIMessage(content="REPLY")]))
+
+    async def turn(messages):
+        await summarize(llm, None, messages)
+        return await llm.ainvoke(messages)
+
+    async def streamed_reply():
+        reply = ""
+        # The same filter as the Chainlit UI (src/ui/app.py)
+        async for event in RunnableLambda(turn).astream_events(conversation(), version="v2"):
+            if event["event"] == "on_chat_model_stream" and SUMMARY_TAG not in event.get("tags", []):
+                reply += event["data"]["chunk"].content
+        return reply
+
+    assert asyncio.run(streamed_reply()) == "REPLY"
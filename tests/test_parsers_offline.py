@@ -0,0 +1,80 @@
+import sys
+import os
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.btech_scraper import BtechScraper
+from src.scrapers.noon_scraper import NoonScraper
+from src.scrapers.amazon_spec_scraper import AmazonSpecScraper
+from src.scrapers.btech_spec_scraper import BtechSpecScraper
+from src.scrapers.noon_spec_scraper import NoonSpecScraper
+
+# Hand-written pages modelled on each site's markup (not recordings, see record_fixtures.py):
+# these tests never touch the network or a browser
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+QUERY = "Lenovo IdeaPad"
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_amazon_search_parse():
+    results = AmazonScraper().parse_results(load_fixture("amazon_search.html"), QUERY)
+
+    assert len(results) == 8
+    assert all(p.source_website == "Amazon" and p.price > 0 for p in results)
+    assert all(str(p.url).startswith("https://www.amazon.eg/") for p in results)
+
+
+def test_noon_search_parse_skips_accessories():
+    results = NoonScraper().parse_results(load_fixture("noon_search.html"), QUERY)
+
+    assert len(results) == 5
+    assert all("lenovo" in p.product_name.lower() for p in results)
+    assert not any("case" in p.product_name.lower() or "mouse" in p.product_name.lower() for p in results)
+    assert len({str(p.url) for p in results}) == len(results)
+
+
+def test_noon_search_embedded_json():
+    # The plain HTTP response has no rendered grid, only the __NEXT_DATA__ payload
+    html = load_fixture("noon_search_static.html")
+    scraper = NoonScraper()
+
+    assert scraper.parse_results(html, QUERY) == []
+    results = scraper.parse_embedded(html, QUERY)
+    assert len(results) == 5
+    assert all(str(p.url).startswith("https://www.noon.com/egypt-en/") and str(p.url).endswith("/p/") for p in results)
+
+
+def test_btech_search_parse():
+    results = BtechScraper().parse_results(load_fixture("btech_search.html"), QUERY)
+
+    assert len(results) == 5
+    assert all(p.source_website == "B.TECH" and p.price > 1000 for p in results)
+    assert all(str(p.url).startswith("https://btech.com/en/p/") for p in results)
+
+
+def test_amazon_spec_parse():
+    specs = AmazonSpecScraper().parse_specs(load_fixture("amazon_spec.html"))
+
+    assert specs["RAM Memory Installed Size"] == "8 GB"
+    assert specs["CPU Model"] == "Core i5"
+    assert "About" in specs
+
+
+def test_noon_spec_parse():
+    specs = NoonSpecScraper().parse_specs(load_fixture("noon_spec.html"))
+
+    assert specs["Processor Type"] == "Core i5"
+    assert specs["RAM Size"] == "8 GB"
+
+
+def test_btech_spec_parse():
+    specs = BtechSpecScraper().parse_specs(load_fixture("btech_spec.html"))
+
+    assert specs["Processor"] == "Intel Core i3-1315U"
+    assert specs["Storage"] == "256 GB SSD"
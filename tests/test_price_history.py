@@ -0,0 +1,52 @@
+import asyncio
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager
+from src.schemas.product import ProductDetail
+
+URL = "https://www.example.com/p/1"
+
+
+def snapshot(price: float, days_ago: float) -> ProductDetail:
+    scraped_at = datetime.now() - timedelta(days=days_ago)
+    return ProductDetail(source_website="Amazon", product_name="Lenovo IdeaPad", price=price, url=URL, scraped_at=scraped_at.isoformat())
+
+
+async def record(prices):
+    tmp = tempfile.mkdtemp()
+    db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tmp, 'history.db')}")
+    await db.init_db()
+    for days_ago, price in prices:
+        await db.upsert_products([snapshot(price, days_ago)])
+    return db
+
+
+def test_identical_consecutive_prices_are_stored_once():
+    async def main():
+        db = await record([(40, 100), (35, 100), (20, 80), (10, 80), (5, 100)])
+        history = await db.get_price_history(URL, timedelta(days=60))
+        await db.engine.dispose()
+        return history
+
+    assert [price for _, price in asyncio.run(main())] == [100, 80, 100]
+
+
+def test_stats_cover_the_price_in_effect_at_the_window_start():
+    async def main():
+        # 100 for the first 10 days of the window, 80 for 15 days, 120 for the last 5
+        db = await record([(40, 100), (20, 80), (5, 120)])
+        stats = await db.get_price_stats(URL, timedelta(days=30))
+        missing = await db.get_price_stats("https://www.example.com/p/2", timedelta(days=30))
+        await db.engine.dispose()
+        return stats, missing
+
+    stats, missing = asyncio.run(main())
+    assert missing is None
+    assert (stats["current"], stats["min"], stats["max"], stats["changes"]) == (120, 80, 120, 2)
+    assert abs(stats["avg"] - (100 * 10 + 80 * 15 + 120 * 5) / 30) < 0.01
@@ -0,0 +1,71 @@
+import asyncio
+import sys
+import os
+import time
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from selectolax.parser import HTMLParser
+
+from src.scrapers.btech_scraper import BtechScraper
+from src.scrapers.noon_scraper import NoonScraper
+from src.scrapers.readiness import wait_until_ready
+from tests.test_parsers_offline import load_fixture
+
+
+class FixturePage:
+    """
+    Just enough of a Playwright page to run a readiness profile against saved HTML,
+    without a browser. `batches` are rendered one after the other, `interval_s` apart.
+    """
+    def __init__(self, *batches: str, interval_s: float = 0.0):
+        self.batches = batches
+        self.interval_s = interval_s
+        self.loaded_at = time.monotonic()
+        self.mouse = self
+
+    async def wheel(self, dx: int, dy: int):
+        pass
+
+    def count(self, selector: str) -> int:
+        rendered = int((time.monotonic() - self.loaded_at) / self.interval_s) + 1 if self.interval_s else len(self.batches)
+        html = self.batches[min(rendered, len(self.batches)) - 1]
+        return len(HTMLParser(html).css(selector))
+
+    async def evaluate(self, js: str, selector: str) -> int:
+        return self.count(selector)
+
+    async def wait_for_function(self, js: str, arg, timeout: float):
+        selector, min_count = arg
+        give_up_at = time.monotonic() + timeout / 1000
+        while self.count(selector) < min_count:
+            if time.monotonic() > give_up_at:
+                raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+            await asyncio.sleep(0.01)
+
+
+def timed_wait(page: FixturePage, profile):
+    started = time.monotonic()
+    ready = asyncio.run(wait_until_ready(page, profile))
+    return ready, time.monotonic() - started
+
+
+def test_page_with_few_results_is_ready_without_waiting_for_the_cap():
+    # Two product cards: a niche model or a tight budget
+    page = FixturePage(load_fixture("noon_search_few.html"))
+    ready, waited = timed_wait(page, NoonScraper.readiness)
+    assert ready
+    assert waited < 2 < NoonScraper.readiness.timeout_ms / 1000
+
+
+def test_grid_rendered_in_batches_is_read_once_it_stops_growing():
+    html = load_fixture("btech_search.html")
+    articles = html.split("<article")
+    first_batch = "<article".join(articles[:3]) + "</body></html>"
+    page = FixturePage(first_batch, html, interval_s=0.3)
+    ready, waited = timed_wait(page, BtechScraper.readiness)
+    assert ready
+    assert waited >= 0.3
+    assert page.count("article") == len(articles) - 1
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The graph module creates the Groq client on import; nothing here calls the LLM
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.agent import tools
+from src.agent.graph import results_node
+from src.agent.tools import refine_results, search_artifact
+from src.database.db_manager import DatabaseManager
+from src.database.search_cache import SearchCache
+from src.schemas.product import ProductDetail
+
+PRODUCTS = [
+    {"platform": "Amazon", "product_name": "Lenovo IdeaPad Slim 3 - 8GB RAM", "price": 18999.0, "url": "https://www.amazon.eg/dp/B000000001", "specifications": {}},
+    {"platform": "Noon", "product_name": "Lenovo IdeaPad 5", "price": 32999.0, "url": "https://www.noon.com/egypt-en/ideapad-5/N1V/p/", "specifications": {"RAM Size": "16 GB"}},
+    {"platform": "B.TECH", "product_name": "Lenovo IdeaPad Gaming 3 - 16GB RAM", "price": 39999.0, "url": "https://btech.com/en/p/ideapad-gaming-3", "specifications": {}},
+]
+
+
+def search_turn(artifact):
+    return [
+        HumanMessage(content="Lenovo laptop under 40000"),
+        AIMessage(content="", tool_calls=[{"name": "search_ecommerce_sites", "args": {"query": "Lenovo laptop"}, "id": "call_1"}]),
+        ToolMessage(content="Live results...", name="search_ecommerce_sites", tool_call_id="call_1", artifact=artifact),
+    ]
+
+
+def refine(state: dict, **args) -> str:
+    # ToolNode passes the graph state in the injected `state` argument
+    call = {"type": "tool_call", "name": "refine_results", "args": {**args, "state": state}, "id": "call_2"}
+    return asyncio.run(refine_results.ainvoke(call)).content
+
+
+def test_search_results_are_kept_in_state():
+    state = {"messages": search_turn(search_artifact("Lenovo laptop", 40000.0, "live", PRODUCTS))}
+    assert asyncio.run(results_node(state)) == {"search_query": "Lenovo laptop", "budget": 40000.0, "search_results": PRODUCTS}
+
+
+def test_a_search_that_finds_nothing_replaces_the_previous_results():
+    state = {"search_query": "Lenovo laptop", "budget": 40000.0, "search_results": PRODUCTS}
+    state.update(asyncio.run(results_node({"messages": search_turn(search_artifact("Dell XPS 13", 30000.0, "live", []))})))
+    assert state == {"search_query": "Dell XPS 13", "budget": 30000.0, "search_results": []}
+    assert refine(state, contains="16GB RAM") == "The last search, for 'Dell XPS 13', found no products to refine."
+
+
+def test_refinements_filter_and_sort_the_stored_results():
+    state = {"search_query": "Lenovo laptop", "budget": 40000.0, "search_results": PRODUCTS}
+
+    report = refine(state, contains="16GB RAM", sort_by="price_desc")
+    assert report.startswith("2 of the 3 products")
+    assert report.index("Gaming 3") < report.index("IdeaPad 5")
+
+    report = refine(state, max_price=30000)
+    assert "1. Lenovo IdeaPad Slim 3 - 8GB RAM | 18999 | Amazon |" in report
+    assert "IdeaPad 5" not in report
+
+    assert "only covered products up to 40000 EGP" in refine(state, max_price=60000)
+    assert "no search results" in refine({}, platform="Noon")
+
+
+def test_spec_filters_work_on_cached_searches(monkeypatch):
+    async def main():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'cache.db')}")
+        await db.init_db()
+        # A live search stored its results, then spec enrichment stored the specs in the catalog
+        products = [
+            ProductDetail(source_website=prod["platform"], product_name=prod["product_name"], price=prod["price"], url=prod["url"])
+            for prod in PRODUCTS
+        ]
+        await db.upsert_products(products)
+        await db.save_specs(PRODUCTS[1]["url"], PRODUCTS[1]["specifications"])
+        cache = SearchCache(db)
+        await cache.save_search("Lenovo laptop", {"Noon": products})
+        monkeypatch.setattr(tools, "search_cache", cache)
+        tools.memory_cache.clear()
+
+        call = {"type": "tool_call", "name": "search_ecommerce_sites", "args": {"query": "lenovo laptop"}, "id": "call_1"}
+        message = await tools.search_ecommerce_sites.ainvoke(call)
+        await db.engine.dispose()
+        return message
+
+    message = asyncio.run(main())
+    assert message.content.startswith("Cached results")
+    assert "RAM 16 GB" in message.content
+
+    state = asyncio.run(results_node({"messages": search_turn(message.artifact)}))
+    report = refine(state, contains="16GB RAM")
+    assert report.startswith("2 of the 3 products")
+    assert "Lenovo IdeaPad 5 | 32999 | Noon |" in report
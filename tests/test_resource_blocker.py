@@ -0,0 +1,28 @@
+import sys
+import os
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.amazon_scraper import AmazonScraper
+from src.scrapers.amazon_spec_scraper import AmazonSpecScraper
+from src.scrapers.resource_blocker import BlockingPolicy
+
+
+def test_denied_domains_match_the_hostname_suffix():
+    policy = BlockingPolicy()
+    assert policy.should_block("https://stats.g.doubleclick.net/j/collect", "xhr")
+    assert policy.should_block("https://www.googletagmanager.com/gtm.js?id=GTM-XXXX", "script")
+    # First-party URLs that merely contain a listed name go through
+    assert not policy.should_block("https://www.noon.com/egypt-en/doubleclick.net-mouse/N1V/p/", "document")
+    assert not policy.should_block("https://hotjar.com.example.eg/app.js", "script")
+    assert not policy.should_block("https://www.amazon.eg/s?k=criteo.com", "xhr")
+
+
+def test_site_policies_still_block_their_own_trackers():
+    for policy in (AmazonScraper.blocking, AmazonSpecScraper.blocking):
+        assert policy.should_block("https://unagi.amazon.eg/1/events/com.amazon.csm", "ping")
+        assert policy.should_block("https://fls-eu.amazon.eg/1/batch/1/OE/", "xhr")
+        assert policy.should_block("https://aax-eu.amazon-adsystem.com/e/dtb/bid", "xhr")
+        assert not policy.should_block("https://www.amazon.eg/s?k=Lenovo+IdeaPad", "document")
+        assert policy.should_block("https://m.media-amazon.com/images/I/1.jpg", "image")
@@ -0,0 +1,59 @@
+import sys
+import os
+import time
+from datetime import timedelta
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.search_cache import MemoryCache, TokenSetIndex, normalize_query
+
+
+def test_normalize_query():
+    key = normalize_query("  Lenovo   IdeaPad ")
+
+    assert key == "ideapad lenovo"
+    assert normalize_query("IdeaPad Lenovo") == key
+    assert normalize_query("لينوفو ideapad") == key
+    assert normalize_query("آيفون 15 Pro") == normalize_query("iPhone 15 pro")
+    assert normalize_query("laptop for gaming") == normalize_query("Gaming Laptop")
+
+
+def test_token_set_index_matches_near_identical_queries():
+    index = TokenSetIndex()
+    index.add(normalize_query("Lenovo IdeaPad Slim 3"))
+
+    assert index.find(normalize_query("lenovo ideapad slim 3 laptop")) == "3 ideapad lenovo slim"
+    # Different model numbers never share an entry
+    assert index.find(normalize_query("lenovo ideapad slim 5 laptop")) is None
+    assert index.find(normalize_query("hp victus")) is None
+
+
+def test_memory_cache_shares_entries_per_query():
+    cache = MemoryCache()
+    cache.put(MemoryCache.make_key("Lenovo IdeaPad"), "results")
+
+    assert cache.get(MemoryCache.make_key("lenovo  ideapad")) == "results"
+    assert cache.get(MemoryCache.make_key("lenovo legion")) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.evictions == 1
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(ttl=timedelta(milliseconds=10))
+    cache.put("a", "A")
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,54 @@
+import asyncio
+import sys
+import os
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    async def scrape():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ["result"]
+
+    async def main():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do("iphone 15", scrape) for _ in range(10)))
+        assert not flights.in_flight("iphone 15")
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result == ["result"] for result in results)
+
+
+def test_call_is_cancelled_only_when_every_caller_left():
+    cancelled = []
+
+    async def scrape():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        flights = SingleFlight()
+        first = asyncio.create_task(flights.do("key", scrape))
+        second = asyncio.create_task(flights.do("key", scrape))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled and flights.in_flight("key")
+
+        second.cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled and not flights.in_flight("key")
+
+    asyncio.run(main())
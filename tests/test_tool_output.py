@@ -0,0 +1,118 @@
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent import tools
+from src.agent.tools import compact_specs, format_compact, search_report, short_url, url_pattern
+from src.database.db_manager import DatabaseManager
+from src.database.search_cache import SearchCache
+from src.schemas.product import ProductDetail
+
+
+def test_short_urls_keep_only_what_opens_the_product():
+    assert short_url("https://www.amazon.eg/-/en/dp/B068202938/ref=sr_1_1?crid=2X&keywords=Lenovo+IdeaPad") == "https://www.amazon.eg/dp/B068202938"
+    assert short_url("https://www.amazon.eg/gp/product/B068202938?th=1") == "https://www.amazon.eg/dp/B068202938"
+    assert short_url("https://btech.com/en/p/lenovo-ideapad-3?offering_id=1c8d1bc") == "https://btech.com/en/p/lenovo-ideapad-3"
+    assert short_url("https://www.noon.com/egypt-en/ideapad-5/N70048443V/p/?o=b3aa78e1") == "https://www.noon.com/egypt-en/ideapad-5/N70048443V/p/"
+
+
+def test_short_urls_map_back_to_stored_ones():
+    assert url_pattern("https://www.amazon.eg/dp/B068202938") == "%/dp/B068202938%"
+    assert url_pattern("https://btech.com/en/p/lenovo_ideapad-3") == "https://btech.com/en/p/lenovo\\_ideapad-3%"
+
+
+def test_compact_specs_skip_what_the_name_says():
+    specs = {"Processor": "Intel Core i5-1135G7", "Processor Generation": "11th Gen", "RAM": "16 GB", "Internal Memory": "512 GB", "Color": "Grey"}
+    assert compact_specs(specs, "Lenovo IdeaPad 3 - Intel Core i5-1135G7 - 8GB RAM") == "RAM 16 GB, Storage 512 GB"
+
+
+def test_compact_report_lists_products_within_budget():
+    products = [
+        ProductDetail(source_website="Noon", product_name="Lenovo IdeaPad 3", price=24250.0, url="https://www.noon.com/egypt-en/ideapad-3/N1V/p/?o=1"),
+        ProductDetail(source_website="Noon", product_name="Lenovo IdeaPad Pro 5", price=72999.5, url="https://www.noon.com/egypt-en/ideapad-pro-5/N2V/p/?o=2"),
+    ]
+    assert format_compact("Noon", products, max_price=30000) == "[Noon]\n1. Lenovo IdeaPad 3 | 24250 | https://www.noon.com/egypt-en/ideapad-3/N1V/p/\n"
+    assert format_compact("Noon", products).endswith("| 72999.50 | https://www.noon.com/egypt-en/ideapad-pro-5/N2V/p/\n")
+    assert format_compact("Noon", []) == "[Noon] no products found\n"
+
+
+def test_reports_use_the_exact_budget():
+    products = [
+        ProductDetail(source_website="B.TECH", product_name="Lenovo IdeaPad 3", price=24800.0, url="https://btech.com/en/p/ideapad-3"),
+        ProductDetail(source_website="B.TECH", product_name="Lenovo IdeaPad 5", price=25200.0, url="https://btech.com/en/p/ideapad-5"),
+    ]
+    report, artifact = search_report("Cached results:", "Lenovo IdeaPad", {"B.TECH": products}, 24999, "cache")
+    assert "Lenovo IdeaPad 3 | 24800" in report and "IdeaPad 5" not in report
+    assert artifact["max_price"] == 24999
+    assert [prod["price"] for prod in artifact["products"]] == [24800.0]
+
+
+def test_only_complete_live_results_are_kept_in_memory(monkeypatch):
+    noon = [ProductDetail(source_website="Noon", product_name="Lenovo IdeaPad 3", price=24250.0, url="https://www.noon.com/egypt-en/ideapad-3/N1V/p/")]
+    scrapes = iter([
+        # Amazon bot-walled the search: its scraper returns []
+        {"Amazon": [], "B.TECH": noon, "Noon": noon},
+        {"Amazon": noon, "B.TECH": noon, "Noon": noon},
+    ])
+
+    async def scrape_all_platforms(query, query_key, max_price):
+        return next(scrapes)
+
+    async def search():
+        call = {"type": "tool_call", "name": "search_ecommerce_sites", "args": {"query": "Lenovo IdeaPad"}, "id": "call_1"}
+        return (await tools.search_ecommerce_sites.ainvoke(call)).content
+
+    async def main():
+        # An empty SQLite tier, so every miss scrapes
+        db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'cache.db')}")
+        await db.init_db()
+        monkeypatch.setattr(tools, "search_cache", SearchCache(db))
+        monkeypatch.setattr(tools, "scrape_all_platforms", scrape_all_platforms)
+        tools.memory_cache.clear()
+        reports = [await search() for _ in range(3)]
+        await db.engine.dispose()
+        return reports
+
+    partial, complete, hit = asyncio.run(main())
+    assert partial.startswith("Live results") and complete.startswith("Live results")
+    assert hit.startswith("Cached results")
+
+
+def test_spec_enrichment_does_not_hold_up_the_search(monkeypatch):
+    enriched = []
+
+    class InstantScraper:
+        def __init__(self, headless: bool = True):
+            pass
+
+        async def scrape(self, query: str, timeout_s: float = None):
+            return [ProductDetail(source_website="Noon", product_name=query, price=24250.0, url="https://www.noon.com/egypt-en/ideapad-3/N1V/p/")]
+
+    async def slow_enrich_specs(products, concurrency, timeout_s=None):
+        await asyncio.sleep(0.5)
+        enriched.extend(products)
+        return products
+
+    async def nothing(*args):
+        pass
+
+    async def main():
+        monkeypatch.setattr(tools, "SCRAPERS", {"Noon": InstantScraper})
+        monkeypatch.setattr(tools, "enrich_specs", slow_enrich_specs)
+        monkeypatch.setattr(tools, "save_to_cache", nothing)
+        monkeypatch.setattr(tools, "save_to_catalog", nothing)
+        started = time.perf_counter()
+        results = await tools.scrape_all_platforms("Lenovo IdeaPad", "lenovo ideapad", stream=False)
+        elapsed = time.perf_counter() - started
+        # The specs still get read once the answer is out
+        await asyncio.gather(*tools._background_tasks)
+        return results, elapsed
+
+    results, elapsed = asyncio.run(main())
+    assert elapsed < 0.5
+    assert enriched == results["Noon"]
@@ -0,0 +1,46 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Ensure the project root is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager
+from src.schemas.product import ProductDetail
+
+
+def product(idx: int, price: float) -> ProductDetail:
+    return ProductDetail(source_website="Noon", product_name=f"Lenovo IdeaPad {idx}", price=price, url=f"https://www.example.com/p/{idx}")
+
+
+def test_counts_tell_new_products_from_updated_ones():
+    async def main():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'catalog.db')}")
+        await db.init_db()
+        first = await db.upsert_products([product(1, 20000), product(2, 19000)])
+        # A duplicate URL in the batch is written once
+        second = await db.upsert_products([product(2, 18000), product(3, 25000), product(3, 24000)])
+        await db.engine.dispose()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == {"inserted": 2, "updated": 0}
+    assert second == {"inserted": 1, "updated": 1}
+
+
+def test_concurrent_upserts_count_each_new_product_once():
+    async def main():
+        db_url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'catalog.db')}"
+        await DatabaseManager(db_url).init_db()
+        # Two managers, as two worker processes would have, writing the same search results
+        managers = [DatabaseManager(db_url) for _ in range(2)]
+        batch = [product(idx, 20000 + idx) for idx in range(200)]
+        counts = await asyncio.gather(*(db.upsert_products(batch) for db in managers for _ in range(3)))
+        for db in managers:
+            await db.engine.dispose()
+        return counts
+
+    counts = asyncio.run(main())
+    assert sum(count["inserted"] for count in counts) == 200
+    assert sum(count["updated"] for count in counts) == 5 * 200